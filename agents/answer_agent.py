@@ -25,11 +25,20 @@ Teaching point:
 
   This is different from Slack/JIRA agents which always need filtered issues.
   The answer_agent can operate with OR without file context.
+
+Streaming:
+  The async methods take an optional on_token callback. When given, the
+  completion is streamed (llm.astream) and every chunk is handed to on_token
+  as it arrives — /qa-intake/stream forwards them to the client.
 """
 
+import json
+from typing import Callable, Optional
+
 from langchain_openai import ChatOpenAI
-from schemas.state import AnswerResult
-from agents.rag_agent import rag_agent
+from schemas.state import AnswerResult, RAGResult
+from agents.rag_agent import rag_agent, payload_text
+from utils.llm_limiter import invoke_llm, ainvoke_llm, astream_llm
 import config
 
 
@@ -80,24 +89,30 @@ class AnswerAgent:
         Scenario A: Answer a direct question using RAG context.
         No file or issues context needed.
         """
-        # TODO: implement direct Q&A
-        # Steps:
-        #   1. Retrieve RAG context:
-        #        rag_result = rag_agent.retrieve(
-        #            query=query,
-        #            collection=config.COLLECTION_QA_TAXONOMY,
-        #            k=config.RAG_TOP_K,
-        #        )
-        #   2. Build rag_context string from rag_result["results"]
-        #   3. format_instruction = OUTPUT_FORMAT_INSTRUCTIONS.get(output_format, "")
-        #   4. Format ANSWER_PROMPT_QUERY with rag_context, query, format_instruction
-        #   5. response = self.llm.invoke(prompt)
-        #   6. Return AnswerResult(
-        #          answer=response.content,
-        #          sources=[r.get("source","") for r in rag_result["results"]],
-        #          confidence=rag_result["confidence"],
-        #      )
-        raise NotImplementedError
+        rag_result = rag_agent.retrieve(
+            query=query,
+            collection=config.COLLECTION_QA_TAXONOMY,
+            k=config.RAG_TOP_K,
+            rewrite="cheap",   # short user questions: a small model expands them fine
+        )
+        response = invoke_llm(self.llm, _query_prompt(query, output_format, rag_result))
+        return _query_result(response.content, rag_result)
+
+    async def aanswer_query(
+        self,
+        query: str,
+        output_format: str = "detailed",
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> AnswerResult:
+        """Async twin of answer_query() — used by graph.ainvoke(); streams tokens to on_token."""
+        rag_result = await rag_agent.aretrieve(
+            query=query,
+            collection=config.COLLECTION_QA_TAXONOMY,
+            k=config.RAG_TOP_K,
+            rewrite="cheap",   # short user questions: a small model expands them fine
+        )
+        response = await self._acomplete(_query_prompt(query, output_format, rag_result), on_token)
+        return _query_result(response.content, rag_result)
 
     def analyze_issues(
         self,
@@ -108,24 +123,77 @@ class AnswerAgent:
         """
         Scenario B: Analyze filtered issues and return structured summary.
         """
-        # TODO: implement issue analysis
-        # Steps:
-        #   1. Retrieve RAG context for additional grounding:
-        #        rag_result = rag_agent.retrieve(
-        #            query=answer_query,
-        #            collection=config.COLLECTION_QA_TAXONOMY,
-        #            k=2,
-        #        )
-        #   2. Build rag_context string
-        #   3. issues_json = json.dumps([{id, title, description} for i in issues], indent=2)
-        #   4. Format ANSWER_PROMPT_ANALYSIS with answer_query, issue_count, issues_json, rag_context
-        #   5. response = self.llm.invoke(prompt)
-        #   6. Return AnswerResult(
-        #          answer=response.content,
-        #          sources=[],
-        #          confidence=1.0,
-        #      )
-        raise NotImplementedError
+        rag_result = rag_agent.retrieve(
+            query=answer_query,
+            collection=config.COLLECTION_QA_TAXONOMY,
+            k=2,
+            rewrite=False,     # orchestrator-built query is already explicit
+        )
+        response = invoke_llm(self.llm, _analysis_prompt(issues, answer_query, rag_result))
+        return AnswerResult(answer=response.content, sources=[], confidence=1.0)
+
+    async def aanalyze_issues(
+        self,
+        issues: list[dict],
+        answer_query: str,
+        output_format: str = "detailed",
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> AnswerResult:
+        """Async twin of analyze_issues() — used by graph.ainvoke(); streams tokens to on_token."""
+        rag_result = await rag_agent.aretrieve(
+            query=answer_query,
+            collection=config.COLLECTION_QA_TAXONOMY,
+            k=2,
+            rewrite=False,     # orchestrator-built query is already explicit
+        )
+        response = await self._acomplete(_analysis_prompt(issues, answer_query, rag_result), on_token)
+        return AnswerResult(answer=response.content, sources=[], confidence=1.0)
+
+    async def _acomplete(self, prompt: str, on_token: Optional[Callable[[str], None]]):
+        if on_token is None:
+            return await ainvoke_llm(self.llm, prompt)
+        return await astream_llm(self.llm, prompt, on_token)
+
+
+def _rag_context(rag_result: RAGResult) -> str:
+    return "\n\n".join(payload_text(r) for r in rag_result["results"]) or "(none)"
+
+
+def _query_prompt(query: str, output_format: str, rag_result: RAGResult) -> str:
+    return ANSWER_PROMPT_QUERY.format(
+        output_format_instruction=OUTPUT_FORMAT_INSTRUCTIONS.get(output_format, ""),
+        rag_context=_rag_context(rag_result),
+        query=query,
+    )
+
+
+def _analysis_prompt(issues: list[dict], answer_query: str, rag_result: RAGResult) -> str:
+    issues_json = json.dumps(
+        [
+            {"id": i.get("id", i.get("issue_id")), "title": i.get("title", ""),
+             "description": i.get("description", "")}
+            for i in issues
+        ],
+        indent=2,
+        ensure_ascii=False,
+    )
+    return ANSWER_PROMPT_ANALYSIS.format(
+        answer_query=answer_query,
+        issue_count=len(issues),
+        issues_json=issues_json,
+        rag_context=_rag_context(rag_result),
+    )
+
+
+def _query_result(answer: str, rag_result: RAGResult) -> AnswerResult:
+    return AnswerResult(
+        answer=answer,
+        sources=[
+            r.get("source") or r.get("metadata", {}).get("source", "")
+            for r in rag_result["results"]
+        ],
+        confidence=rag_result["confidence"],
+    )
 
 
 # Module-level singleton
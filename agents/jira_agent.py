@@ -12,14 +12,36 @@ Input:
 Output:
   JiraResult with lists of created tickets and detected duplicates
 
-Flow (per issue):
-  1. Check for duplicate via rag_agent (collection: jira_tickets)
+Flow:
+  1. Bulk duplicate check (one stage for ALL issues):
+       one embed_documents call + one Qdrant query_batch_points against jira_tickets
   2. If similarity >= JIRA_DUPLICATE_THRESHOLD → skip, record as duplicate
-  3. Else → generate ticket content (LLM) → create via JIRA API
-  4. Store new ticket embedding in Qdrant jira_tickets collection
+  3. Else → generate ticket content (LLM) for every remaining issue concurrently
+  4. Submit the tickets with the bulk API — create_issues(), JIRA_BULK_CHUNK_SIZE
+     per request instead of one create_issue() round-trip each. A generated
+     ticket without a summary or priority fails only its own issue, before
+     any request. Per-element errors in a bulk response map back to their
+     issue ids; failed elements (or whole failed chunks) are resubmitted up
+     to MAX_TOOL_RETRIES times.
+  5. Store the new tickets' embeddings in Qdrant jira_tickets in one upsert
+     (reuses the vectors computed in step 1 — no second embedding)
 
-Parallelization:
-  All ticket operations use asyncio.gather() — max concurrency: 5
+  Issues arrive already de-duplicated within the upload (clustering_node);
+  a representative's cluster_members are carried onto its created/duplicate entry.
+
+Resume:
+  With a request_id, every ticket is recorded in ticket_ledger (SQLite,
+  "{request_id}:{issue_id}" → key/url) as soon as its bulk chunk succeeds.
+  A resumed run of the same request (utils/checkpointer.py) reports ledgered
+  issues as created without generating or filing them again — and before the
+  duplicate check, which would otherwise match them against their own tickets.
+
+Parallelization (max MAX_CONCURRENT_TICKETS ticket generations in flight):
+  arun() — awaitable, safe inside a running event loop (graph.ainvoke, the
+           streaming pipeline). LLM via ainvoke, Qdrant via AsyncQdrantClient;
+           the blocking `jira` bulk call is offloaded with asyncio.to_thread.
+  run()  — blocking, for graph.invoke(): generation on a thread pool, then the
+           same bulk submission. Never starts an event loop of its own.
 
 Teaching point:
   The JIRA agent calls rag_agent internally for duplicate detection.
@@ -29,12 +51,25 @@ Teaching point:
 """
 
 import asyncio
+import contextvars
+import json
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
 from jira import JIRA
+from langchain_openai import ChatOpenAI
+from qdrant_client.models import PointStruct
 
 from schemas.state import JiraResult
 from agents.rag_agent import rag_agent
+from utils.llm_limiter import invoke_llm, ainvoke_llm
+from utils.sqlite_cache import SQLiteCache
 import config
 
+logger = logging.getLogger(__name__)
+
 
 TICKET_PROMPT = """You are a JIRA ticket writer for a QA engineering team.
 
@@ -56,60 +91,325 @@ Return ONLY valid JSON with these exact keys. No markdown.
 
 MAX_CONCURRENT_TICKETS = 5
 
+ticket_ledger = SQLiteCache(namespace="jira_created", ttl_seconds=config.TICKET_LEDGER_TTL)
+
 
 class JiraAgent:
-    def __init__(self, jira_client=None):
+    def __init__(self, jira_client=None, llm=None):
         self.client = jira_client or JIRA(
             server=config.JIRA_URL,
             basic_auth=(config.JIRA_EMAIL, config.JIRA_API_TOKEN),
         )
+        self.llm = llm or ChatOpenAI(
+            model=config.LLM_MODEL,
+            openai_api_key=config.OPENAI_API_KEY,
+            temperature=0,
+        )
+
+    def run(self, issues: list[dict], jira_query: str, request_id: Optional[str] = None) -> JiraResult:
+        """Process all issues: ledger → duplicate check → ticket generation (thread pool) → bulk create."""
+        reused, issues = _split_ledgered(issues, request_id)
+        duplicates, fresh = self._find_duplicates(issues)
+        if not fresh:
+            return _jira_result(fresh, [], duplicates, reused)
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_TICKETS) as pool:
+            # copy_context: per-node telemetry still sees LLM calls made on the pool threads
+            futures = [
+                pool.submit(contextvars.copy_context().run, self._generate_ticket, i, jira_query)
+                for i, _ in fresh
+            ]
+        tickets = [f.exception() or f.result() for f in futures]
+        outcomes = self._create_issues(tickets, _ledger_keys(fresh, request_id))
+        results, points = _created_results(fresh, tickets, outcomes)
+        if points:
+            self._index_tickets(points)
+        return _jira_result(fresh, results, duplicates, reused)
+
+    async def arun(self, issues: list[dict], jira_query: str, request_id: Optional[str] = None) -> JiraResult:
+        """Async twin of run() — ledger, bulk dedup, concurrent generation, bulk create."""
+        reused, issues = await asyncio.to_thread(_split_ledgered, issues, request_id)
+        duplicates, fresh = await self._afind_duplicates(issues)
+        if not fresh:
+            return _jira_result(fresh, [], duplicates, reused)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_TICKETS)
+
+        async def generate(issue: dict) -> dict:
+            async with semaphore:
+                return await self._agenerate_ticket(issue, jira_query)
+
+        tickets = await asyncio.gather(*(generate(i) for i, _ in fresh), return_exceptions=True)
+        outcomes = await asyncio.to_thread(self._create_issues, tickets, _ledger_keys(fresh, request_id))
+        results, points = _created_results(fresh, tickets, outcomes)
+        if points:
+            await self._aindex_tickets(points)
+        return _jira_result(fresh, results, duplicates, reused)
+
+    def _find_duplicates(self, issues: list[dict]) -> tuple[list[dict], list[tuple[dict, list[float]]]]:
+        """
+        Bulk duplicate detection against jira_tickets.
+        Returns (duplicate records, [(issue, vector)] still needing a ticket).
+        """
+        hits, vectors = rag_agent.search_batch(
+            texts=[_issue_text(i) for i in issues],
+            collection=config.COLLECTION_JIRA_TICKETS,
+            k=1,
+            score_threshold=config.JIRA_DUPLICATE_THRESHOLD,
+        )
+        return _split_duplicates(issues, hits, vectors)
+
+    async def _afind_duplicates(self, issues: list[dict]) -> tuple[list[dict], list[tuple[dict, list[float]]]]:
+        """Async twin of _find_duplicates()."""
+        hits, vectors = await rag_agent.asearch_batch(
+            texts=[_issue_text(i) for i in issues],
+            collection=config.COLLECTION_JIRA_TICKETS,
+            k=1,
+            score_threshold=config.JIRA_DUPLICATE_THRESHOLD,
+        )
+        return _split_duplicates(issues, hits, vectors)
+
+    def _generate_ticket(self, issue: dict, jira_query: str) -> dict:
+        """LLM → ticket fields. Retries once on invalid JSON."""
+        prompt = _ticket_prompt(issue, jira_query)
+        for attempt in range(config.MAX_LLM_RETRIES + 1):
+            response = invoke_llm(self.llm, prompt)
+            try:
+                return json.loads(response.content)
+            except json.JSONDecodeError:
+                if attempt == config.MAX_LLM_RETRIES:
+                    raise
+
+    async def _agenerate_ticket(self, issue: dict, jira_query: str) -> dict:
+        """Async twin of _generate_ticket()."""
+        prompt = _ticket_prompt(issue, jira_query)
+        for attempt in range(config.MAX_LLM_RETRIES + 1):
+            response = await ainvoke_llm(self.llm, prompt)
+            try:
+                return json.loads(response.content)
+            except json.JSONDecodeError:
+                if attempt == config.MAX_LLM_RETRIES:
+                    raise
+
+    def _create_issues(self, tickets: list, ledger_keys: Optional[list[str]] = None) -> list:
+        """
+        Bulk-create every generated ticket, JIRA_BULK_CHUNK_SIZE per request.
+        Returns one outcome per ticket, in order: the created jira Issue or the
+        exception that stopped it. Failed elements are resubmitted up to
+        MAX_TOOL_RETRIES times; generation failures and malformed tickets
+        (TicketFieldsError — the same on every retry) are never submitted.
+        With ledger_keys, each chunk's new tickets are recorded before the next request.
+        """
+        outcomes = list(tickets)
+        fields = {}
+        for n, ticket in enumerate(tickets):
+            if isinstance(ticket, BaseException):
+                continue
+            try:
+                fields[n] = _ticket_fields(ticket)
+            except TicketFieldsError as e:
+                outcomes[n] = e
+        pending = list(fields)
+        for _ in range(config.MAX_TOOL_RETRIES + 1):
+            failed = []
+            for chunk in _chunks(pending, config.JIRA_BULK_CHUNK_SIZE):
+                try:
+                    response = self.client.create_issues(
+                        field_list=[fields[n] for n in chunk],
+                        prefetch=False,  # the bulk response has key + self; skip N extra GETs
+                    )
+                except Exception as e:
+                    for n in chunk:
+                        outcomes[n] = e
+                    failed.extend(chunk)
+                    continue
+                for n, item in zip(chunk, response):
+                    if item["status"] == "Success":
+                        outcomes[n] = item["issue"]
+                    else:
+                        outcomes[n] = JiraBulkError(item["error"])
+                        failed.append(n)
+                if ledger_keys:
+                    _record_created(ledger_keys, chunk, outcomes)
+            if not failed:
+                break
+            pending = failed
+        return outcomes
+
+    def _index_tickets(self, points: list[PointStruct]) -> None:
+        """Store the new tickets in jira_tickets so future uploads detect them as duplicates."""
+        try:
+            rag_agent.client.upsert(collection_name=config.COLLECTION_JIRA_TICKETS, points=points)
+        except Exception:
+            logger.warning("Indexing %d new tickets for dedup failed", len(points), exc_info=True)
+
+    async def _aindex_tickets(self, points: list[PointStruct]) -> None:
+        """Async twin of _index_tickets()."""
+        try:
+            await rag_agent.async_client.upsert(collection_name=config.COLLECTION_JIRA_TICKETS, points=points)
+        except Exception:
+            logger.warning("Indexing %d new tickets for dedup failed", len(points), exc_info=True)
+
+
+class JiraBulkError(Exception):
+    """A per-element error from a create_issues() bulk response."""
+
+
+class TicketFieldsError(ValueError):
+    """The LLM's ticket cannot be turned into JIRA fields (not an object, no summary / priority)."""
+
+
+def _split_ledgered(issues: list[dict], request_id: Optional[str]) -> tuple[list[dict], list[dict]]:
+    """(created entries already in this request's ledger, issues still to process)."""
+    if not request_id:
+        return [], issues
+    keys = [_ledger_key(request_id, i) for i in issues]
+    found = ticket_ledger.get_many(keys)
+    reused = [_created(i, **found[k]) for i, k in zip(issues, keys) if k in found]
+    return reused, [i for i, k in zip(issues, keys) if k not in found]
+
+
+def _ledger_keys(fresh: list[tuple[dict, list[float]]], request_id: Optional[str]) -> Optional[list[str]]:
+    return [_ledger_key(request_id, issue) for issue, _ in fresh] if request_id else None
+
+
+def _ledger_key(request_id: str, issue: dict) -> str:
+    return f"{request_id}:{_issue_id(issue)}"
+
+
+def _record_created(ledger_keys: list[str], chunk: list[int], outcomes: list) -> None:
+    created = {
+        ledger_keys[n]: {"key": outcomes[n].key, "url": outcomes[n].permalink()}
+        for n in chunk
+        if not isinstance(outcomes[n], BaseException)
+    }
+    try:
+        ticket_ledger.set_many(created)
+    except Exception:
+        logger.warning("Recording %d created tickets in the ledger failed", len(created), exc_info=True)
+
+
+def _created_results(
+    fresh: list[tuple[dict, list[float]]], tickets: list, outcomes: list
+) -> tuple[list, list[PointStruct]]:
+    """Per-issue created records (or exceptions) and the Qdrant points for the created ones."""
+    results, points = [], []
+    for (issue, vector), ticket, outcome in zip(fresh, tickets, outcomes):
+        if isinstance(outcome, BaseException):
+            results.append(outcome)
+            continue
+        url = outcome.permalink()
+        results.append(_created(issue, outcome.key, url))
+        points.append(_ticket_point(issue, vector, outcome.key, url, ticket))
+    return results, points
+
+
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _ticket_prompt(issue: dict, jira_query: str) -> str:
+    return TICKET_PROMPT.format(
+        jira_query=jira_query,
+        issue_json=json.dumps(issue, ensure_ascii=False, indent=2),
+    )
+
+
+def _created(issue: dict, key: str, url: str) -> dict:
+    return {
+        "type": "created",
+        "issue_id": _issue_id(issue),
+        "key": key,
+        "url": url,
+        **_cluster(issue),
+    }
+
+
+def _issue_id(issue: dict) -> str:
+    return issue.get("id") or issue.get("issue_id")
+
+
+def _cluster(issue: dict) -> dict:
+    """Near-duplicates from the same upload that this ticket also covers (clustering_node)."""
+    members = issue.get("cluster_members")
+    return {"cluster_members": members} if members else {}
+
+
+def _issue_text(issue: dict) -> str:
+    """Text used for duplicate matching — the same for queries and stored tickets."""
+    return f"{issue.get('title', '')} {issue.get('description', '')}".strip()
+
+
+def _split_duplicates(
+    issues: list[dict], hits: list[list[dict]], vectors: list[list[float]]
+) -> tuple[list[dict], list[tuple[dict, list[float]]]]:
+    duplicates, fresh = [], []
+    for issue, issue_hits, vector in zip(issues, hits, vectors):
+        if issue_hits and issue_hits[0]["score"] >= config.JIRA_DUPLICATE_THRESHOLD:
+            duplicates.append({
+                "type": "duplicate",
+                "issue_id": _issue_id(issue),
+                "existing": issue_hits[0]["payload"],
+                **_cluster(issue),
+            })
+        else:
+            fresh.append((issue, vector))
+    return duplicates, fresh
+
+
+def _ticket_fields(ticket: dict) -> dict:
+    if not isinstance(ticket, dict):
+        raise TicketFieldsError(f"Invalid ticket from LLM: expected an object, got {type(ticket).__name__}")
+    missing = [k for k in ("summary", "priority") if not isinstance(ticket.get(k), str) or not ticket[k]]
+    if missing:
+        raise TicketFieldsError(f"Invalid ticket from LLM: no {' / '.join(missing)}")
+    description = "\n\n".join([
+        str(ticket.get("description", "")),
+        f"*Steps to reproduce*\n{ticket.get('steps', '')}",
+        f"*Expected*\n{ticket.get('expected', '')}",
+        f"*Actual*\n{ticket.get('actual', '')}",
+    ])
+    return {
+        "project": {"key": config.JIRA_PROJECT_KEY},
+        "summary": ticket["summary"][:100],
+        "description": description,
+        "issuetype": {"name": "Bug"},
+        "priority": {"name": ticket["priority"]},
+    }
+
+
+def _ticket_point(issue: dict, vector: list[float], key: str, url: str, ticket: dict) -> PointStruct:
+    return PointStruct(
+        id=str(uuid.uuid4()),
+        vector=vector,
+        payload={
+            "text": _issue_text(issue),
+            "ticket_key": key,
+            "url": url,
+            "summary": ticket.get("summary", ""),
+            "issue_id": _issue_id(issue),
+        },
+    )
+
 
-    def run(self, issues: list[dict], jira_query: str) -> JiraResult:
-        """Process all issues: duplicate check → ticket creation (parallel)."""
-        return asyncio.run(self._run_async(issues, jira_query))
-
-    async def _run_async(self, issues: list[dict], jira_query: str) -> JiraResult:
-        """Run all ticket operations concurrently (max MAX_CONCURRENT_TICKETS)."""
-        # TODO: implement async ticket processing
-        # Steps:
-        #   1. semaphore = asyncio.Semaphore(MAX_CONCURRENT_TICKETS)
-        #   2. tasks = [self._process_issue(i, jira_query, semaphore) for i in issues]
-        #   3. results = await asyncio.gather(*tasks, return_exceptions=True)
-        #   4. created = [r for r in results if r.get("type") == "created"]
-        #   5. duplicates = [r for r in results if r.get("type") == "duplicate"]
-        #   6. Return JiraResult(created=created, duplicates=duplicates, success=True, error=None)
-        raise NotImplementedError
-
-    async def _process_issue(
-        self, issue: dict, jira_query: str, semaphore: asyncio.Semaphore
-    ) -> dict:
-        """For a single issue: duplicate check → create or skip."""
-        # TODO: implement per-issue processing
-        # Steps:
-        #   async with semaphore:
-        #   1. Check duplicate via rag_agent:
-        #        result = rag_agent.retrieve(
-        #            query=issue.get("title","") + " " + issue.get("description",""),
-        #            collection=config.COLLECTION_JIRA_TICKETS,
-        #            k=1,
-        #            score_threshold=config.JIRA_DUPLICATE_THRESHOLD,
-        #        )
-        #   2. If result["confidence"] >= config.JIRA_DUPLICATE_THRESHOLD:
-        #        return {"type": "duplicate", "issue_id": issue["id"],
-        #                "existing": result["results"][0] if result["results"] else {}}
-        #   3. Else:
-        #        a. Format TICKET_PROMPT with jira_query + issue_json
-        #        b. llm.invoke(prompt) → parse JSON ticket fields
-        #        c. jira_issue = self.client.create_issue(fields={
-        #               "project": {"key": config.JIRA_PROJECT_KEY},
-        #               "summary": ticket["summary"],
-        #               "description": ticket["description"],
-        #               "issuetype": {"name": "Bug"},
-        #               "priority": {"name": ticket["priority"]},
-        #           })
-        #        d. Return {"type": "created", "issue_id": issue["id"],
-        #                   "url": jira_issue.permalink()}
-        raise NotImplementedError
+def _jira_result(
+    fresh: list[tuple[dict, list[float]]],
+    results: list,
+    duplicates: list[dict],
+    reused: list[dict] = (),
+) -> JiraResult:
+    """Fold per-issue outcomes and ledger-reused tickets into a JiraResult; failures are reported, not raised."""
+    created = [*reused, *(r for r in results if isinstance(r, dict) and r.get("type") == "created")]
+    failures = [
+        f"{_issue_id(issue)}: {r}"
+        for (issue, _), r in zip(fresh, results)
+        if isinstance(r, BaseException)
+    ]
+    return JiraResult(
+        created=created,
+        duplicates=duplicates,
+        success=not failures,
+        error="; ".join(failures) or None,
+    )
 
 
 # Module-level singleton
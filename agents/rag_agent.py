@@ -10,17 +10,41 @@ Responsibilities:
 Called by:
   - nodes/rag_node.py       (collection: accuracy_taxonomy)
   - agents/jira_agent.py    (collection: jira_tickets, duplicate detection)
+
+Sync and async:
+  retrieve()  — blocking, used by graph.invoke() and scripts
+  aretrieve() — non-blocking (ainvoke + AsyncQdrantClient), used by graph.ainvoke()
+  Both share the same rewrite → search → rerank → package pipeline.
+
+Embeddings go through CachedEmbeddings (utils/embedding_cache.py), so repeated
+texts — query templates, taxonomy chunks, ticket text — are embedded once.
+
+Query rewrite policy (per call, `rewrite=`):
+  True     full rewrite with LLM_MODEL (default)
+  "cheap"  rewrite with REWRITE_CHEAP_MODEL
+  False    skip — search with the query as given
+Rewrites are cached (utils/rewrite_cache.py): exact match first, then a
+near-duplicate match on the query embedding. rewrite_stats() reports hits,
+skips and estimated latency saved per collection.
 """
 
-import json
-from typing import Optional
+import asyncio
+import threading
+import time
+from typing import Optional, Union
 
+import numpy as np
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from qdrant_client import QdrantClient
-from qdrant_client.models import Filter
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.models import Filter, QueryRequest
 
 import config
 from schemas.state import RAGResult
+from utils.embedding_cache import CachedEmbeddings
+from utils.llm_limiter import invoke_llm, ainvoke_llm
+from utils.rewrite_cache import RewriteCache
+
+RewritePolicy = Union[bool, str]   # True | "cheap" | False
 
 
 QUERY_REWRITE_PROMPT = """You are a semantic search optimizer.
@@ -38,19 +62,34 @@ class RAGAgent:
         qdrant_client: Optional[QdrantClient] = None,
         embeddings: Optional[OpenAIEmbeddings] = None,
         llm: Optional[ChatOpenAI] = None,
+        async_qdrant_client: Optional[AsyncQdrantClient] = None,
+        cheap_llm: Optional[ChatOpenAI] = None,
+        rewrite_cache: Optional[RewriteCache] = None,
     ):
         self.client = qdrant_client or QdrantClient(
             host=config.QDRANT_HOST, port=config.QDRANT_PORT
         )
-        self.embeddings = embeddings or OpenAIEmbeddings(
+        self.async_client = async_qdrant_client or AsyncQdrantClient(
+            host=config.QDRANT_HOST, port=config.QDRANT_PORT
+        )
+        self.embeddings = embeddings or CachedEmbeddings(OpenAIEmbeddings(
             model=config.EMBEDDING_MODEL,
             openai_api_key=config.OPENAI_API_KEY,
-        )
+        ))
         self.llm = llm or ChatOpenAI(
             model=config.LLM_MODEL,
             openai_api_key=config.OPENAI_API_KEY,
             temperature=0,
         )
+        self.cheap_llm = cheap_llm or ChatOpenAI(
+            model=config.REWRITE_CHEAP_MODEL,
+            openai_api_key=config.OPENAI_API_KEY,
+            temperature=0,
+        )
+        self.rewrite_cache = rewrite_cache or RewriteCache()
+        self._rewrite_stats: dict[str, dict] = {}
+        self._rewrite_latency_ms: dict[str, float] = {}   # running mean per model
+        self._stats_lock = threading.Lock()
 
     def retrieve(
         self,
@@ -59,6 +98,7 @@ class RAGAgent:
         k: int = config.RAG_TOP_K,
         score_threshold: float = config.RAG_SCORE_THRESHOLD,
         filters: Optional[Filter] = None,
+        rewrite: RewritePolicy = True,
     ) -> RAGResult:
         """
         Main retrieval interface. All callers use this method.
@@ -69,16 +109,18 @@ class RAGAgent:
             k:                Number of results to return
             score_threshold:  Minimum similarity score (0.0 – 1.0)
             filters:          Optional Qdrant payload filters
+            rewrite:          True | "cheap" | False — see module docstring
 
         Returns:
             RAGResult with rewritten query, ranked results, and confidence
         """
         # Step 1: Rewrite the query for better semantic coverage
-        rewritten_query = self._rewrite_query(query)
+        rewritten_query = self._rewrite_query(query, collection, rewrite)
 
-        # Step 2: Embed and search Qdrant
+        # Step 2: Embed rewritten + original query in ONE call, search Qdrant
+        search_vector, query_vector = self._embed_queries(rewritten_query, query)
         raw_results = self._search(
-            query=rewritten_query,
+            vector=search_vector,
             collection=collection,
             k=k + 1,  # fetch one extra for re-ranking headroom
             score_threshold=score_threshold,
@@ -88,26 +130,99 @@ class RAGAgent:
         # Step 3: Re-rank by relevance to the ORIGINAL query, keep top k
         ranked_results = self._rerank(
             results=raw_results,
-            original_query=query,
+            query_vector=query_vector,
             k=k,
         )
 
         # Step 4: Package and return structured result
-        top_score = ranked_results[0]["score"] if ranked_results else 0.0
-
-        return RAGResult(
-            query=query,
-            rewritten_query=rewritten_query,
-            results=[r["payload"] for r in ranked_results],
-            confidence=round(top_score, 4),
-            source_collection=collection,
+        return _package(query, rewritten_query, ranked_results, collection)
+
+    async def aretrieve(
+        self,
+        query: str,
+        collection: str,
+        k: int = config.RAG_TOP_K,
+        score_threshold: float = config.RAG_SCORE_THRESHOLD,
+        filters: Optional[Filter] = None,
+        rewrite: RewritePolicy = True,
+    ) -> RAGResult:
+        """
+        Async twin of retrieve(). Never blocks the event loop:
+        LLM via ainvoke, embeddings via aembed_*, Qdrant via AsyncQdrantClient.
+        """
+        rewritten_query = await self._arewrite_query(query, collection, rewrite)
+
+        search_vector, query_vector = await self._aembed_queries(rewritten_query, query)
+        raw_results = await self._asearch(
+            vector=search_vector,
+            collection=collection,
+            k=k + 1,
+            score_threshold=score_threshold,
+            filters=filters,
         )
 
+        ranked_results = self._rerank(
+            results=raw_results,
+            query_vector=query_vector,
+            k=k,
+        )
+
+        return _package(query, rewritten_query, ranked_results, collection)
+
+    def search_batch(
+        self,
+        texts: list[str],
+        collection: str,
+        k: int = 1,
+        score_threshold: float = config.RAG_SCORE_THRESHOLD,
+    ) -> tuple[list[list[dict]], list[list[float]]]:
+        """
+        Bulk similarity search — no rewrite, no re-rank.
+        ONE embed_documents call for all texts, ONE Qdrant query_batch_points call.
+
+        Returns (hits per text, vector per text). Vectors are returned so callers
+        can store new points without embedding the same text again.
+        """
+        if not texts:
+            return [], []
+        vectors = self.embeddings.embed_documents(texts)
+        responses = self.client.query_batch_points(
+            collection_name=collection,
+            requests=_batch_requests(vectors, k, score_threshold),
+        )
+        return [[_hit(p) for p in r.points] for r in responses], vectors
+
+    async def asearch_batch(
+        self,
+        texts: list[str],
+        collection: str,
+        k: int = 1,
+        score_threshold: float = config.RAG_SCORE_THRESHOLD,
+    ) -> tuple[list[list[dict]], list[list[float]]]:
+        """Async twin of search_batch()."""
+        if not texts:
+            return [], []
+        vectors = await self.embeddings.aembed_documents(texts)
+        responses = await self.async_client.query_batch_points(
+            collection_name=collection,
+            requests=_batch_requests(vectors, k, score_threshold),
+        )
+        return [[_hit(p) for p in r.points] for r in responses], vectors
+
+    def rewrite_stats(self) -> dict[str, dict]:
+        """
+        Per-collection rewrite counters:
+          llm_calls, exact_hits, semantic_hits, skipped, latency_saved_ms
+        Saved latency = avoided rewrites x observed mean rewrite latency for that model.
+        """
+        with self._stats_lock:
+            return {c: dict(v) for c, v in self._rewrite_stats.items()}
+
     # ------------------------------------------------------------------
     # Private methods
     # ------------------------------------------------------------------
 
-    def _rewrite_query(self, query: str) -> str:
+    def _rewrite_query(self, query: str, collection: str = "", rewrite: RewritePolicy = True) -> str:
         """
         Use LLM to expand the query for better semantic recall.
 
@@ -116,55 +231,218 @@ class RAGAgent:
           Output: "software quality issues involving incorrect outputs,
                    wrong calculations, misclassified data, or inaccurate
                    numerical results in production systems"
+
+        Honors the rewrite policy and the rewrite cache. On failure, falls
+        back to the original query.
         """
-        # TODO: implement LLM query rewriting
-        # Hint: use self.llm.invoke() with QUERY_REWRITE_PROMPT
-        # Return the rewritten query string
-        # On failure, fall back to original query
-        raise NotImplementedError
+        if not rewrite:
+            self._record(collection, "skipped", config.LLM_MODEL)
+            return query
+        llm, model = self._rewrite_llm(rewrite)
+
+        cached = self.rewrite_cache.lookup_exact(model, query)
+        if cached is not None:
+            self._record(collection, "exact_hits", model)
+            return cached
+        vector = self.embeddings.embed_query(query)
+        cached = self.rewrite_cache.lookup_similar(model, vector)
+        if cached is not None:
+            self._record(collection, "semantic_hits", model)
+            return cached
+
+        started = time.perf_counter()
+        try:
+            response = invoke_llm(llm, QUERY_REWRITE_PROMPT.format(query=query))
+        except Exception:
+            return query
+        rewritten = self._finish_rewrite(collection, model, response.content, started)
+        if rewritten is None:
+            return query
+        self.rewrite_cache.store(model, query, rewritten, vector)
+        return rewritten
+
+    async def _arewrite_query(self, query: str, collection: str = "", rewrite: RewritePolicy = True) -> str:
+        """Async twin of _rewrite_query()."""
+        if not rewrite:
+            self._record(collection, "skipped", config.LLM_MODEL)
+            return query
+        llm, model = self._rewrite_llm(rewrite)
+
+        # the exact tier and store() hit SQLite — off the loop; the paraphrase tier is in memory
+        cached = await asyncio.to_thread(self.rewrite_cache.lookup_exact, model, query)
+        if cached is not None:
+            self._record(collection, "exact_hits", model)
+            return cached
+        vector = await self.embeddings.aembed_query(query)
+        cached = self.rewrite_cache.lookup_similar(model, vector)
+        if cached is not None:
+            self._record(collection, "semantic_hits", model)
+            return cached
+
+        started = time.perf_counter()
+        try:
+            response = await ainvoke_llm(llm, QUERY_REWRITE_PROMPT.format(query=query))
+        except Exception:
+            return query
+        rewritten = self._finish_rewrite(collection, model, response.content, started)
+        if rewritten is None:
+            return query
+        await asyncio.to_thread(self.rewrite_cache.store, model, query, rewritten, vector)
+        return rewritten
+
+    def _rewrite_llm(self, rewrite: RewritePolicy) -> tuple[ChatOpenAI, str]:
+        if rewrite == "cheap":
+            return self.cheap_llm, config.REWRITE_CHEAP_MODEL
+        return self.llm, config.LLM_MODEL
+
+    def _finish_rewrite(self, collection: str, model: str, content: str, started: float) -> Optional[str]:
+        """Record latency and return the rewrite — None if the LLM returned nothing. Callers cache it."""
+        rewritten = content.strip()
+        if not rewritten:
+            return None
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            previous = self._rewrite_latency_ms.get(model)
+            self._rewrite_latency_ms[model] = elapsed_ms if previous is None else 0.8 * previous + 0.2 * elapsed_ms
+        self._record(collection, "llm_calls", model)
+        return rewritten
+
+    def _record(self, collection: str, outcome: str, model: str) -> None:
+        with self._stats_lock:
+            stats = self._rewrite_stats.setdefault(collection, {
+                "llm_calls": 0, "exact_hits": 0, "semantic_hits": 0,
+                "skipped": 0, "latency_saved_ms": 0.0,
+            })
+            stats[outcome] += 1
+            if outcome != "llm_calls":
+                stats["latency_saved_ms"] = round(
+                    stats["latency_saved_ms"] + self._rewrite_latency_ms.get(model, 0.0), 1
+                )
+
+    def _embed_queries(self, rewritten_query: str, original_query: str) -> tuple[list[float], list[float]]:
+        """
+        Embed the search query and the re-rank query together.
+        One embedding request per retrieval (none on a cache hit).
+        """
+        if rewritten_query == original_query:
+            vector = self.embeddings.embed_query(original_query)
+            return vector, vector
+        search_vector, query_vector = self.embeddings.embed_documents([rewritten_query, original_query])
+        return search_vector, query_vector
+
+    async def _aembed_queries(self, rewritten_query: str, original_query: str) -> tuple[list[float], list[float]]:
+        """Async twin of _embed_queries()."""
+        if rewritten_query == original_query:
+            vector = await self.embeddings.aembed_query(original_query)
+            return vector, vector
+        search_vector, query_vector = await self.embeddings.aembed_documents([rewritten_query, original_query])
+        return search_vector, query_vector
 
     def _search(
         self,
-        query: str,
+        vector: list[float],
         collection: str,
         k: int,
         score_threshold: float,
         filters: Optional[Filter],
     ) -> list[dict]:
         """
-        Embed the query and perform vector similarity search in Qdrant.
+        Vector similarity search in Qdrant. Stored vectors are returned with each
+        hit so _rerank() can score them without re-embedding payload text.
 
-        Returns list of dicts with keys: id, score, payload
+        Returns list of dicts with keys: id, score, payload, vector
         """
-        # TODO: implement Qdrant search
-        # Hint:
-        #   1. vector = self.embeddings.embed_query(query)
-        #   2. results = self.client.search(
-        #          collection_name=collection,
-        #          query_vector=vector,
-        #          limit=k,
-        #          score_threshold=score_threshold,
-        #          query_filter=filters,
-        #      )
-        #   3. return [{"id": r.id, "score": r.score, "payload": r.payload} for r in results]
-        raise NotImplementedError
+        response = self.client.query_points(
+            collection_name=collection,
+            query=vector,
+            limit=k,
+            score_threshold=score_threshold,
+            query_filter=filters,
+            with_vectors=True,
+        )
+        return [_hit(r) for r in response.points]
 
-    def _rerank(self, results: list[dict], original_query: str, k: int) -> list[dict]:
+    async def _asearch(
+        self,
+        vector: list[float],
+        collection: str,
+        k: int,
+        score_threshold: float,
+        filters: Optional[Filter],
+    ) -> list[dict]:
+        """Async twin of _search()."""
+        response = await self.async_client.query_points(
+            collection_name=collection,
+            query=vector,
+            limit=k,
+            score_threshold=score_threshold,
+            query_filter=filters,
+            with_vectors=True,
+        )
+        return [_hit(r) for r in response.points]
+
+    def _rerank(self, results: list[dict], query_vector: list[float], k: int) -> list[dict]:
         """
         Re-rank results by relevance to the original (non-rewritten) query.
         Keeps top k results.
 
-        Simple strategy: re-score using dot product against original query embedding.
-        Advanced strategy: use a cross-encoder or LLM-based reranker.
-        """
-        # TODO: implement re-ranking
-        # Simple approach:
-        #   1. Embed the original_query
-        #   2. For each result, compute cosine similarity between
-        #      original_query embedding and result payload text embedding
-        #   3. Sort by new score, return top k
-        # Fallback: return results[:k] sorted by existing score
-        raise NotImplementedError
+        Scores every candidate's stored vector against the original-query
+        embedding in one matrix-vector product — no network calls.
+        Fallback: hits without a stored vector keep the search ordering.
+        """
+        if not results:
+            return []
+        if any(r.get("vector") is None for r in results):
+            return sorted(results, key=lambda r: r["score"], reverse=True)[:k]
+
+        q = np.asarray(query_vector, dtype=np.float32)
+        docs = np.asarray([r["vector"] for r in results], dtype=np.float32)
+        norms = np.linalg.norm(docs, axis=1) * (np.linalg.norm(q) or 1.0)
+        scores = docs @ q / np.where(norms == 0, 1.0, norms)
+
+        order = np.argsort(-scores, kind="stable")[:k]
+        return [{**results[i], "score": float(scores[i])} for i in order]
+
+
+# ------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------
+
+def payload_text(payload: dict) -> str:
+    """
+    Extract the searchable text from a Qdrant payload.
+    Knowledge chunks (ingested via langchain_qdrant) store it under "page_content";
+    ticket payloads written by jira_agent store it under "text".
+    """
+    payload = payload or {}
+    return payload.get("text") or payload.get("page_content") or ""
+
+
+def _batch_requests(vectors: list[list[float]], k: int, score_threshold: float) -> list[QueryRequest]:
+    return [
+        QueryRequest(query=v, limit=k, score_threshold=score_threshold, with_payload=True)
+        for v in vectors
+    ]
+
+
+def _hit(point) -> dict:
+    """Qdrant ScoredPoint → plain dict. Named-vector collections use their first vector."""
+    vector = point.vector
+    if isinstance(vector, dict):
+        vector = next(iter(vector.values()), None)
+    return {"id": point.id, "score": point.score, "payload": point.payload, "vector": vector}
+
+
+def _package(query: str, rewritten_query: str, ranked_results: list[dict], collection: str) -> RAGResult:
+    """Build the RAGResult contract returned by retrieve() / aretrieve()."""
+    top_score = ranked_results[0]["score"] if ranked_results else 0.0
+    return RAGResult(
+        query=query,
+        rewritten_query=rewritten_query,
+        results=[r["payload"] for r in ranked_results],
+        confidence=round(top_score, 4),
+        source_collection=collection,
+    )
 
 
 # Module-level singleton — shared across all callers
@@ -25,10 +25,15 @@ Teaching point:
   The agent doesn't need to know what kind of issues these are — the query tells it.
 """
 
+import json
+
+from langchain_openai import ChatOpenAI
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
 
 from schemas.state import SlackResult
+from utils.llm_limiter import invoke_llm, ainvoke_llm
 import config
 
 
@@ -44,38 +49,78 @@ Format your response as Slack-compatible markdown.
 
 
 class SlackAgent:
-    def __init__(self, slack_client=None):
+    def __init__(self, slack_client=None, async_slack_client=None, llm=None):
         self.client = slack_client or WebClient(token=config.SLACK_BOT_TOKEN)
+        self.async_client = async_slack_client or AsyncWebClient(token=config.SLACK_BOT_TOKEN)
+        self.llm = llm or ChatOpenAI(
+            model=config.LLM_MODEL,
+            openai_api_key=config.OPENAI_API_KEY,
+            temperature=0.2,
+        )
 
     def run(self, issues: list[dict], slack_query: str) -> SlackResult:
         """
         Generate summary and post to Slack. Returns SlackResult.
         """
-        # TODO: implement Slack agent
-        # Steps:
-        #   1. Initialize ChatOpenAI(model=config.LLM_MODEL, temperature=0.2)
-        #   2. issues_json = json.dumps([{id, title, description} for i in issues])
-        #   3. Format SUMMARY_PROMPT with slack_query + issues_json
-        #   4. response = llm.invoke(prompt) → summary_markdown string
-        #   5. Post with retry:
-        #        for attempt in range(config.MAX_TOOL_RETRIES + 1):
-        #            try:
-        #                resp = self.client.chat_postMessage(
-        #                    channel=config.SLACK_CHANNEL_ID,
-        #                    text=summary_markdown,
-        #                )
-        #                return SlackResult(
-        #                    summary_markdown=summary_markdown,
-        #                    slack_url=resp.get("message", {}).get("permalink"),
-        #                    success=True, error=None,
-        #                )
-        #            except SlackApiError as e:
-        #                if attempt == config.MAX_TOOL_RETRIES:
-        #                    return SlackResult(
-        #                        summary_markdown=summary_markdown,
-        #                        slack_url=None, success=False, error=str(e),
-        #                    )
-        raise NotImplementedError
+        summary_markdown = invoke_llm(self.llm, _summary_prompt(issues, slack_query)).content
+
+        for attempt in range(config.MAX_TOOL_RETRIES + 1):
+            try:
+                resp = self.client.chat_postMessage(
+                    channel=config.SLACK_CHANNEL_ID,
+                    text=summary_markdown,
+                )
+                return _posted(summary_markdown, resp)
+            except SlackApiError as e:
+                if attempt == config.MAX_TOOL_RETRIES:
+                    return _failed(summary_markdown, e)
+
+    async def arun(self, issues: list[dict], slack_query: str) -> SlackResult:
+        """
+        Async twin of run() — LLM via ainvoke, post via AsyncWebClient.
+        """
+        summary_markdown = (await ainvoke_llm(self.llm, _summary_prompt(issues, slack_query))).content
+
+        for attempt in range(config.MAX_TOOL_RETRIES + 1):
+            try:
+                resp = await self.async_client.chat_postMessage(
+                    channel=config.SLACK_CHANNEL_ID,
+                    text=summary_markdown,
+                )
+                return _posted(summary_markdown, resp)
+            except SlackApiError as e:
+                if attempt == config.MAX_TOOL_RETRIES:
+                    return _failed(summary_markdown, e)
+
+
+def _summary_prompt(issues: list[dict], slack_query: str) -> str:
+    issues_json = json.dumps(
+        [
+            {"id": i.get("id", i.get("issue_id")), "title": i.get("title", ""),
+             "description": i.get("description", "")}
+            for i in issues
+        ],
+        ensure_ascii=False,
+    )
+    return SUMMARY_PROMPT.format(slack_query=slack_query, issues_json=issues_json)
+
+
+def _posted(summary_markdown: str, resp) -> SlackResult:
+    return SlackResult(
+        summary_markdown=summary_markdown,
+        slack_url=resp.get("message", {}).get("permalink"),
+        success=True,
+        error=None,
+    )
+
+
+def _failed(summary_markdown: str, error: SlackApiError) -> SlackResult:
+    return SlackResult(
+        summary_markdown=summary_markdown,
+        slack_url=None,
+        success=False,
+        error=str(error),
+    )
 
 
 # Module-level singleton
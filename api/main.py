@@ -6,6 +6,21 @@ Endpoint:
     - Accepts optional QA file upload + required user instruction
     - Initializes AgentState and triggers LangGraph workflow
     - Returns structured response based on intent
+  POST /qa-intake?mode=async
+    - Same input; returns 202 {job_id, status_url} at once and runs the graph
+      on the background worker pool (503 + Retry-After when the queue is full)
+  GET /jobs/{job_id}
+    - queued | running | succeeded | failed, nodes completed so far, partial
+      results, and the final response once succeeded
+  POST /qa-intake/{request_id}/resume[?mode=async]
+    - Continue a failed run from its last checkpoint (completed nodes, cached
+      classification batches and already-filed tickets are not paid for again)
+  POST /qa-intake/stream?format=sse|ndjson
+    - Same input; streams per-node progress, answer tokens as they are
+      generated, then the final response (with ttft_ms — time to first token)
+  GET /metrics
+    - Per-node latency / LLM call / token / cost totals, async job queue depth
+      and worker utilisation (Prometheus text format)
 
 Teaching point:
   The API is intentionally thin:
@@ -13,24 +28,91 @@ Teaching point:
     2. Initialize AgentState
     3. Invoke graph → return result
   All intelligence lives in the graph nodes and agents.
+
+Uploads:
+  Files are read in UPLOAD_CHUNK_SIZE chunks and rejected with 413 as soon as
+  they pass MAX_UPLOAD_BYTES. The file is parsed exactly once, here, and the
+  graph receives the parsed_issues (file_parser_node passes them through), so
+  MAX_ISSUES_PER_UPLOAD and malformed files are rejected before any LLM call.
+  Text formats are parsed on a worker thread WHILE the body arrives — the
+  whole upload is never held, and the (MAX_ISSUES_PER_UPLOAD + 1)th row stops
+  the read. .xlsx is a zip and needs the whole body, read into one bytearray.
+
+Checkpointing:
+  The graph is compiled with a SQLite checkpointer (utils/checkpointer.py),
+  thread_id = request_id. A failed run answers 500 with its request_id and
+  resume_url; a run that succeeds has its checkpoints dropped, a failed one
+  is kept for CHECKPOINT_TTL. Sync and streamed runs hold a run lease
+  (aclaim), so resume answers 409 while the request is still running in any
+  worker — as it does for a queued or running async job.
+
+Concurrency:
+  The graph is awaited via graph.ainvoke(), so one slow pipeline never blocks
+  the event loop. Sync-only nodes run on the loop's default executor, bounded
+  here to NODE_THREAD_POOL_SIZE threads. Async jobs (utils/job_queue.py) run as
+  JOB_WORKERS tasks on the same loop and executor.
 """
 
+import asyncio
+import io
+import json
+import logging
+import queue
+import time
 import uuid
 import os
-from fastapi import FastAPI, UploadFile, Form, HTTPException
-from fastapi.responses import JSONResponse
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, UploadFile, Form, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from typing import AsyncIterator, Literal, Optional
 
 from graph.workflow import build_graph
-from schemas.state import AgentState
+from nodes.file_parser_node import IssueLimitError, parse_issues
+from nodes.rag_node import awarm_template_cache
+from schemas.state import AgentState, ParsedIssue
+from utils.checkpointer import RunInProgressError, aclaim, ais_running, arelease, build_checkpointer, run_config
+from utils.job_queue import JobQueue, QueueFullError
+from utils.job_store import build_job_store
+from utils.telemetry import node_metrics
+import config
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    executor = ThreadPoolExecutor(
+        max_workers=config.NODE_THREAD_POOL_SIZE,
+        thread_name_prefix="qaia-node",
+    )
+    asyncio.get_running_loop().set_default_executor(executor)
+    warmup = asyncio.create_task(_warm_rag_templates())
+    await job_queue.start()
+    yield
+    await job_queue.stop()
+    warmup.cancel()
+    executor.shutdown(wait=False)
+
+
+async def _warm_rag_templates() -> None:
+    """Precompute QUERY_TEMPLATES retrievals in the background; never blocks startup."""
+    try:
+        count = await awarm_template_cache()
+        logger.info("Precomputed %d RAG template retrievals", count)
+    except Exception:
+        logger.warning("RAG template warm-up failed — falling back to live retrieval", exc_info=True)
+
 
 app = FastAPI(
     title="QA Intelligence Agent (QAIA)",
     description="Intent-driven AI agent for QA issue analysis, filtering, and reporting",
     version="0.2.0",
+    lifespan=lifespan,
 )
 
-graph = build_graph()
+graph = build_graph(checkpointer=build_checkpointer())
+job_queue = JobQueue(graph, build_job_store())
 
 ALLOWED_EXTENSIONS = {".csv", ".xlsx", ".md", ".txt"}
 
@@ -39,6 +121,7 @@ ALLOWED_EXTENSIONS = {".csv", ".xlsx", ".md", ".txt"}
 async def qa_intake(
     instruction: str = Form(..., description="Natural language query or instruction"),
     file: Optional[UploadFile] = None,
+    mode: Literal["sync", "async"] = Query("sync", description="async: return a job id, poll /jobs/{id}"),
 ):
     """
     Accept any QA instruction with optional file upload.
@@ -49,30 +132,193 @@ async def qa_intake(
       - instruction="What are common performance bugs in ML systems?" (no file)
       - instruction="Summarize all P1 issues", file=issues.csv
     """
-    # Validate file type if provided
-    raw_content = None
-    file_name = None
-    if file is not None:
-        file_ext = os.path.splitext(file.filename)[1].lower()
-        if file_ext not in ALLOWED_EXTENSIONS:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Unsupported file type '{file_ext}'. Allowed: {ALLOWED_EXTENSIONS}",
-            )
-        raw_bytes = await file.read()
-        raw_content = raw_bytes.decode("utf-8", errors="replace")
-        file_name = file.filename
-
-    # Initialize AgentState
-    initial_state: AgentState = {
+    issues, file_name = await _accept_upload(file)
+    initial_state = _initial_state(instruction, issues, file_name)
+
+    if mode == "async":
+        try:
+            job = await job_queue.submit(initial_state)
+        except QueueFullError as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+        return JSONResponse(status_code=202, content={
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "status_url": f"/jobs/{job['job_id']}",
+        })
+
+    # TODO: wrap with LangSmith tracing context (os.environ["LANGCHAIN_TRACING_V2"] = "true")
+    return await _run_graph(initial_state, initial_state["request_id"])
+
+
+@app.post("/qa-intake/{request_id}/resume")
+async def resume(
+    request_id: str,
+    mode: Literal["sync", "async"] = Query("sync", description="async: return a job id, poll /jobs/{id}"),
+):
+    """
+    Continue a failed run from its last checkpoint. Nodes that completed are
+    not re-run; the failed node re-runs with its per-issue work already
+    persisted (classification cache, JIRA ticket ledger).
+    """
+    if graph.checkpointer is None:
+        raise HTTPException(status_code=409, detail="Checkpointing is disabled (CHECKPOINTING=false)")
+    if await job_queue.is_active(request_id) or await ais_running(graph, request_id):
+        raise HTTPException(status_code=409, detail=f"Request '{request_id}' is still running")
+    snapshot = await graph.aget_state(run_config(request_id))
+    if not snapshot.next:
+        raise HTTPException(status_code=404, detail=f"No interrupted run for request '{request_id}'")
+
+    if mode == "async":
+        try:
+            job = await job_queue.resume(request_id)
+        except QueueFullError as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+        return JSONResponse(status_code=202, content={
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "status_url": f"/jobs/{job['job_id']}",
+        })
+    return await _run_graph(None, request_id)
+
+
+async def _run_graph(initial_state: Optional[AgentState], request_id: str) -> JSONResponse:
+    """Run (initial_state) or resume (None) one request's graph thread, holding its run lease."""
+    try:
+        async with aclaim(graph, request_id):
+            try:
+                final_state = await graph.ainvoke(initial_state, config=run_config(request_id))
+            except Exception as e:
+                logger.exception("Request %s failed", request_id)
+                return JSONResponse(status_code=500, content=_failure(request_id, e))
+            await arelease(graph, request_id)
+    except RunInProgressError as e:  # a concurrent resume of the same request got there first
+        raise HTTPException(status_code=409, detail=str(e))
+    return JSONResponse(content=final_state["metrics"].get("response", {}))
+
+
+def _failure(request_id: str, error: Exception) -> dict:
+    failure = {"detail": str(error), "request_id": request_id}
+    if graph.checkpointer is not None:
+        failure["resume_url"] = f"/qa-intake/{request_id}/resume"
+    return failure
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job '{job_id}'")
+    if job["status"] == "failed" and graph.checkpointer is not None:
+        job["resume_url"] = f"/qa-intake/{job_id}/resume"
+    return JSONResponse(content=job)
+
+
+@app.post("/qa-intake/stream")
+async def qa_intake_stream(
+    instruction: str = Form(..., description="Natural language query or instruction"),
+    file: Optional[UploadFile] = None,
+    format: Literal["sse", "ndjson"] = Query("sse", description="Server-Sent Events or NDJSON"),
+):
+    """
+    Same contract as /qa-intake, streamed:
+      node      {node, elapsed_ms, latency_ms}   — as each graph node finishes
+      token     {text}                           — answer / analysis tokens as generated
+      response  {...final response, ttft_ms, total_ms}
+      error     {detail, request_id, resume_url}   — the graph failed mid-stream
+    """
+    issues, file_name = await _accept_upload(file)
+    initial_state = _initial_state(instruction, issues, file_name)
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_events(initial_state, format),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _stream_events(initial_state: AgentState, fmt: str) -> AsyncIterator[str]:
+    """Translate graph.astream() chunks into client events; TTFT is measured from request receipt."""
+    request_id = initial_state["request_id"]
+    start = time.perf_counter()
+    ttft_ms = None
+    response: dict = {}
+
+    def elapsed_ms() -> float:
+        return round((time.perf_counter() - start) * 1000, 1)
+
+    failed = False
+    try:
+        async with aclaim(graph, request_id):
+            async for mode, chunk in graph.astream(
+                initial_state,
+                config=run_config(request_id, stream_tokens=True),
+                stream_mode=["updates", "custom"],
+            ):
+                if mode == "custom" and "token" in chunk:
+                    if ttft_ms is None:
+                        ttft_ms = elapsed_ms()
+                        node_metrics.observe_ttft(ttft_ms)
+                    yield _event(fmt, "token", {"text": chunk["token"]})
+                    continue
+                if mode != "updates":
+                    continue
+                for node, update in chunk.items():
+                    record = ((update or {}).get("metrics") or {}).get("nodes", {}).get(node, {})
+                    response = ((update or {}).get("metrics") or {}).get("response", response)
+                    yield _event(fmt, "node", {
+                        "node": node,
+                        "elapsed_ms": elapsed_ms(),
+                        "latency_ms": record.get("latency_ms"),
+                    })
+            yield _event(fmt, "response", {**response, "ttft_ms": ttft_ms, "total_ms": elapsed_ms()})
+    except Exception as e:
+        failed = True
+        logger.exception("Streaming request %s failed", request_id)
+        yield _event(fmt, "error", _failure(request_id, e))
+    finally:
+        # Also on client disconnect, like a finished run; only a failed one stays resumable.
+        # Starlette cancels the generator on disconnect — shield lets the delete finish.
+        if not failed:
+            await asyncio.shield(arelease(graph, request_id))
+
+
+def _event(fmt: str, name: str, data: dict) -> str:
+    payload = json.dumps(data, default=str)
+    if fmt == "sse":
+        return f"event: {name}\ndata: {payload}\n\n"
+    return json.dumps({"event": name, "data": data}, default=str) + "\n"
+
+
+async def _accept_upload(file: Optional[UploadFile]) -> tuple[list[ParsedIssue], Optional[str]]:
+    """Check type, then read and parse within limits — ([], None) without a file."""
+    if file is None:
+        return [], None
+    file_ext = os.path.splitext(file.filename)[1].lower()
+    if file_ext not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type '{file_ext}'. Allowed: {ALLOWED_EXTENSIONS}",
+        )
+    try:
+        issues = await _parse_upload(file, file_ext)
+    except IssueLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except (ValueError, KeyError) as e:
+        raise HTTPException(status_code=400, detail=f"Could not parse '{file.filename}': {e}")
+    return issues, file.filename
+
+
+def _initial_state(instruction: str, issues: list[ParsedIssue], file_name: Optional[str]) -> AgentState:
+    return {
         "request_id":       str(uuid.uuid4()),
         "trace_id":         str(uuid.uuid4()),
         "instruction":      instruction,
-        "raw_file_content": raw_content,
+        "raw_file_content": None,  # parsed on upload — see _parse_upload()
         "file_name":        file_name,
         "enriched_task":    None,
         "rag_context":      None,
-        "parsed_issues":    [],
+        "parsed_issues":    issues,
+        "issue_clusters":   {},
         "classified_issues": [],
         "filtered_issues":  [],
         "slack_query":      None,
@@ -85,10 +331,78 @@ async def qa_intake(
         "metrics":          {},
     }
 
-    # TODO: wrap with LangSmith tracing context (os.environ["LANGCHAIN_TRACING_V2"] = "true")
-    final_state = graph.invoke(initial_state)
 
-    return JSONResponse(content=final_state["metrics"].get("response", {}))
+async def _parse_upload(file: UploadFile, file_ext: str) -> list[ParsedIssue]:
+    """Parse the upload off the event loop; text formats while it is still arriving."""
+    if file_ext == ".xlsx":  # a zip — needs the whole body
+        content = bytearray()
+        async for chunk in _upload_chunks(file):
+            content += chunk
+        return await asyncio.to_thread(parse_issues, content, file.filename)
+
+    stream = _UploadStream()
+    parsing = asyncio.ensure_future(asyncio.to_thread(parse_issues, io.BufferedReader(stream), file.filename))
+    try:
+        async for chunk in _upload_chunks(file):
+            if parsing.done():  # the parser already failed (bad header, too many issues)
+                break
+            stream.feed(chunk)
+    except BaseException:
+        parsing.cancel()
+        raise
+    finally:
+        stream.feed(b"")  # end of body — lets the parser thread finish
+    return await parsing
+
+
+async def _upload_chunks(file: UploadFile) -> AsyncIterator[bytes]:
+    """Yield the upload in chunks; stop at the first byte over MAX_UPLOAD_BYTES."""
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"File exceeds the {config.MAX_UPLOAD_BYTES} byte upload limit",
+    )
+    if file.size is not None and file.size > config.MAX_UPLOAD_BYTES:
+        raise too_large
+
+    size = 0
+    while chunk := await file.read(config.UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > config.MAX_UPLOAD_BYTES:
+            raise too_large
+        yield chunk
+
+
+class _UploadStream(io.RawIOBase):
+    """Blocking binary stream over chunks the event loop feeds in; b"" marks the end."""
+
+    def __init__(self):
+        self._chunks: queue.SimpleQueue = queue.SimpleQueue()
+        self._pending = memoryview(b"")
+        self._ended = False
+
+    def feed(self, chunk: bytes) -> None:
+        self._chunks.put(chunk)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending and not self._ended:
+            self._pending = memoryview(self._chunks.get())
+            self._ended = not self._pending
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus scrape target — see utils/telemetry.py."""
+    return PlainTextResponse(
+        node_metrics.render() + job_queue.render(),
+        media_type="text/plain; version=0.0.4",
+    )
 
 
 @app.get("/health")
@@ -0,0 +1,137 @@
+"""
+Concurrency benchmark — graph.invoke() vs graph.ainvoke() under concurrent requests.
+
+Simulates the /qa-intake query-only path (enrichment → query_answer → aggregator
+→ response_builder) with fake LLM / retrieval latency, and measures throughput
+as the number of in-flight requests grows.
+
+  python benchmarks/bench_concurrency.py
+
+  blocking  — old endpoint behaviour: graph.invoke() inside the event loop,
+              so requests are served one at a time regardless of concurrency.
+  async     — graph.ainvoke(): in-flight requests overlap their I/O waits.
+
+No OpenAI / Qdrant / JIRA access needed — all external clients are faked.
+The process-wide llm_limiter is swapped for an unthrottled one: its OpenAI
+RPM / TPM budget would otherwise be what this benchmark measures.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+LLM_LATENCY_S = 0.2
+RETRIEVAL_LATENCY_S = 0.1
+IN_FLIGHT = [1, 2, 5, 10, 20]
+
+QUERY_CONTRACT = json.dumps({
+    "intent": "query",
+    "requires_file_processing": False,
+    "filter_criteria": None,
+    "requires_slack_post": False,
+    "requires_ticket_creation": False,
+    "requires_analysis": True,
+    "output_format": "executive",
+})
+
+
+class FakeMessage:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FakeLLM:
+    """Stands in for ChatOpenAI: fixed latency, fixed content."""
+
+    def __init__(self, content: str, latency: float = LLM_LATENCY_S):
+        self.content = content
+        self.latency = latency
+
+    def invoke(self, prompt):
+        time.sleep(self.latency)
+        return FakeMessage(self.content)
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(self.latency)
+        return FakeMessage(self.content)
+
+
+def _fake_rag_result(query, collection, **kwargs):
+    return {"query": query, "rewritten_query": query, "results": [],
+            "confidence": 0.0, "source_collection": collection}
+
+
+def fake_retrieve(query, collection, **kwargs):
+    time.sleep(RETRIEVAL_LATENCY_S)
+    return _fake_rag_result(query, collection)
+
+
+async def fake_aretrieve(query, collection, **kwargs):
+    await asyncio.sleep(RETRIEVAL_LATENCY_S)
+    return _fake_rag_result(query, collection)
+
+
+def initial_state() -> dict:
+    return {
+        "request_id": str(uuid.uuid4()), "trace_id": str(uuid.uuid4()),
+        "instruction": "What are common performance bugs?",
+        "raw_file_content": None, "file_name": None,
+        "enriched_task": None, "rag_context": None, "parsed_issues": [],
+        "classified_issues": [], "filtered_issues": [],
+        "slack_query": None, "jira_query": None, "answer_query": None,
+        "slack_result": None, "jira_result": None, "answer_result": None,
+        "errors": [], "metrics": {},
+    }
+
+
+async def run_wave(graph, n: int, mode: str) -> float:
+    """Fire n concurrent requests, return requests/second."""
+    async def blocking():
+        return graph.invoke(initial_state())
+
+    async def non_blocking():
+        return await graph.ainvoke(initial_state())
+
+    handler = blocking if mode == "blocking" else non_blocking
+    start = time.perf_counter()
+    await asyncio.gather(*[handler() for _ in range(n)])
+    return n / (time.perf_counter() - start)
+
+
+async def main():
+    with patch("jira.JIRA"):
+        from graph.workflow import build_graph
+        from utils.llm_limiter import LLMLimiter
+        from agents.answer_agent import answer_agent
+        from agents.rag_agent import rag_agent
+        import config
+
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=config.NODE_THREAD_POOL_SIZE)
+    )
+    answer_agent.llm = FakeLLM("Common performance bugs include ...")
+    rag_agent.retrieve = fake_retrieve
+    rag_agent.aretrieve = fake_aretrieve
+
+    unthrottled = LLMLimiter(max_concurrency=100, rpm=100_000, tpm=100_000_000)
+    with patch("nodes.enrichment_node._build_llm", return_value=FakeLLM(QUERY_CONTRACT)), \
+         patch("utils.llm_limiter.llm_limiter", unthrottled):
+        graph = build_graph()
+        print(f"{'in-flight':>10} {'blocking req/s':>16} {'async req/s':>13} {'speedup':>8}")
+        for n in IN_FLIGHT:
+            blocking = await run_wave(graph, n, "blocking")
+            non_blocking = await run_wave(graph, n, "async")
+            print(f"{n:>10} {blocking:>16.2f} {non_blocking:>13.2f} {non_blocking / blocking:>7.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
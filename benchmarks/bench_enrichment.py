@@ -0,0 +1,136 @@
+"""
+Enrichment fast-path benchmark — keyword rules vs the enrichment LLM.
+
+  python benchmarks/bench_enrichment.py          # rules only (offline)
+  python benchmarks/bench_enrichment.py --llm    # also call the LLM (needs OPENAI_API_KEY)
+
+Labelled set: tests/fixtures/enrichment_instructions.json
+  {instruction, has_file, expected: {intent, requires_file_processing, filter_type,
+   confidence_threshold, requires_slack_post, requires_ticket_creation,
+   requires_analysis, output_format}}
+
+Labels are written from ENRICHMENT_PROMPT's field definitions and the PRD §9.2
+example, not from what the rules return — e.g. "post a summary to Slack" is
+requires_analysis=false (the summary is the Slack post, no inline answer).
+Where the prompt is silent, the PRD example decides: a Slack post without a
+format word is "executive". The prompt's ticket keyword "file" is not applied
+to "in this file".
+
+Only --llm measures agreement with the model; the rules-only score says the
+rules follow those definitions, not that they agree with gpt-4o.
+
+Reports:
+  coverage     — share of instructions the rules answer without the LLM
+  accuracy     — contracts where every labelled field matches, and per field
+  latency      — rules (µs) vs LLM (ms)
+  agreement    — with --llm: rules vs LLM on the instructions the rules answered
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+from nodes.enrichment_rules import rule_based_contract  # noqa: E402
+
+FIXTURE = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "enrichment_instructions.json"
+REPEATS = 1000
+
+
+def fields(contract: dict) -> dict:
+    """The labelled projection of an EnrichedTask (description is free text, not compared)."""
+    criteria = contract.get("filter_criteria") or {}
+    if isinstance(criteria, list):  # multi-criteria contract — compared field by field as lists
+        criteria = {key: [c.get(key) for c in criteria] for key in ("type", "confidence_threshold")}
+    return {
+        "intent":                   contract.get("intent"),
+        "requires_file_processing": contract.get("requires_file_processing"),
+        "filter_type":              criteria.get("type"),
+        "confidence_threshold":     criteria.get("confidence_threshold"),
+        "requires_slack_post":      contract.get("requires_slack_post"),
+        "requires_ticket_creation": contract.get("requires_ticket_creation"),
+        "requires_analysis":        contract.get("requires_analysis"),
+        "output_format":            contract.get("output_format"),
+    }
+
+
+def score(predictions: list[tuple[dict, dict]]) -> tuple[float, dict[str, float]]:
+    """(exact-match rate, per-field accuracy) over (predicted, expected) pairs."""
+    if not predictions:
+        return 0.0, {}
+    exact = sum(fields(p) == e for p, e in predictions) / len(predictions)
+    per_field = {
+        name: sum(fields(p)[name] == e[name] for p, e in predictions) / len(predictions)
+        for name in predictions[0][1]
+    }
+    return exact, per_field
+
+
+def rules_latency_us(rows: list[dict]) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for row in rows:
+            rule_based_contract(row["instruction"], row["has_file"])
+    return (time.perf_counter() - start) / (REPEATS * len(rows)) * 1e6
+
+
+def run_llm(rows: list[dict]) -> tuple[list[dict], list[float]]:
+    from nodes.enrichment_node import enrichment_node
+    import config
+
+    config.ENRICHMENT_FAST_PATH = False
+    contracts, latencies = [], []
+    for row in rows:
+        state = {"instruction": row["instruction"], "errors": [],
+                 "raw_file_content": b"" if row["has_file"] else None,
+                 "file_name": "issues.csv" if row["has_file"] else None}
+        start = time.perf_counter()
+        contracts.append(enrichment_node(state)["enriched_task"])
+        latencies.append((time.perf_counter() - start) * 1000)
+    return contracts, latencies
+
+
+def print_scores(label: str, predictions: list[tuple[dict, dict]]) -> None:
+    exact, per_field = score(predictions)
+    print(f"{label:<28} exact {exact:6.1%}   (n={len(predictions)})")
+    for name, accuracy in per_field.items():
+        print(f"    {name:<26} {accuracy:6.1%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--llm", action="store_true", help="also run the enrichment LLM")
+    args = parser.parse_args()
+
+    rows = json.loads(FIXTURE.read_text())
+    rules = [rule_based_contract(r["instruction"], r["has_file"]) for r in rows]
+    answered = [(c, r["expected"]) for c, r in zip(rules, rows) if c is not None]
+
+    print(f"{len(rows)} labelled instructions")
+    print(f"rules coverage               {len(answered) / len(rows):6.1%}   "
+          f"({len(rows) - len(answered)} fall back to the LLM)")
+    print(f"rules latency                {rules_latency_us(rows):8.1f} µs / instruction")
+    print_scores("rules (answered only)", answered)
+
+    if not args.llm:
+        return
+
+    llm, latencies = run_llm(rows)
+    print(f"LLM latency                  {statistics.median(latencies):8.1f} ms median")
+    print_scores("LLM (all)", [(c, r["expected"]) for c, r in zip(llm, rows)])
+    print_scores("LLM (rules-answered)",
+                 [(c, r["expected"]) for c, rc, r in zip(llm, rules, rows) if rc is not None])
+    agreement = [fields(rc) == fields(c) for c, rc in zip(llm, rules) if rc is not None]
+    print(f"rules vs LLM agreement       {sum(agreement) / max(len(agreement), 1):6.1%}")
+    hybrid = [(rc or c, r["expected"]) for c, rc, r in zip(llm, rules, rows)]
+    print_scores("hybrid (rules → LLM)", hybrid)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+JIRA bulk-creation benchmark — one create_issue() per ticket vs create_issues() chunks.
+
+  python benchmarks/bench_jira_bulk.py
+
+Starts a local mock JIRA REST server (threaded, REQUEST_LATENCY_S per request)
+and drives it with the real `jira` client:
+
+  per-issue — the previous JiraAgent behaviour: create_issue(fields) per ticket
+              (prefetch=True → POST /issue + GET /issue/{key}), 5 in flight
+  bulk      — JiraAgent._create_issues(): POST /issue/bulk, JIRA_BULK_CHUNK_SIZE
+              tickets per request, prefetch=False
+
+Only the JIRA stage is measured; ticket generation (LLM) is identical for both.
+"""
+
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+REQUEST_LATENCY_S = 0.05   # typical JIRA Cloud round-trip
+TICKET_COUNTS = [5, 20, 50, 200]
+CONCURRENCY = 5            # MAX_CONCURRENT_TICKETS
+
+TICKET = {"summary": "Bug", "description": "d", "steps": "s",
+          "expected": "e", "actual": "a", "priority": "P2"}
+
+
+class MockJira(BaseHTTPRequestHandler):
+    keys = itertools.count(1)
+    requests = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path.endswith("/issue/bulk"):
+            issues = [self._issue() for _ in body["issueUpdates"]]
+            self._reply(201, {"issues": issues, "errors": []})
+        else:
+            self._reply(201, self._issue())
+
+    def do_GET(self):
+        key = self.path.rsplit("/", 1)[-1].split("?")[0]
+        self._reply(200, {"id": key, "key": key, "self": self.path, "fields": {}})
+
+    def _issue(self) -> dict:
+        key = f"QAIA-{next(self.keys)}"
+        return {"id": key, "key": key, "self": f"/rest/api/2/issue/{key}"}
+
+    def _reply(self, status: int, payload: dict) -> None:
+        with self.lock:
+            MockJira.requests += 1
+        time.sleep(REQUEST_LATENCY_S)
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def per_issue(client, tickets) -> None:
+    from agents.jira_agent import _ticket_fields
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        list(pool.map(lambda t: client.create_issue(fields=_ticket_fields(t)), tickets))
+
+
+def bulk(agent, tickets) -> None:
+    outcomes = agent._create_issues(tickets)
+    assert not any(isinstance(o, BaseException) for o in outcomes), outcomes
+
+
+def measure(fn, *args) -> tuple[float, int]:
+    MockJira.requests = 0
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000, MockJira.requests
+
+
+def main() -> None:
+    from jira import JIRA
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockJira)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    client = JIRA(server=url, basic_auth=("bench", "token"), get_server_info=False, max_retries=0)
+
+    with patch("jira.JIRA"):  # the module-level singleton would otherwise connect to JIRA
+        from agents.jira_agent import JiraAgent
+    agent = JiraAgent(jira_client=client, llm=object())
+
+    print(f"mock JIRA at {url}, {REQUEST_LATENCY_S * 1000:.0f} ms per request\n")
+    print(f"{'tickets':>8} {'per-issue ms':>13} {'requests':>9} {'bulk ms':>9} {'requests':>9} {'speedup':>8}")
+    for count in TICKET_COUNTS:
+        tickets = [dict(TICKET) for _ in range(count)]
+        legacy_ms, legacy_requests = measure(per_issue, client, tickets)
+        bulk_ms, bulk_requests = measure(bulk, agent, tickets)
+        print(f"{count:>8} {legacy_ms:>13.0f} {legacy_requests:>9} {bulk_ms:>9.0f} "
+              f"{bulk_requests:>9} {legacy_ms / bulk_ms:>7.1f}x")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
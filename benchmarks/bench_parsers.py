@@ -0,0 +1,118 @@
+"""
+Parser benchmark — list-based parsers vs streaming generators, per format.
+
+  python benchmarks/bench_parsers.py              # 1k / 10k / 100k rows
+  python benchmarks/bench_parsers.py 1000 5000    # custom sizes
+
+  legacy  — the pre-change parsers: full row list (pd.read_excel for .xlsx),
+            then a second full pass in _normalize
+  stream  — iter_issues(): generator parser → generator _normalize,
+            consumed one issue at a time (openpyxl read_only for .xlsx)
+
+Peak memory is measured with tracemalloc over the parse only; the input bytes
+are built beforehand and excluded. Python-level allocations only — pandas /
+openpyxl C buffers are not traced.
+"""
+
+import csv
+import io
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nodes.file_parser_node import iter_issues  # noqa: E402  (imported outside the timed region)
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+HEADER = ["id", "title", "description", "steps", "severity"]
+
+
+def make_rows(n: int) -> list[list[str]]:
+    return [
+        [str(i), f"Checkout total wrong #{i}", f"Subtotal off by {i % 7} cents on cart {i}",
+         "1. add item 2. open cart", ("low", "medium", "high")[i % 3]]
+        for i in range(n)
+    ]
+
+
+def make_file(ext: str, rows: list[list[str]]) -> bytes:
+    if ext == ".csv":
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+        return out.getvalue().encode("utf-8")
+    if ext == ".md":
+        lines = ["| " + " | ".join(HEADER) + " |", "|" + "---|" * len(HEADER)]
+        lines += ["| " + " | ".join(r) + " |" for r in rows]
+        return "\n".join(lines).encode("utf-8")
+    if ext == ".txt":
+        return "\n".join(r[1] for r in rows).encode("utf-8")
+    from openpyxl import Workbook
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(HEADER)
+    for r in rows:
+        sheet.append(r)
+    out = io.BytesIO()
+    workbook.save(out)
+    return out.getvalue()
+
+
+def legacy_parse(ext: str, content: bytes) -> list[dict]:
+    """The pre-change strategy: materialize every row, then normalize in a second pass."""
+    if ext == ".xlsx":
+        import pandas as pd
+        rows = pd.read_excel(io.BytesIO(content), dtype=str).fillna("").to_dict(orient="records")
+    else:
+        text = content.decode("utf-8", errors="replace")
+        if ext == ".csv":
+            rows = list(csv.DictReader(io.StringIO(text)))
+        elif ext == ".md":
+            table = [[c.strip() for c in line.strip().strip("|").split("|")]
+                     for line in text.splitlines() if line.strip().startswith("|")]
+            rows = [dict(zip(table[0], r)) for r in table[2:]]
+        else:
+            rows = [{"id": str(n), "title": line, "description": line}
+                    for n, line in enumerate(text.splitlines(), start=1) if line.strip()]
+    return [
+        {k.lower(): str(v).strip() for k, v in row.items()}
+        for row in rows
+    ]
+
+
+def stream_parse(ext: str, content: bytes) -> int:
+    count = 0
+    for _ in iter_issues(content, f"issues{ext}", max_issues=sys.maxsize):
+        count += 1
+    return count
+
+
+def measure(fn) -> tuple[float, float]:
+    """(elapsed ms, peak traced MiB)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or DEFAULT_SIZES
+    print(f"{'format':>6} {'rows':>8} {'legacy ms':>10} {'stream ms':>10} "
+          f"{'legacy MiB':>11} {'stream MiB':>11}")
+    for ext in (".csv", ".md", ".txt", ".xlsx"):
+        for n in sizes:
+            content = make_file(ext, make_rows(n))
+            legacy_ms, legacy_mib = measure(lambda: legacy_parse(ext, content))
+            stream_ms, stream_mib = measure(lambda: stream_parse(ext, content))
+            print(f"{ext:>6} {n:>8} {legacy_ms:>10.0f} {stream_ms:>10.0f} "
+                  f"{legacy_mib:>11.2f} {stream_mib:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Classification pre-filter benchmark — LLM calls saved vs precision / recall.
+
+  python benchmarks/bench_prefilter.py          # offline: hashed bag-of-words embeddings, labels as the LLM
+  python benchmarks/bench_prefilter.py --live   # OpenAI embeddings, Qdrant qa_taxonomy, real classifier
+
+Labelled set: tests/fixtures/expected_classifications.json
+  {issue_id, criteria_type, matches_criteria} over tests/fixtures/sample_qa_file.csv
+
+For every criteria type in the fixture, each labelled issue is scored against
+the criterion reference texts exactly as nodes/classification_prefilter.py does
+(one embed call, best cosine similarity). Then:
+
+  calibrate  — proposed LOW / HIGH: the widest band that still decides every
+               labelled issue correctly (LOW just below the lowest positive,
+               HIGH just above the highest negative)
+  report     — issues decided, LLM batches saved (CLASSIFICATION_BATCH_SIZE per
+               call), and precision / recall of LLM-only vs pre-filter → LLM:
+                 configured  the config thresholds (--live only)
+                 in-sample   the band calibrated on all labelled issues
+                 held-out    leave-one-out: each issue decided by a band
+                             calibrated on the others
+
+In-sample the band is fitted to the very issues it is scored on, so its delta
+is 0 by construction — only the held-out row says anything about accuracy.
+Offline the "LLM" answers with the labels and the embeddings are hashed words,
+so even held-out it is a smoke test of the method, not a measurement of the
+production pre-filter; the taxonomy chunk is stood in for by the filter
+keyword list. Rerun with --live on a real labelled upload before setting
+CLASSIFICATION_PREFILTER=true.
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+from nodes.classification_prefilter import criterion_scores, decide, embedding_inputs  # noqa: E402
+from nodes.enrichment_rules import FILTER_DESCRIPTIONS, FILTER_KEYWORDS  # noqa: E402
+from nodes.file_parser_node import parse_issues  # noqa: E402
+import config  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+DIM = 512
+MARGIN = 0.01
+
+
+class HashedEmbeddings:
+    """Deterministic offline stand-in: hashed bag of lower-cased words."""
+
+    def embed_documents(self, texts):
+        vectors = []
+        for text in texts:
+            vector = np.zeros(DIM)
+            for word in re.findall(r"[a-z0-9]+", text.lower()):
+                vector[zlib.crc32(word.encode()) % DIM] += 1.0
+            vectors.append(vector.tolist())
+        return vectors
+
+
+def criterion(criteria_type: str) -> dict:
+    return {"type": criteria_type, "description": FILTER_DESCRIPTIONS[criteria_type],
+            "confidence_threshold": config.DEFAULT_CONFIDENCE_THRESHOLD}
+
+
+def offline_context(criteria_type: str) -> dict:
+    """The filter keyword list stands in for the retrieved qa_taxonomy chunks."""
+    return {"results": [{"text": " ".join(sorted(FILTER_KEYWORDS[criteria_type]))}]}
+
+
+def live_context(criteria_type: str) -> dict:
+    from nodes.rag_node import rag_node
+
+    return rag_node({"enriched_task": {"filter_criteria": criterion(criteria_type)}})["rag_context"]
+
+
+def live_llm(issues: list[dict], criteria_type: str) -> dict[str, bool]:
+    from nodes.classification_node import classification_node
+
+    config.CLASSIFICATION_PREFILTER = False
+    state = {"parsed_issues": issues, "rag_context": live_context(criteria_type),
+             "enriched_task": {"filter_criteria": criterion(criteria_type)}}
+    return {r["issue_id"]: r["matches_criteria"] for r in classification_node(state)["classified_issues"]}
+
+
+def calibrate(scores: list[float], labels: list[bool]) -> tuple[float, float]:
+    """Without negatives nothing can be safely accepted (and vice versa) — that side stays closed."""
+    positives = [s for s, y in zip(scores, labels) if y]
+    negatives = [s for s, y in zip(scores, labels) if not y]
+    low = min(positives) - MARGIN if positives else -1.0
+    high = max(negatives) + MARGIN if negatives else 1.01
+    return round(low, 2), round(max(high, low), 2)
+
+
+def precision_recall(predicted: list[bool], labels: list[bool]) -> tuple[float, float]:
+    tp = sum(p and y for p, y in zip(predicted, labels))
+    return tp / max(sum(predicted), 1), tp / max(sum(labels), 1)
+
+
+def held_out(issues, labels, scores) -> tuple[dict, list]:
+    """Leave-one-out: each issue is decided by thresholds calibrated on the other issues only."""
+    crit = [criterion(issues[0]["criteria_type"])]
+    decided, uncertain = {}, []
+    for n, issue in enumerate(issues):
+        rest = [i for i in range(len(issues)) if i != n]
+        low, high = calibrate(scores[rest, 0].tolist(), [labels[i] for i in rest])
+        one_decided, one_uncertain = decide([issue], crit, scores[n:n + 1], low=low, high=high)
+        decided.update(one_decided)
+        uncertain += one_uncertain
+    return decided, uncertain
+
+
+def report(name: str, band: str, issues, labels, baseline, decided, uncertain) -> None:
+    hybrid = [decided[i["id"]]["matches_criteria"] if i["id"] in decided else baseline[i["id"]] for i in issues]
+    base_p, base_r = precision_recall([baseline[i["id"]] for i in issues], labels)
+    p, r = precision_recall(hybrid, labels)
+    size = config.CLASSIFICATION_BATCH_SIZE
+    calls, remaining = math.ceil(len(issues) / size), math.ceil(len(uncertain) / size)
+    print(f"  {name:<11} {band:<21}   decided {len(decided)}/{len(issues)}"
+          f"   LLM issues {len(uncertain)}   LLM calls {calls} → {remaining} (saved {calls - remaining})")
+    print(f"  {'':<11} precision {base_p:6.1%} → {p:6.1%} ({p - base_p:+.1%})"
+          f"   recall {base_r:6.1%} → {r:6.1%} ({r - base_r:+.1%})")
+
+
+def banded(name: str, issues, labels, baseline, scores, low, high) -> None:
+    decided, uncertain = decide(issues, [criterion(issues[0]["criteria_type"])], scores, low=low, high=high)
+    report(name, f"LOW {low:5.2f}  HIGH {high:5.2f}", issues, labels, baseline, decided, uncertain)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--live", action="store_true",
+                        help="OpenAI embeddings, Qdrant retrieval and the real classifier")
+    args = parser.parse_args()
+
+    rows = json.loads((FIXTURES / "expected_classifications.json").read_text())
+    parsed = {i["id"]: i for i in parse_issues((FIXTURES / "sample_qa_file.csv").read_bytes(), "sample.csv")}
+    if args.live:
+        from agents.rag_agent import rag_agent
+        embeddings, context = rag_agent.embeddings, live_context
+    else:
+        embeddings, context = HashedEmbeddings(), offline_context
+
+    for criteria_type in dict.fromkeys(r["criteria_type"] for r in rows):
+        labelled = [r for r in rows if r["criteria_type"] == criteria_type]
+        issues = [{**parsed[r["issue_id"]], "criteria_type": criteria_type} for r in labelled]
+        labels = [r["matches_criteria"] for r in labelled]
+        crit = [criterion(criteria_type)]
+        rag_context = context(criteria_type)
+
+        texts, references = embedding_inputs(issues, crit, rag_context)
+        scores = criterion_scores(embeddings.embed_documents(texts), len(issues), references)
+        baseline = (live_llm(issues, criteria_type) if args.live
+                    else {i["id"]: y for i, y in zip(issues, labels)})
+
+        print(f"{criteria_type}: {len(issues)} labelled issues, "
+              f"{len(rag_context['results']) if rag_context else 0} taxonomy chunks")
+        for issue, label, row in zip(issues, labels, scores):
+            print(f"    #{issue['id']:<3} {'match' if label else '-':<6} {row[0]:5.2f}  {issue['title']}")
+        low, high = calibrate(scores[:, 0].tolist(), labels)
+        if args.live:  # the configured thresholds are on the OpenAI similarity scale
+            banded("configured", issues, labels, baseline, scores,
+                   config.CLASSIFICATION_PREFILTER_LOW, config.CLASSIFICATION_PREFILTER_HIGH)
+        banded("in-sample", issues, labels, baseline, scores, low, high)
+        report("held-out", "leave-one-out", issues, labels, baseline, *held_out(issues, labels, scores))
+
+
+if __name__ == "__main__":
+    main()
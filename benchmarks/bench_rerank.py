@@ -0,0 +1,91 @@
+"""
+Re-rank micro-benchmark — re-embedding payload text vs stored Qdrant vectors.
+
+  python benchmarks/bench_rerank.py
+
+  legacy  — re-embed every candidate's payload text
+            (k+1 embedding requests, EMBED_LATENCY_S each)
+  stored  — score the vectors Qdrant already returned (with_vectors=True)
+            against the original-query embedding in one matrix-vector product
+
+The original-query embedding is shared by both (it is batched with the
+rewritten query in RAGAgent._embed_queries), so it is excluded here.
+"""
+
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+EMBED_LATENCY_S = 0.05     # typical OpenAI embeddings round-trip
+DIM = 1536
+REPEATS = 50
+
+
+class FakeEmbeddings:
+    """One simulated network round-trip per call."""
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def embed_query(self, text):
+        time.sleep(EMBED_LATENCY_S)
+        return self.rng.standard_normal(DIM).tolist()
+
+    def embed_documents(self, texts):
+        time.sleep(EMBED_LATENCY_S)
+        return self.rng.standard_normal((len(texts), DIM)).tolist()
+
+
+def legacy_rerank(embeddings, results, query_vector, k):
+    """The pre-change strategy: re-embed every payload text, then cosine."""
+    q = np.asarray(query_vector, dtype=np.float32)
+    docs = np.asarray(
+        [embeddings.embed_query(r["payload"]["text"]) for r in results], dtype=np.float32
+    )
+    scores = docs @ q / (np.linalg.norm(docs, axis=1) * np.linalg.norm(q))
+    order = np.argsort(-scores)[:k]
+    return [{**results[i], "score": float(scores[i])} for i in order]
+
+
+def time_ms(fn, repeats=REPEATS) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    from unittest.mock import MagicMock
+    from agents.rag_agent import RAGAgent
+
+    rng = np.random.default_rng(0)
+    agent = RAGAgent(
+        qdrant_client=MagicMock(), embeddings=MagicMock(), llm=MagicMock(),
+        async_qdrant_client=MagicMock(),
+    )
+    embeddings = FakeEmbeddings(rng)
+    query_vector = rng.standard_normal(DIM).tolist()
+
+    print(f"{'k':>4} {'legacy ms':>10} {'stored ms':>10} {'speedup':>9} {'extra calls':>12}")
+    for k in (4, 8, 16):
+        results = [
+            {"id": i, "score": 0.8, "payload": {"text": f"chunk {i}"},
+             "vector": rng.standard_normal(DIM).tolist()}
+            for i in range(k + 1)
+        ]
+        legacy = time_ms(lambda: legacy_rerank(embeddings, results, query_vector, k), repeats=5)
+        stored = time_ms(lambda: agent._rerank(results, query_vector, k))
+        print(f"{k:>4} {legacy:>10.2f} {stored:>10.3f} {legacy / stored:>8.0f}x {k + 1:>6} → 0")
+
+
+if __name__ == "__main__":
+    main()
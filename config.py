@@ -20,10 +20,44 @@ COLLECTION_JIRA_TICKETS = "jira_tickets"        # created tickets (for duplicate
 # RAG
 RAG_TOP_K = int(os.getenv("RAG_TOP_K", "4"))
 RAG_SCORE_THRESHOLD = float(os.getenv("RAG_SCORE_THRESHOLD", "0.72"))
+REWRITE_CHEAP_MODEL = os.getenv("REWRITE_CHEAP_MODEL", "gpt-4o-mini")            # rewrite="cheap"
+REWRITE_CACHE_SIMILARITY = float(os.getenv("REWRITE_CACHE_SIMILARITY", "0.95"))
+REWRITE_CACHE_MAX_ENTRIES = int(os.getenv("REWRITE_CACHE_MAX_ENTRIES", "1000"))
+
+# Enrichment
+ENRICHMENT_FAST_PATH = os.getenv("ENRICHMENT_FAST_PATH", "true").lower() == "true"  # nodes/enrichment_rules.py
+ENRICHMENT_CACHE_SIMILARITY = float(os.getenv("ENRICHMENT_CACHE_SIMILARITY", "0.97"))  # paraphrase tier
+ENRICHMENT_CACHE_MAX_ENTRIES = int(os.getenv("ENRICHMENT_CACHE_MAX_ENTRIES", "1000"))
+ENRICHMENT_CACHE_TTL = int(os.getenv("ENRICHMENT_CACHE_TTL", str(7 * 24 * 3600)))  # seconds
 
 # Classification
 DEFAULT_CONFIDENCE_THRESHOLD = float(os.getenv("CONFIDENCE_THRESHOLD", "0.6"))
 CLASSIFICATION_BATCH_SIZE = int(os.getenv("CLASSIFICATION_BATCH_SIZE", "5"))
+PIPELINE_STREAMING = os.getenv("PIPELINE_STREAMING", "false").lower() == "true"  # nodes/pipeline_node.py
+CLUSTER_SIMILARITY_THRESHOLD = float(os.getenv("CLUSTER_SIMILARITY_THRESHOLD", "0.92"))  # intra-upload dedup
+CLASSIFICATION_PREFILTER = os.getenv("CLASSIFICATION_PREFILTER", "false").lower() == "true"  # nodes/classification_prefilter.py
+CLASSIFICATION_PREFILTER_LOW = float(os.getenv("CLASSIFICATION_PREFILTER_LOW", "0.20"))    # below → rejected without the LLM
+CLASSIFICATION_PREFILTER_HIGH = float(os.getenv("CLASSIFICATION_PREFILTER_HIGH", "0.60"))  # at/above → accepted without the LLM
+CLASSIFICATION_PREFILTER_CONFIDENCE = float(os.getenv("CLASSIFICATION_PREFILTER_CONFIDENCE", "0.9"))
+
+# Uploads (TDD §11: max 200 issues per file)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(5 * 1024 * 1024)))
+MAX_ISSUES_PER_UPLOAD = int(os.getenv("MAX_ISSUES_PER_UPLOAD", "200"))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Caching (local SQLite, see utils/sqlite_cache.py)
+CACHE_DB_PATH = os.getenv("CACHE_DB_PATH", ".cache/qaia.sqlite3")
+CLASSIFICATION_CACHE_TTL = int(os.getenv("CLASSIFICATION_CACHE_TTL", str(7 * 24 * 3600)))  # seconds
+CLASSIFICATION_CACHE_MAX_ENTRIES = int(os.getenv("CLASSIFICATION_CACHE_MAX_ENTRIES", "50000"))
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", ".cache/embeddings")
+EMBEDDING_CACHE_MEMORY_ITEMS = int(os.getenv("EMBEDDING_CACHE_MEMORY_ITEMS", "10000"))
+
+# Checkpointing (resume from failure, see utils/checkpointer.py)
+CHECKPOINTING = os.getenv("CHECKPOINTING", "true").lower() == "true"
+CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", ".cache/checkpoints.sqlite3")
+CHECKPOINT_TTL = int(os.getenv("CHECKPOINT_TTL", str(7 * 24 * 3600)))  # seconds a failed run stays resumable
+CHECKPOINT_SWEEP_INTERVAL = int(os.getenv("CHECKPOINT_SWEEP_INTERVAL", "3600"))  # seconds between on-write sweeps
+TICKET_LEDGER_TTL = int(os.getenv("TICKET_LEDGER_TTL", str(7 * 24 * 3600)))  # seconds; created tickets per request
 
 # Slack
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
@@ -35,6 +69,7 @@ JIRA_EMAIL = os.getenv("JIRA_EMAIL")
 JIRA_API_TOKEN = os.getenv("JIRA_API_TOKEN")
 JIRA_PROJECT_KEY = os.getenv("JIRA_PROJECT_KEY", "QAIA")
 JIRA_DUPLICATE_THRESHOLD = float(os.getenv("JIRA_DUPLICATE_THRESHOLD", "0.90"))
+JIRA_BULK_CHUNK_SIZE = int(os.getenv("JIRA_BULK_CHUNK_SIZE", "50"))  # create_issues(); JIRA caps a bulk request at 50
 
 # Observability
 LANGCHAIN_API_KEY = os.getenv("LANGCHAIN_API_KEY")
@@ -42,6 +77,19 @@ LANGCHAIN_PROJECT = os.getenv("LANGCHAIN_PROJECT", "qaia-dev")
 LANGFUSE_PUBLIC_KEY = os.getenv("LANGFUSE_PUBLIC_KEY")
 LANGFUSE_SECRET_KEY = os.getenv("LANGFUSE_SECRET_KEY")
 
+# Concurrency
+NODE_THREAD_POOL_SIZE = int(os.getenv("NODE_THREAD_POOL_SIZE", "8"))  # sync nodes under graph.ainvoke()
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))      # process-wide, all nodes + agents
+OPENAI_RPM_LIMIT = int(os.getenv("OPENAI_RPM_LIMIT", "500"))
+OPENAI_TPM_LIMIT = int(os.getenv("OPENAI_TPM_LIMIT", "30000"))
+
+# Async jobs (POST /qa-intake?mode=async, see utils/job_queue.py)
+JOB_STORE = os.getenv("JOB_STORE", "sqlite")                 # memory | sqlite
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))             # graph runs in flight
+JOB_QUEUE_MAX_DEPTH = int(os.getenv("JOB_QUEUE_MAX_DEPTH", "100"))  # 503 beyond this
+JOB_TTL = int(os.getenv("JOB_TTL", str(24 * 3600)))          # seconds a job record is kept
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "60"))  # job / sync run not renewed this long → interrupted
+
 # Retry
 MAX_LLM_RETRIES = 1
 MAX_TOOL_RETRIES = 2
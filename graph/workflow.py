@@ -8,9 +8,13 @@ Routing decisions (conditional edges):
 
   [1] After enrichment:
       requires_file_processing == False → jump directly to answer_branch
-      requires_file_processing == True  → proceed to rag_node
+      requires_file_processing == True  → fan out to rag_node AND file_parser in
+                                          parallel (no shared data); both join at
+                                          file_ready before classification
+      ... with PIPELINE_STREAMING and filter_criteria set → pipeline (rag, parse,
+                                          cluster, classify, filter overlapped)
 
-  [2] After rag_node + file_parser:
+  [2] At file_ready (rag + file_parser → clustering both done):
       filter_criteria is None → skip classification, go straight to filter
       filter_criteria set     → run classification
 
@@ -18,11 +22,46 @@ Routing decisions (conditional edges):
       filtered_issues is empty → early_exit to response_builder
       filtered_issues not empty → proceed to orchestrator
 
-  [4] After orchestrator (parallel fan-out — all active agents run concurrently):
-      requires_slack_post       → run slack_branch
-      requires_ticket_creation  → run jira_branch
-      requires_analysis         → run answer_branch
-      (inactive branches are skipped)
+  [4] After orchestrator (parallel fan-out — a Send per active agent):
+      requires_slack_post       → send to slack_branch
+      requires_ticket_creation  → send to jira_branch (unless pipeline already
+                                  created the tickets)
+      requires_analysis         → send to answer_branch
+      no active agent           → straight to aggregator
+      Inactive branches are never scheduled, so they cost no task, state copy or
+      checkpoint; the aggregator runs once, after the branches that were sent.
+      metrics["active_branches"] records which ones ran for this request.
+
+State updates:
+  Every node returns only the keys it writes (its delta). AgentState declares
+  reducers for the keys several nodes share — errors are appended, metrics are
+  merged — so parallel steps (rag ∥ file_parser, the three agent branches)
+  combine instead of clobbering each other. Each branch owns its own result key.
+
+Instrumentation:
+  _node() wraps every node with utils.telemetry.instrument_node(): wall time, LLM
+  calls, prompt/completion tokens and estimated cost land in
+  metrics["nodes"][name], in a Langfuse span (when configured) and in the
+  Prometheus totals behind GET /metrics. Agent work is counted under the
+  branch node that ran it (slack_branch, jira_branch, answer_branch, query_answer).
+
+Streaming:
+  graph.astream(..., stream_mode=["updates", "custom"],
+                config=run_config(request_id, stream_tokens=True))
+  yields one "updates" chunk per finished node and, on the answer and analysis
+  paths, {"token": text} "custom" chunks as AnswerAgent streams its completion.
+
+Checkpointing:
+  Compiled with a checkpointer, the graph persists state after every step
+  under thread_id = request_id; graph.ainvoke(None, run_config(request_id))
+  resumes a failed run from its last completed node (utils/checkpointer.py).
+
+Sync and async execution:
+  graph.invoke()  — every node runs its sync implementation.
+  graph.ainvoke() — nodes with an async twin (LLM / Qdrant / Slack I/O) are awaited
+                    on the event loop; sync-only nodes (parsing, filtering)
+                    run on the loop's default executor, which api/main.py bounds
+                    to NODE_THREAD_POOL_SIZE threads.
 
 Teaching point:
   Every add_conditional_edges() call teaches a routing concept:
@@ -32,15 +71,24 @@ Teaching point:
     - Dynamic agent activation (run only what's needed)
 """
 
+from typing import Callable, Optional
+
+from langchain_core.runnables import RunnableLambda
+from langgraph.config import get_config, get_stream_writer
 from langgraph.graph import StateGraph, END
-from schemas.state import AgentState
+from langgraph.types import Send
+from schemas.state import AgentState, criteria_list
+from utils.telemetry import instrument_node
+import config
 
-from nodes.enrichment_node import enrichment_node
-from nodes.rag_node import rag_node
+from nodes.enrichment_node import enrichment_node, aenrichment_node
+from nodes.rag_node import rag_node, arag_node
 from nodes.file_parser_node import file_parser_node
-from nodes.classification_node import classification_node
+from nodes.clustering_node import clustering_node, aclustering_node
+from nodes.classification_node import classification_node, aclassification_node
 from nodes.filter_node import filter_node
-from nodes.orchestrator_node import orchestrator_node
+from nodes.pipeline_node import pipeline_node, apipeline_node
+from nodes.orchestrator_node import BRANCH_QUERIES, orchestrator_node
 from nodes.aggregator_node import aggregator_node
 from nodes.response_builder_node import response_builder_node
 
@@ -53,64 +101,130 @@ from agents.answer_agent import answer_agent
 # Agent wrappers (plain functions for LangGraph nodes)
 # ------------------------------------------------------------------
 
-def run_slack_branch(state: AgentState) -> AgentState:
-    """Invoke slack_agent if activated by orchestrator."""
-    if state.get("slack_query"):
-        state["slack_result"] = slack_agent.run(
-            issues=state["filtered_issues"],
-            slack_query=state["slack_query"],
-        )
-    return state
+def run_slack_branch(state: AgentState) -> dict:
+    """Invoke slack_agent — only sent here when orchestrator set slack_query."""
+    return {"slack_result": slack_agent.run(
+        issues=state["filtered_issues"],
+        slack_query=state["slack_query"],
+    )}
 
 
-def run_jira_branch(state: AgentState) -> AgentState:
-    """Invoke jira_agent if activated by orchestrator."""
-    if state.get("jira_query"):
-        state["jira_result"] = jira_agent.run(
-            issues=state["filtered_issues"],
-            jira_query=state["jira_query"],
-        )
-    return state
+async def arun_slack_branch(state: AgentState) -> dict:
+    """Async twin of run_slack_branch()."""
+    return {"slack_result": await slack_agent.arun(
+        issues=state["filtered_issues"],
+        slack_query=state["slack_query"],
+    )}
+
+
+def run_jira_branch(state: AgentState) -> dict:
+    """Invoke jira_agent — only sent here when orchestrator set jira_query."""
+    return {"jira_result": jira_agent.run(
+        issues=state["filtered_issues"],
+        jira_query=state["jira_query"],
+        request_id=state["request_id"],
+    )}
 
 
-def run_answer_branch(state: AgentState) -> AgentState:
+async def arun_jira_branch(state: AgentState) -> dict:
+    """Async twin of run_jira_branch()."""
+    return {"jira_result": await jira_agent.arun(
+        issues=state["filtered_issues"],
+        jira_query=state["jira_query"],
+        request_id=state["request_id"],
+    )}
+
+
+def run_answer_branch(state: AgentState) -> dict:
     """Invoke answer_agent for analysis of filtered issues."""
-    if state.get("answer_query"):
-        state["answer_result"] = answer_agent.analyze_issues(
-            issues=state["filtered_issues"],
-            answer_query=state["answer_query"],
-            output_format=state["enriched_task"]["output_format"],
-        )
-    return state
+    return {"answer_result": answer_agent.analyze_issues(
+        issues=state["filtered_issues"],
+        answer_query=state["answer_query"],
+        output_format=state["enriched_task"]["output_format"],
+    )}
 
 
-def run_query_answer(state: AgentState) -> AgentState:
+async def arun_answer_branch(state: AgentState) -> dict:
+    """Async twin of run_answer_branch()."""
+    return {"answer_result": await answer_agent.aanalyze_issues(
+        issues=state["filtered_issues"],
+        answer_query=state["answer_query"],
+        output_format=state["enriched_task"]["output_format"],
+        on_token=_token_writer(),
+    )}
+
+
+def run_query_answer(state: AgentState) -> dict:
     """Invoke answer_agent for direct Q&A (no file processing path)."""
-    state["answer_result"] = answer_agent.answer_query(
+    return {"answer_result": answer_agent.answer_query(
         query=state["instruction"],
         output_format=state["enriched_task"]["output_format"],
+    )}
+
+
+async def arun_query_answer(state: AgentState) -> dict:
+    """Async twin of run_query_answer()."""
+    return {"answer_result": await answer_agent.aanswer_query(
+        query=state["instruction"],
+        output_format=state["enriched_task"]["output_format"],
+        on_token=_token_writer(),
+    )}
+
+
+def _token_writer() -> Optional[Callable[[str], None]]:
+    """
+    Emit answer tokens as custom stream events — only when the caller asked for them
+    (configurable.stream_tokens, set by /qa-intake/stream).
+    """
+    try:
+        run_config = get_config()
+    except RuntimeError:  # called outside a graph run
+        return None
+    if not run_config.get("configurable", {}).get("stream_tokens"):
+        return None
+    writer = get_stream_writer()
+    return lambda text: writer({"token": text})
+
+
+def _node(name: str, func, afunc=None):
+    """
+    Pair a sync node with its async twin so both invoke() and ainvoke() work, and
+    record its latency / LLM calls / tokens / cost under metrics["nodes"][name].
+    """
+    return RunnableLambda(
+        instrument_node(name, func),
+        afunc=instrument_node(name, afunc),
+        name=func.__name__,
     )
-    return state
 
 
 # ------------------------------------------------------------------
 # Conditional edge functions
 # ------------------------------------------------------------------
 
-def route_by_intent(state: AgentState) -> str:
+def route_by_intent(state: AgentState) -> list[str]:
     """
-    [Route 1] After enrichment: does this request need file processing?
+    [Route 1] After enrichment: does this request need file processing — and how?
+    Returns every node to run next; ["rag", "file_parser"] fans out in parallel.
     """
-    if not state["enriched_task"]["requires_file_processing"]:
-        return "query_only"
-    return "file_processing"
+    task = state["enriched_task"]
+    if not task["requires_file_processing"]:
+        return ["query_answer"]
+    if config.PIPELINE_STREAMING and criteria_list(task.get("filter_criteria")):
+        return ["pipeline"]
+    return ["rag", "file_parser"]
+
+
+def file_ready(state: AgentState) -> dict:
+    """Join point for the rag / file_parser fan-out — contributes no state."""
+    return {}
 
 
 def route_after_file_parser(state: AgentState) -> str:
     """
-    [Route 2] After file parsing: is there a filter_criteria to classify against?
+    [Route 2] After rag + parsing + clustering: is there a filter_criteria to classify against?
     """
-    if state["enriched_task"].get("filter_criteria") is None:
+    if not criteria_list(state["enriched_task"].get("filter_criteria")):
         return "skip_classification"
     return "run_classification"
 
@@ -124,48 +238,65 @@ def route_after_filter(state: AgentState) -> str:
     return "continue"
 
 
+def route_to_agents(state: AgentState) -> list[Send] | str:
+    """
+    [Route 4] After orchestrator: send work only to the agents it activated.
+    """
+    sends = [
+        Send(f"{branch}_branch", state)
+        for branch in state["metrics"].get("active_branches", [])
+    ]
+    return sends or "aggregator"
+
+
 # ------------------------------------------------------------------
 # Graph builder
 # ------------------------------------------------------------------
 
-def build_graph() -> StateGraph:
+def build_graph(checkpointer=None) -> StateGraph:
     """
     Build and compile the QAIA LangGraph workflow.
-    Returns a compiled graph ready for invocation.
+    Returns a compiled graph ready for invocation. With a checkpointer
+    (api/main.py passes utils.checkpointer.build_checkpointer()), every call
+    needs config=run_config(request_id) and a failed run can be resumed.
     """
     graph = StateGraph(AgentState)
 
-    # Register all nodes
-    graph.add_node("enrichment",       enrichment_node)
-    graph.add_node("rag",              rag_node)
-    graph.add_node("file_parser",      file_parser_node)
-    graph.add_node("classification",   classification_node)
-    graph.add_node("filter",           filter_node)
-    graph.add_node("orchestrator",     orchestrator_node)
-    graph.add_node("slack_branch",     run_slack_branch)
-    graph.add_node("jira_branch",      run_jira_branch)
-    graph.add_node("answer_branch",    run_answer_branch)
-    graph.add_node("query_answer",     run_query_answer)
-    graph.add_node("aggregator",       aggregator_node)
-    graph.add_node("response_builder", response_builder_node)
+    # Register all nodes (each one instrumented — see utils/telemetry.py)
+    graph.add_node("enrichment",       _node("enrichment", enrichment_node, aenrichment_node))
+    graph.add_node("rag",              _node("rag", rag_node, arag_node))
+    graph.add_node("file_parser",      _node("file_parser", file_parser_node))
+    graph.add_node("clustering",       _node("clustering", clustering_node, aclustering_node))
+    graph.add_node("file_ready",       file_ready)
+    graph.add_node("classification",   _node("classification", classification_node, aclassification_node))
+    graph.add_node("filter",           _node("filter", filter_node))
+    graph.add_node("pipeline",         _node("pipeline", pipeline_node, apipeline_node))
+    graph.add_node("orchestrator",     _node("orchestrator", orchestrator_node))
+    graph.add_node("slack_branch",     _node("slack_branch", run_slack_branch, arun_slack_branch))
+    graph.add_node("jira_branch",      _node("jira_branch", run_jira_branch, arun_jira_branch))
+    graph.add_node("answer_branch",    _node("answer_branch", run_answer_branch, arun_answer_branch))
+    graph.add_node("query_answer",     _node("query_answer", run_query_answer, arun_query_answer))
+    graph.add_node("aggregator",       _node("aggregator", aggregator_node))
+    graph.add_node("response_builder", _node("response_builder", response_builder_node))
 
     # Entry point
     graph.set_entry_point("enrichment")
 
-    # [Route 1] Intent routing: query-only vs file processing
+    # [Route 1] Intent routing: query-only, staged file processing (rag ∥ file_parser),
+    #           or the streaming pipeline
     graph.add_conditional_edges(
         "enrichment",
         route_by_intent,
-        {
-            "query_only":      "query_answer",
-            "file_processing": "rag",
-        },
+        ["query_answer", "rag", "file_parser", "pipeline"],
     )
 
-    # [Route 2] After file parser: classify or skip
-    graph.add_edge("rag",         "file_parser")
+    # rag and file_parser → clustering run side by side; file_ready waits for both
+    graph.add_edge("file_parser", "clustering")
+    graph.add_edge(["rag", "clustering"], "file_ready")
+
+    # [Route 2] After the join: classify or skip
     graph.add_conditional_edges(
-        "file_parser",
+        "file_ready",
         route_after_file_parser,
         {
             "run_classification":  "classification",
@@ -175,22 +306,25 @@ def build_graph() -> StateGraph:
 
     graph.add_edge("classification", "filter")
 
-    # [Route 3] After filter: continue or early exit
+    # [Route 3] After filter (staged or pipelined): continue or early exit
+    for source in ("filter", "pipeline"):
+        graph.add_conditional_edges(
+            source,
+            route_after_filter,
+            {
+                "continue":   "orchestrator",
+                "early_exit": "response_builder",
+            },
+        )
+
+    # [Route 4] Orchestrator fans out to the active branches only
     graph.add_conditional_edges(
-        "filter",
-        route_after_filter,
-        {
-            "continue":   "orchestrator",
-            "early_exit": "response_builder",
-        },
+        "orchestrator",
+        route_to_agents,
+        [f"{branch}_branch" for branch in BRANCH_QUERIES] + ["aggregator"],
     )
 
-    # Orchestrator fans out to all active parallel branches
-    graph.add_edge("orchestrator", "slack_branch")
-    graph.add_edge("orchestrator", "jira_branch")
-    graph.add_edge("orchestrator", "answer_branch")
-
-    # All branches converge at aggregator
+    # Whichever branches ran converge at aggregator
     graph.add_edge("slack_branch",  "aggregator")
     graph.add_edge("jira_branch",   "aggregator")
     graph.add_edge("answer_branch", "aggregator")
@@ -200,4 +334,4 @@ def build_graph() -> StateGraph:
     graph.add_edge("aggregator",       "response_builder")
     graph.add_edge("response_builder", END)
 
-    return graph.compile()
+    return graph.compile(checkpointer=checkpointer)
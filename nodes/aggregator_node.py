@@ -22,20 +22,21 @@ Teaching point:
 from schemas.state import AgentState
 
 
-def aggregator_node(state: AgentState) -> AgentState:
+def aggregator_node(state: AgentState) -> dict:
     """
     [Node 7] Merge Slack and JIRA branch results into unified metrics.
     """
-    # TODO: implement aggregator node
-    # Steps:
-    #   1. slack = state.get("slack_result") or {}
-    #   2. jira  = state.get("jira_result")  or {}
-    #   3. tickets_created    = len(jira.get("created", []))
-    #   4. duplicates_skipped = len(jira.get("duplicates", []))
-    #   5. total              = tickets_created + duplicates_skipped
-    #   6. duplicate_rate     = duplicates_skipped / total if total > 0 else 0
-    #   7. Merge into state["metrics"]:
-    #        tickets_created, duplicates_skipped, duplicate_rate,
-    #        slack_success, jira_success
-    #   8. Return state
-    raise NotImplementedError
+    slack = state.get("slack_result") or {}
+    jira = state.get("jira_result") or {}
+
+    tickets_created = len(jira.get("created", []))
+    duplicates_skipped = len(jira.get("duplicates", []))
+    total = tickets_created + duplicates_skipped
+
+    return {"metrics": {
+        "tickets_created":    tickets_created,
+        "duplicates_skipped": duplicates_skipped,
+        "duplicate_rate":     duplicates_skipped / total if total > 0 else 0,
+        "slack_success":      slack.get("success", False),
+        "jira_success":       jira.get("success", False),
+    }}
@@ -27,10 +27,51 @@ Teaching point:
     - any custom criteria the user specifies
 
   Experiment: change filter_criteria.type and observe different issues being flagged.
+
+Concurrency:
+  Batches are sent concurrently (threads under invoke(), gather() under ainvoke())
+  and throttled by the process-wide llm_limiter. Results are merged back in input
+  order. Each batch retries on its own — a batch that still fails is recorded in
+  state["errors"] and its issues are left unclassified; other batches are unaffected.
+
+Streaming:
+  BatchClassifier classifies one batch at a time with the same cache and
+  prompt — pipeline_node feeds it batches while the file is still being parsed.
+
+Multiple criteria:
+  filter_criteria may be a list ("accuracy and security issues"). Every batch
+  is then classified against all criteria in ONE prompt (MULTI_CLASSIFICATION_PROMPT)
+  and each ClassifiedIssue carries a per-criterion `criteria` vector of
+  {type, matches, confidence}; filter_node selects by any / all. N criteria
+  cost one LLM call per batch instead of N sequential runs over the file.
+  A single criterion (or a one-element list) uses the original prompt.
+
+Caching:
+  Results are cached in SQLite keyed by a normalized hash of the issue
+  (id, title, description) + every filter_criteria (type, description) + LLM_MODEL.
+  Only cache misses are sent to the LLM. Hit/miss counts are reported in
+  state["metrics"]["classification_cache"]. Each batch is written as soon as
+  it completes, so a run that dies mid-node (and is resumed from its
+  checkpoint) re-classifies only the batches that never finished.
+
+Pre-filter (CLASSIFICATION_PREFILTER):
+  Cache misses first pass the embedding stage in nodes/classification_prefilter.py.
+  Issues far below / above the criteria similarity band are decided there;
+  only the uncertain middle goes to the LLM. Counts and LLM calls saved are
+  reported in state["metrics"]["classification_prefilter"].
 """
 
+import asyncio
+import contextvars
+import hashlib
 import json
-from schemas.state import AgentState
+from concurrent.futures import ThreadPoolExecutor
+from langchain_openai import ChatOpenAI
+from schemas.state import AgentState, ClassifiedIssue, FilterCriteria, ParsedIssue, criteria_list
+from agents.rag_agent import payload_text
+from nodes.classification_prefilter import aprefilter, prefilter, report
+from utils.llm_limiter import invoke_llm, ainvoke_llm
+from utils.sqlite_cache import SQLiteCache
 import config
 
 
@@ -63,6 +104,35 @@ Return a JSON array — one object per issue:
 Return ONLY the JSON array. No explanation. No markdown.
 """
 
+MULTI_CLASSIFICATION_PROMPT = """You are a QA issue classifier.
+
+Classification targets (judge every issue against EACH target independently):
+{criteria_block}
+
+{rag_context_section}
+
+Classify each of the following QA issues. For each issue and each target determine:
+- matches: true if the issue matches that target
+- confidence: float between 0.0 and 1.0
+Then give one reason sentence per issue.
+
+Issues to classify:
+{issues_json}
+
+Return a JSON array — one object per issue, "criteria" in the target order above:
+[
+  {{
+    "issue_id": "...",
+    "criteria": [
+      {{"type": "...", "matches": true, "confidence": 0.85}}
+    ],
+    "reason": "..."
+  }}
+]
+
+Return ONLY the JSON array. No explanation. No markdown.
+"""
+
 RAG_CONTEXT_SECTION = """Reference knowledge (use this to inform your classification):
 {rag_context}
 """
@@ -70,30 +140,309 @@ RAG_CONTEXT_SECTION = """Reference knowledge (use this to inform your classifica
 NO_RAG_SECTION = "Note: No reference knowledge available. Use your expert judgment only."
 
 
-def classification_node(state: AgentState) -> AgentState:
+classification_cache = SQLiteCache(
+    namespace="classification",
+    ttl_seconds=config.CLASSIFICATION_CACHE_TTL,
+    max_entries=config.CLASSIFICATION_CACHE_MAX_ENTRIES,
+)
+
+
+def classification_node(state: AgentState) -> dict:
+    """
+    [Node 4] Classify issues against dynamic filter_criteria in concurrent batches.
+    """
+    issues = state["parsed_issues"]
+    criteria = criteria_list(state["enriched_task"]["filter_criteria"])
+    keys = _cache_keys(issues, criteria)
+    cached = classification_cache.get_many(keys)
+
+    misses = [i for i, k in zip(issues, keys) if k not in cached]
+    decided, uncertain = prefilter(misses, criteria, state.get("rag_context"))
+
+    llm = _build_llm()
+    batches = _batches(uncertain)
+    build_prompt = _prompt_builder(state)
+
+    def classify_and_store(batch: list[ParsedIssue]) -> list[ClassifiedIssue]:
+        outcome = _classify_batch(llm, build_prompt(batch), criteria)
+        _store_batch(batch, criteria, outcome)
+        return outcome
+
+    workers = max(1, min(len(batches), config.LLM_MAX_CONCURRENCY))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # copy_context: per-node telemetry still sees LLM calls made on the pool threads
+        futures = [pool.submit(contextvars.copy_context().run, classify_and_store, b) for b in batches]
+        outcomes = [f.exception() or f.result() for f in futures]
+
+    errors: list[dict] = []
+    fresh = _collect(errors, batches, outcomes)
+    return _result(issues, keys, cached, {**decided, **fresh}, errors, report(decided, len(misses), len(uncertain)))
+
+
+async def aclassification_node(state: AgentState) -> dict:
+    """
+    [Node 4] Async twin of classification_node() — used by graph.ainvoke().
+    """
+    issues = state["parsed_issues"]
+    criteria = criteria_list(state["enriched_task"]["filter_criteria"])
+    keys = _cache_keys(issues, criteria)
+    cached = await asyncio.to_thread(classification_cache.get_many, keys)
+
+    misses = [i for i, k in zip(issues, keys) if k not in cached]
+    decided, uncertain = await aprefilter(misses, criteria, state.get("rag_context"))
+
+    llm = _build_llm()
+    batches = _batches(uncertain)
+    build_prompt = _prompt_builder(state)
+
+    async def classify_and_store(batch: list[ParsedIssue]) -> list[ClassifiedIssue]:
+        outcome = await _aclassify_batch(llm, build_prompt(batch), criteria)
+        await asyncio.to_thread(_store_batch, batch, criteria, outcome)
+        return outcome
+
+    outcomes = await asyncio.gather(
+        *[classify_and_store(b) for b in batches],
+        return_exceptions=True,
+    )
+
+    errors: list[dict] = []
+    fresh = _collect(errors, batches, outcomes)
+    return _result(issues, keys, cached, {**decided, **fresh}, errors, report(decided, len(misses), len(uncertain)))
+
+
+class BatchClassifier:
+    """Cached, per-batch classification for callers that produce issues incrementally."""
+
+    def __init__(self, state: AgentState):
+        self.criteria = criteria_list(state["enriched_task"]["filter_criteria"])
+        self.llm = _build_llm()
+        self.build_prompt = _prompt_builder(state)
+        self.rag_context = state.get("rag_context")
+        self.errors: list[dict] = []
+        self.hits = 0
+        self.misses = 0
+        self.prefiltered = {"accepted": 0, "rejected": 0, "uncertain": 0, "llm_calls_saved": 0}
+
+    async def aclassify(self, batch: list[ParsedIssue]) -> list[ClassifiedIssue]:
+        """Classify one batch (cache first). A failed batch is recorded in self.errors and yields []."""
+        keys = _cache_keys(batch, self.criteria)
+        cached = await asyncio.to_thread(classification_cache.get_many, keys)
+        misses = [i for i, k in zip(batch, keys) if k not in cached]
+        self.hits += len(batch) - len(misses)
+        self.misses += len(misses)
+
+        decided, uncertain = await aprefilter(misses, self.criteria, self.rag_context)
+        for name, count in report(decided, len(misses), len(uncertain)).items():
+            self.prefiltered[name] += count
+
+        fresh = {}
+        if uncertain:
+            try:
+                outcome = await _aclassify_batch(self.llm, self.build_prompt(uncertain), self.criteria)
+            except Exception as e:
+                outcome = e
+            fresh = _collect(self.errors, [uncertain], [outcome])
+            await asyncio.to_thread(classification_cache.set_many, _new_entries(batch, keys, fresh))
+        return _ordered(batch, keys, cached, {**decided, **fresh})
+
+    def metrics(self) -> dict:
+        metrics = {"classification_cache": {"hits": self.hits, "misses": self.misses}}
+        if config.CLASSIFICATION_PREFILTER:
+            metrics["classification_prefilter"] = dict(self.prefiltered)
+        return metrics
+
+
+def _build_llm() -> ChatOpenAI:
+    return ChatOpenAI(
+        model=config.LLM_MODEL,
+        openai_api_key=config.OPENAI_API_KEY,
+        temperature=0,
+    )
+
+
+def _batches(issues: list[dict]) -> list[list[dict]]:
+    size = config.CLASSIFICATION_BATCH_SIZE
+    return [issues[i:i + size] for i in range(0, len(issues), size)]
+
+
+def _prompt_builder(state: AgentState):
+    """Return batch → formatted (MULTI_)CLASSIFICATION_PROMPT, with criteria + RAG context bound."""
+    criteria = criteria_list(state["enriched_task"]["filter_criteria"])
+
+    rag_context = state.get("rag_context")
+    if rag_context and rag_context["results"]:
+        rag_text = "\n".join(payload_text(r) for r in rag_context["results"])
+        rag_context_section = RAG_CONTEXT_SECTION.format(rag_context=rag_text)
+    else:
+        rag_context_section = NO_RAG_SECTION
+
+    def build(batch: list[dict]) -> str:
+        if len(criteria) > 1:
+            return MULTI_CLASSIFICATION_PROMPT.format(
+                criteria_block="\n".join(
+                    f"{n}. Type: {c['type']} — {c['description']}" for n, c in enumerate(criteria, 1)
+                ),
+                rag_context_section=rag_context_section,
+                issues_json=_format_issues_for_prompt(batch),
+            )
+        return CLASSIFICATION_PROMPT.format(
+            criteria_type=criteria[0]["type"],
+            criteria_description=criteria[0]["description"],
+            rag_context_section=rag_context_section,
+            issues_json=_format_issues_for_prompt(batch),
+        )
+
+    return build
+
+
+def _collect(
+    errors: list[dict], batches: list[list[dict]], outcomes: list
+) -> dict[str, ClassifiedIssue]:
+    """Index batch outcomes by issue_id; record failed batches in errors."""
+    collected: dict[str, ClassifiedIssue] = {}
+    for batch, outcome in zip(batches, outcomes):
+        if isinstance(outcome, BaseException):
+            errors.append({
+                "node": "classification",
+                "issue_ids": [i["id"] for i in batch],
+                "error": f"{type(outcome).__name__}: {outcome}",
+            })
+            continue
+        batch_ids = {i["id"] for i in batch}
+        for r in outcome:
+            issue_id = str(r.get("issue_id"))
+            if issue_id in batch_ids:
+                collected[issue_id] = {**r, "issue_id": issue_id}
+    return collected
+
+
+def _store_batch(batch: list[ParsedIssue], criteria: list[FilterCriteria], outcome: list) -> None:
+    """Cache one batch's results as soon as it completes — a crash or resume keeps them."""
+    fresh = _collect([], [batch], [outcome])
+    classification_cache.set_many(_new_entries(batch, _cache_keys(batch, criteria), fresh))
+
+
+def _result(
+    issues: list[ParsedIssue],
+    keys: list[str],
+    cached: dict[str, ClassifiedIssue],
+    fresh: dict[str, ClassifiedIssue],
+    errors: list[dict],
+    prefiltered: dict,
+) -> dict:
+    """Node delta: cached + fresh results in input order, failed batches, cache and pre-filter counts."""
+    hits = sum(1 for k in keys if k in cached)
+    metrics = {"classification_cache": {"hits": hits, "misses": len(keys) - hits}}
+    if config.CLASSIFICATION_PREFILTER:
+        metrics["classification_prefilter"] = prefiltered
+    return {
+        "classified_issues": _ordered(issues, keys, cached, fresh),
+        "errors": errors,
+        "metrics": metrics,
+    }
+
+
+def _ordered(
+    issues: list[ParsedIssue],
+    keys: list[str],
+    cached: dict[str, ClassifiedIssue],
+    fresh: dict[str, ClassifiedIssue],
+) -> list[ClassifiedIssue]:
+    results = []
+    for issue, key in zip(issues, keys):
+        if key in cached:
+            results.append({**cached[key], "issue_id": issue["id"]})
+        elif issue["id"] in fresh:
+            results.append(fresh[issue["id"]])
+    return results
+
+
+def _new_entries(
+    issues: list[ParsedIssue], keys: list[str], fresh: dict[str, ClassifiedIssue]
+) -> dict[str, ClassifiedIssue]:
+    return {k: fresh[i["id"]] for i, k in zip(issues, keys) if i["id"] in fresh}
+
+
+def _cache_keys(issues: list[ParsedIssue], criteria: list[FilterCriteria]) -> list[str]:
+    """sha256 over the normalized issue + criteria + model — see module docstring."""
+    criteria_part = [
+        *(part for c in criteria for part in (c["type"], _normalize_text(c["description"]))),
+        config.LLM_MODEL,
+    ]
+    return [
+        hashlib.sha256(json.dumps([
+            _normalize_text(i["id"]),
+            _normalize_text(i.get("title", "")),
+            _normalize_text(i.get("description", "")),
+            *criteria_part,
+        ]).encode("utf-8")).hexdigest()
+        for i in issues
+    ]
+
+
+def _normalize_text(text: str) -> str:
+    """Case- and whitespace-insensitive form, so cosmetic re-exports still hit."""
+    return " ".join(str(text).split()).casefold()
+
+
+def _classify_batch(llm: ChatOpenAI, prompt: str, criteria: list[FilterCriteria]) -> list[ClassifiedIssue]:
+    """Classify one batch. Retries once on invalid JSON."""
+    for attempt in range(config.MAX_LLM_RETRIES + 1):
+        response = invoke_llm(llm, prompt)
+        try:
+            return _criteria_vectors(json.loads(response.content), criteria)
+        except json.JSONDecodeError:
+            if attempt == config.MAX_LLM_RETRIES:
+                raise
+
+
+async def _aclassify_batch(llm: ChatOpenAI, prompt: str, criteria: list[FilterCriteria]) -> list[ClassifiedIssue]:
+    """Async twin of _classify_batch()."""
+    for attempt in range(config.MAX_LLM_RETRIES + 1):
+        response = await ainvoke_llm(llm, prompt)
+        try:
+            return _criteria_vectors(json.loads(response.content), criteria)
+        except json.JSONDecodeError:
+            if attempt == config.MAX_LLM_RETRIES:
+                raise
+
+
+def _criteria_vectors(results: list[dict], criteria: list[FilterCriteria]) -> list[ClassifiedIssue]:
     """
-    [Node 4] Classify issues against dynamic filter_criteria in batches.
+    Multi-criteria answers → ClassifiedIssue: the `criteria` vector aligned to
+    filter_criteria order (missing entries count as no match), plus the summary
+    matches_criteria / confidence. Single-criterion answers pass through.
     """
-    # TODO: implement classification node
-    # Steps:
-    #   1. criteria = state["enriched_task"]["filter_criteria"]
-    #   2. Build rag_context_section:
-    #        if state["rag_context"] and state["rag_context"]["results"]:
-    #            rag_text = "\n".join([r.get("text","") for r in state["rag_context"]["results"]])
-    #            rag_context_section = RAG_CONTEXT_SECTION.format(rag_context=rag_text)
-    #        else:
-    #            rag_context_section = NO_RAG_SECTION
-    #   3. Split state["parsed_issues"] into batches of CLASSIFICATION_BATCH_SIZE
-    #   4. For each batch:
-    #        a. Format CLASSIFICATION_PROMPT with criteria + rag_context_section + issues_json
-    #        b. llm.invoke(prompt)
-    #        c. json.loads(response.content) → list of ClassifiedIssue
-    #        d. On JSONDecodeError: retry once
-    #   5. state["classified_issues"] = all results
-    #   6. Return state
-    raise NotImplementedError
+    if len(criteria) < 2:
+        return results
+    classified = []
+    for r in results:
+        answered = r.get("criteria") or []
+        vector = [
+            {
+                "type": c["type"],
+                "matches": bool(answered[n].get("matches")) if n < len(answered) else False,
+                "confidence": float(answered[n].get("confidence", 0.0)) if n < len(answered) else 0.0,
+            }
+            for n, c in enumerate(criteria)
+        ]
+        matched = [v["confidence"] for v in vector if v["matches"]]
+        classified.append({
+            "issue_id": r.get("issue_id"),
+            "matches_criteria": bool(matched),
+            "confidence": max(matched or [v["confidence"] for v in vector]),
+            "reason": r.get("reason", ""),
+            "criteria": vector,
+        })
+    return classified
 
 
 def _format_issues_for_prompt(issues: list[dict]) -> str:
     """Format a batch of issues as compact JSON (id, title, description only)."""
-    raise NotImplementedError
+    return json.dumps(
+        [
+            {"id": i["id"], "title": i.get("title", ""), "description": i.get("description", "")}
+            for i in issues
+        ],
+        ensure_ascii=False,
+    )
@@ -0,0 +1,177 @@
+"""
+Classification Pre-filter — embedding stage in front of classification_node's LLM.
+
+  decided, uncertain = prefilter(issues, criteria, state["rag_context"])
+
+Method:
+  1. Embed every issue ("title description", the text clustering_node already
+     embedded, so CachedEmbeddings answers locally) and every reference text
+     in ONE embed_documents call
+  2. References per criterion: "type: description", plus the retrieved
+     qa_taxonomy chunks when there is a single criterion (with several, the
+     merged rag_context mixes topics and would blur every score)
+  3. Score = best cosine similarity between the issue and a reference
+
+  score <  CLASSIFICATION_PREFILTER_LOW   → rejected   matches=false
+  score >= CLASSIFICATION_PREFILTER_HIGH  → accepted   matches=true
+  otherwise                               → uncertain  → LLM
+
+An issue skips the LLM only when EVERY criterion is decided. Decided issues
+get confidence CLASSIFICATION_PREFILTER_CONFIDENCE and a reason quoting the
+score; they are not written to the classification cache (only LLM answers
+are). "critical" is about severity, not wording — it is never decided here.
+
+Calibration:
+  The thresholds depend on the embedding model and the taxonomy, so the stage
+  is off (CLASSIFICATION_PREFILTER=false) until they are calibrated.
+  benchmarks/bench_prefilter.py scores tests/fixtures/expected_classifications.json,
+  proposes LOW / HIGH and reports LLM calls saved and the precision/recall delta,
+  in-sample and held out (leave-one-out).
+
+Degraded mode:
+  If embedding fails, every issue is uncertain and goes to the LLM.
+
+Teaching point:
+  Nobody needs gpt-4o to say "Login button misaligned" is not an accuracy bug.
+  Spend the model on the issues an embedding cannot tell apart.
+"""
+
+import logging
+import math
+from typing import Optional
+
+import numpy as np
+
+from schemas.state import ClassifiedIssue, FilterCriteria, ParsedIssue, RAGResult
+from agents.rag_agent import payload_text, rag_agent
+from nodes.clustering_node import _issue_text, _unit_rows
+import config
+
+logger = logging.getLogger(__name__)
+
+# Criteria the wording of an issue cannot decide
+UNDECIDABLE_TYPES = {"critical"}
+
+
+def prefilter(
+    issues: list[ParsedIssue], criteria: list[FilterCriteria], rag_context: Optional[RAGResult]
+) -> tuple[dict[str, ClassifiedIssue], list[ParsedIssue]]:
+    """Decided issues by id, and the uncertain issues (input order) that still need the LLM."""
+    if not config.CLASSIFICATION_PREFILTER or not _decidable(issues, criteria):
+        return {}, issues
+    texts, references = embedding_inputs(issues, criteria, rag_context)
+    try:
+        vectors = rag_agent.embeddings.embed_documents(texts)
+    except Exception:
+        logger.warning("Issue embedding failed — sending every issue to the LLM", exc_info=True)
+        return {}, issues
+    return decide(issues, criteria, criterion_scores(vectors, len(issues), references))
+
+
+async def aprefilter(
+    issues: list[ParsedIssue], criteria: list[FilterCriteria], rag_context: Optional[RAGResult]
+) -> tuple[dict[str, ClassifiedIssue], list[ParsedIssue]]:
+    """Async twin of prefilter()."""
+    if not config.CLASSIFICATION_PREFILTER or not _decidable(issues, criteria):
+        return {}, issues
+    texts, references = embedding_inputs(issues, criteria, rag_context)
+    try:
+        vectors = await rag_agent.embeddings.aembed_documents(texts)
+    except Exception:
+        logger.warning("Issue embedding failed — sending every issue to the LLM", exc_info=True)
+        return {}, issues
+    return decide(issues, criteria, criterion_scores(vectors, len(issues), references))
+
+
+def embedding_inputs(
+    issues: list[ParsedIssue], criteria: list[FilterCriteria], rag_context: Optional[RAGResult]
+) -> tuple[list[str], list[list[int]]]:
+    """Texts for the single embed call (issues first), and each criterion's reference rows."""
+    texts = [_issue_text(i) for i in issues]
+    rows: dict[str, int] = {}
+    chunks = [payload_text(r) for r in (rag_context or {}).get("results") or []]
+    references = []
+    for c in criteria:
+        candidates = [f"{c['type']}: {c['description']}", *(chunks if len(criteria) == 1 else [])]
+        indices = []
+        for text in filter(None, candidates):
+            if text not in rows:
+                rows[text] = len(texts)
+                texts.append(text)
+            indices.append(rows[text])
+        references.append(indices)
+    return texts, references
+
+
+def criterion_scores(vectors: list[list[float]], issue_count: int, references: list[list[int]]) -> np.ndarray:
+    """(issues, criteria) matrix of each issue's best cosine similarity to a criterion reference."""
+    matrix = _unit_rows(vectors)
+    issue_rows = matrix[:issue_count]
+    return np.stack([(issue_rows @ matrix[rows].T).max(axis=1) for rows in references], axis=1)
+
+
+def decide(
+    issues: list[ParsedIssue],
+    criteria: list[FilterCriteria],
+    scores: np.ndarray,
+    low: Optional[float] = None,
+    high: Optional[float] = None,
+) -> tuple[dict[str, ClassifiedIssue], list[ParsedIssue]]:
+    """Apply the LOW / HIGH band; thresholds default to config (the benchmark passes its own)."""
+    low = config.CLASSIFICATION_PREFILTER_LOW if low is None else low
+    high = config.CLASSIFICATION_PREFILTER_HIGH if high is None else high
+    decided: dict[str, ClassifiedIssue] = {}
+    uncertain: list[ParsedIssue] = []
+    for issue, row in zip(issues, scores):
+        verdicts = [
+            None if c["type"] in UNDECIDABLE_TYPES else False if s < low else True if s >= high else None
+            for c, s in zip(criteria, row.tolist())
+        ]
+        if None in verdicts:
+            uncertain.append(issue)
+        else:
+            decided[issue["id"]] = _classified(issue["id"], criteria, verdicts, row.tolist(), low, high)
+    return decided, uncertain
+
+
+def report(decided: dict[str, ClassifiedIssue], misses: int, uncertain: int) -> dict:
+    """state["metrics"]["classification_prefilter"] — LLM batches that were never sent."""
+    size = config.CLASSIFICATION_BATCH_SIZE
+    accepted = sum(1 for r in decided.values() if r["matches_criteria"])
+    return {
+        "accepted": accepted,
+        "rejected": len(decided) - accepted,
+        "uncertain": uncertain,
+        "llm_calls_saved": math.ceil(misses / size) - math.ceil(uncertain / size),
+    }
+
+
+def _decidable(issues: list[ParsedIssue], criteria: list[FilterCriteria]) -> bool:
+    return bool(issues) and not any(c["type"] in UNDECIDABLE_TYPES for c in criteria)
+
+
+def _classified(
+    issue_id: str,
+    criteria: list[FilterCriteria],
+    verdicts: list[bool],
+    scores: list[float],
+    low: float,
+    high: float,
+) -> ClassifiedIssue:
+    confidence = config.CLASSIFICATION_PREFILTER_CONFIDENCE
+    best = max(scores)
+    reason = (
+        f"Embedding pre-filter: similarity {best:.2f} >= {high:.2f}" if any(verdicts)
+        else f"Embedding pre-filter: similarity {best:.2f} < {low:.2f}"
+    )
+    classified: ClassifiedIssue = {
+        "issue_id": issue_id,
+        "matches_criteria": any(verdicts),
+        "confidence": confidence,
+        "reason": reason,
+    }
+    if len(criteria) > 1:
+        classified["criteria"] = [
+            {"type": c["type"], "matches": v, "confidence": confidence} for c, v in zip(criteria, verdicts)
+        ]
+    return classified
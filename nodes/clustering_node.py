@@ -0,0 +1,176 @@
+"""
+Clustering Node [3a/8]
+
+Purpose:
+  Collapse near-duplicate issues WITHIN one upload before any LLM work.
+  QA files often report the same bug several times in different words;
+  only one representative per cluster is classified and ticketed.
+
+Input:  state["parsed_issues"]   every issue in the upload
+Output: state["parsed_issues"]   one representative per cluster (input order kept)
+        state["issue_clusters"]  {representative_id: [all member ids]} for clusters > 1
+        representative["cluster_members"]  ids of the issues it stands in for
+
+Method:
+  1. Embed "title description" of every issue in ONE embed_documents call
+  2. Normalize → cosine similarity is a dot product
+  3. Greedy leader clustering in input order: the first unassigned issue becomes
+     a representative and absorbs every unassigned issue with
+     similarity >= CLUSTER_SIMILARITY_THRESHOLD (one matrix-vector product each)
+
+Streaming:
+  OnlineClusterer assigns issues one batch at a time (pipeline_node). Each issue
+  joins the FIRST earlier representative it clears the threshold against —
+  exactly the assignment the batch algorithm makes, so both modes agree.
+
+Degraded mode:
+  If embedding fails, clustering is skipped and all issues pass through.
+
+Teaching point:
+  JIRA duplicate detection only sees tickets that already exist. Two copies of
+  the same bug in one upload would both become tickets — dedup must happen
+  inside the batch too.
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+
+from schemas.state import AgentState, ParsedIssue
+from agents.rag_agent import rag_agent
+import config
+
+logger = logging.getLogger(__name__)
+
+
+def clustering_node(state: AgentState) -> dict:
+    """
+    [Node 3a] Group near-duplicate issues, keep one representative per cluster.
+    """
+    issues = state["parsed_issues"]
+    if len(issues) < 2:
+        return {"issue_clusters": {}}
+    try:
+        vectors = rag_agent.embeddings.embed_documents([_issue_text(i) for i in issues])
+    except Exception:
+        logger.warning("Issue embedding failed — skipping near-duplicate clustering", exc_info=True)
+        return {"issue_clusters": {}}
+    return _apply(issues, cluster_issues(vectors, config.CLUSTER_SIMILARITY_THRESHOLD))
+
+
+async def aclustering_node(state: AgentState) -> dict:
+    """
+    [Node 3a] Async twin of clustering_node() — used by graph.ainvoke().
+    """
+    issues = state["parsed_issues"]
+    if len(issues) < 2:
+        return {"issue_clusters": {}}
+    try:
+        vectors = await rag_agent.embeddings.aembed_documents([_issue_text(i) for i in issues])
+    except Exception:
+        logger.warning("Issue embedding failed — skipping near-duplicate clustering", exc_info=True)
+        return {"issue_clusters": {}}
+    return _apply(issues, cluster_issues(vectors, config.CLUSTER_SIMILARITY_THRESHOLD))
+
+
+def cluster_issues(vectors: list[list[float]], threshold: float) -> list[list[int]]:
+    """
+    Greedy leader clustering. Returns clusters as lists of row indices;
+    the first index of each cluster is its representative.
+    """
+    matrix = _unit_rows(vectors)
+    unassigned = np.ones(len(matrix), dtype=bool)
+    clusters = []
+    for leader in range(len(matrix)):
+        if not unassigned[leader]:
+            continue
+        candidates = np.flatnonzero(unassigned)
+        similar = candidates[matrix[candidates] @ matrix[leader] >= threshold]
+        members = [leader] + [int(j) for j in similar if j != leader]
+        unassigned[members] = False
+        clusters.append(members)
+    return clusters
+
+
+class OnlineClusterer:
+    """Incremental leader clustering for issues that arrive in batches."""
+
+    def __init__(self, threshold: float = config.CLUSTER_SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self.representatives: list[ParsedIssue] = []
+        self._leaders: Optional[np.ndarray] = None   # (capacity, dim) unit vectors
+        self._disabled = False
+
+    async def aadd(self, issues: list[ParsedIssue]) -> list[ParsedIssue]:
+        """Cluster one batch; return the issues that became new representatives."""
+        if not issues:
+            return []
+        if not self._disabled:
+            try:
+                vectors = await rag_agent.embeddings.aembed_documents([_issue_text(i) for i in issues])
+            except Exception:
+                logger.warning("Issue embedding failed — skipping near-duplicate clustering", exc_info=True)
+                self._disabled = True
+        if self._disabled:
+            fresh = [dict(i) for i in issues]
+            self.representatives.extend(fresh)
+            return fresh
+
+        fresh = []
+        for issue, vector in zip(issues, _unit_rows(vectors)):
+            count = len(self.representatives)
+            leader = self._first_leader(vector, count)
+            if leader is None:
+                representative = dict(issue)
+                self._push(vector, count)
+                self.representatives.append(representative)
+                fresh.append(representative)
+            else:
+                self.representatives[leader].setdefault("cluster_members", []).append(issue["id"])
+        return fresh
+
+    def clusters(self) -> dict[str, list[str]]:
+        return {
+            r["id"]: [r["id"], *r["cluster_members"]]
+            for r in self.representatives
+            if r.get("cluster_members")
+        }
+
+    def _first_leader(self, vector: np.ndarray, count: int) -> Optional[int]:
+        if not count:
+            return None
+        above = self._leaders[:count] @ vector >= self.threshold
+        return int(np.argmax(above)) if above.any() else None
+
+    def _push(self, vector: np.ndarray, count: int) -> None:
+        """Append a leader row, doubling capacity as needed."""
+        if self._leaders is None:
+            self._leaders = np.empty((16, vector.shape[0]), dtype=np.float32)
+        elif count == len(self._leaders):
+            self._leaders = np.concatenate([self._leaders, np.empty_like(self._leaders)])
+        self._leaders[count] = vector
+
+
+def _unit_rows(vectors: list[list[float]]) -> np.ndarray:
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def _apply(issues: list[ParsedIssue], clusters: list[list[int]]) -> dict:
+    representatives: list[ParsedIssue] = []
+    issue_clusters: dict[str, list[str]] = {}
+    for members in clusters:
+        representative = dict(issues[members[0]])
+        if len(members) > 1:
+            member_ids = [issues[m]["id"] for m in members]
+            representative["cluster_members"] = member_ids[1:]
+            issue_clusters[representative["id"]] = member_ids
+        representatives.append(representative)
+
+    return {"parsed_issues": representatives, "issue_clusters": issue_clusters}
+
+
+def _issue_text(issue: ParsedIssue) -> str:
+    return f"{issue.get('title', '')} {issue.get('description', '')}".strip()
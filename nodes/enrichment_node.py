@@ -23,12 +23,44 @@ Teaching point:
     "Create JIRA tickets for all P1 security issues in this file"
     → intent=update, requires_file=true, filter_criteria=security,
       requires_ticket=true
+
+    "Find accuracy and security issues and summarize"
+    → intent=filter_and_report, filter_criteria=[accuracy, security],
+      criteria_match=any — classified in one pass (classification_node)
+
+Fast path (ENRICHMENT_FAST_PATH):
+  Instructions the prompt's own keyword rules decide unambiguously are turned
+  into a contract locally by nodes/enrichment_rules.py — no LLM call. Anything
+  the rules are unsure about still goes to the LLM.
+
+Contract cache (utils/enrichment_cache.py):
+  LLM contracts are cached by normalized instruction, with an embedding tier
+  for paraphrases. Both are scoped to ENRICHMENT_PROMPT + LLM_MODEL. Only
+  contracts with every key and type the prompt asks for are cached; anything
+  else is retried like invalid JSON, so one bad completion is not replayed.
+
+  metrics["enrichment_path"] = "rules" | "cache_exact" | "cache_semantic" | "llm"
 """
 
+import asyncio
 import json
-from schemas.state import AgentState
+import logging
+from typing import Optional
+
+from langchain_openai import ChatOpenAI
+from schemas.state import AgentState, EnrichedTask
+from nodes.enrichment_rules import rule_based_contract
+from agents.rag_agent import rag_agent
+from utils.enrichment_cache import EnrichmentCache
+from utils.llm_limiter import invoke_llm, ainvoke_llm
 import config
 
+logger = logging.getLogger(__name__)
+
+INTENTS = {"query", "filter_and_report", "analyze", "update"}
+CRITERIA_TYPES = {"accuracy", "performance", "security", "critical", "custom"}
+OUTPUT_FORMATS = {"executive", "detailed", "bullet"}
+FLAGS = ("requires_file_processing", "requires_slack_post", "requires_ticket_creation", "requires_analysis")
 
 ENRICHMENT_PROMPT = """You are a task contract extractor for a QA intelligence system.
 
@@ -53,6 +85,12 @@ filter_criteria: object (or null if no filtering needed):
     - "custom"      → any other specific criteria
   description: 1-2 sentence natural language description of what to look for
   confidence_threshold: float (default 0.6; use 0.8 for "strict/only clear"; 0.4 for "all/any")
+  When the user asks for several distinct criteria at once ("accuracy and security
+  issues"), return a LIST of such objects — one per criterion — instead of one object.
+
+criteria_match: "any" or "all" — how a list of filter_criteria selects issues
+  - "any" (default): an issue matching at least one criterion is kept ("accuracy and security issues")
+  - "all": only issues matching every criterion ("issues that are both slow and insecure")
 
 requires_slack_post: true if user wants a Slack summary posted
   - keywords: "post", "send", "notify", "slack", "share"
@@ -76,18 +114,138 @@ Return ONLY valid JSON with these exact keys. No explanation. No markdown.
 """
 
 
-def enrichment_node(state: AgentState) -> AgentState:
+def enrichment_node(state: AgentState) -> dict:
     """
     [Node 1] Extract structured task contract from any user instruction.
-    Retries once on invalid JSON output.
+    Retries once on invalid JSON output or an incomplete contract.
+    """
+    if (fast := _fast_path(state)) is not None:
+        return fast
+    instruction = state["instruction"]
+    if (cached := enrichment_cache.lookup_exact(instruction)) is not None:
+        return _result(cached, "cache_exact")
+    vector = _embed(instruction)
+    if vector is not None and (cached := enrichment_cache.lookup_similar(vector)) is not None:
+        return _result(cached, "cache_semantic")
+
+    llm = _build_llm()
+    prompt = ENRICHMENT_PROMPT.format(instruction=instruction)
+
+    for attempt in range(config.MAX_LLM_RETRIES + 1):
+        response = invoke_llm(llm, prompt)
+        try:
+            contract = _validated(json.loads(response.content))
+            enrichment_cache.store(instruction, contract, vector)
+            return _result(contract, "llm")
+        except ValueError as e:  # JSONDecodeError included
+            if attempt == config.MAX_LLM_RETRIES:
+                _record_failure(state, e)
+
+
+async def aenrichment_node(state: AgentState) -> dict:
+    """
+    [Node 1] Async twin of enrichment_node() — used by graph.ainvoke().
     """
-    # TODO: implement enrichment node
-    # Steps:
-    #   1. Initialize ChatOpenAI(model=config.LLM_MODEL, temperature=0)
-    #   2. Format ENRICHMENT_PROMPT with state["instruction"]
-    #   3. Call llm.invoke(prompt) → response
-    #   4. json.loads(response.content) → state["enriched_task"]
-    #   5. On JSONDecodeError: retry once
-    #   6. On second failure: append to state["errors"], raise ValueError
-    #   7. Return state
-    raise NotImplementedError
+    if (fast := _fast_path(state)) is not None:
+        return fast
+    instruction = state["instruction"]
+    if (cached := await asyncio.to_thread(enrichment_cache.lookup_exact, instruction)) is not None:
+        return _result(cached, "cache_exact")
+    vector = await _aembed(instruction)
+    if vector is not None and (cached := enrichment_cache.lookup_similar(vector)) is not None:
+        return _result(cached, "cache_semantic")
+
+    llm = _build_llm()
+    prompt = ENRICHMENT_PROMPT.format(instruction=instruction)
+
+    for attempt in range(config.MAX_LLM_RETRIES + 1):
+        response = await ainvoke_llm(llm, prompt)
+        try:
+            contract = _validated(json.loads(response.content))
+            await asyncio.to_thread(enrichment_cache.store, instruction, contract, vector)
+            return _result(contract, "llm")
+        except ValueError as e:  # JSONDecodeError included
+            if attempt == config.MAX_LLM_RETRIES:
+                _record_failure(state, e)
+
+
+enrichment_cache = EnrichmentCache(prompt=ENRICHMENT_PROMPT)
+
+
+def _fast_path(state: AgentState) -> dict | None:
+    if not config.ENRICHMENT_FAST_PATH:
+        return None
+    has_file = state.get("raw_file_content") is not None or bool(state.get("file_name"))
+    contract = rule_based_contract(state["instruction"], has_file)
+    if contract is None:
+        return None
+    return _result(contract, "rules")
+
+
+def _validated(contract) -> EnrichedTask:
+    """The LLM's contract if it has every EnrichedTask key with the right type, else ValueError."""
+    if not isinstance(contract, dict):
+        raise ValueError(f"expected a JSON object, got {type(contract).__name__}")
+    if contract.get("intent") not in INTENTS:
+        raise ValueError(f"intent {contract.get('intent')!r} is not one of {sorted(INTENTS)}")
+    for flag in FLAGS:
+        if not isinstance(contract.get(flag), bool):
+            raise ValueError(f"{flag} must be true or false")
+    if contract.get("output_format") not in OUTPUT_FORMATS:
+        raise ValueError(f"output_format {contract.get('output_format')!r} is not one of {sorted(OUTPUT_FORMATS)}")
+    if contract.get("criteria_match", "any") not in ("any", "all"):
+        raise ValueError(f"criteria_match {contract['criteria_match']!r} is not 'any' or 'all'")
+    if "filter_criteria" not in contract:
+        raise ValueError("filter_criteria is missing (null when there is no filter)")
+    criteria = contract["filter_criteria"]
+    if criteria == []:
+        raise ValueError("filter_criteria list is empty (use null)")
+    for c in criteria if isinstance(criteria, list) else [] if criteria is None else [criteria]:
+        if not _valid_criterion(c):
+            raise ValueError(f"invalid filter_criteria entry {c!r}")
+    return contract
+
+
+def _valid_criterion(c) -> bool:
+    threshold = c.get("confidence_threshold") if isinstance(c, dict) else None
+    return (
+        isinstance(c, dict)
+        and c.get("type") in CRITERIA_TYPES
+        and isinstance(c.get("description"), str)
+        and isinstance(threshold, (int, float)) and not isinstance(threshold, bool)
+    )
+
+
+def _result(contract: dict, path: str) -> dict:
+    return {"enriched_task": contract, "metrics": {"enrichment_path": path}}
+
+
+def _embed(instruction: str) -> Optional[list[float]]:
+    """Instruction vector for the paraphrase tier; None (exact tier only) if embedding fails."""
+    try:
+        return rag_agent.embeddings.embed_query(instruction)
+    except Exception:
+        logger.warning("Instruction embedding failed — skipping the paraphrase cache", exc_info=True)
+        return None
+
+
+async def _aembed(instruction: str) -> Optional[list[float]]:
+    try:
+        return await rag_agent.embeddings.aembed_query(instruction)
+    except Exception:
+        logger.warning("Instruction embedding failed — skipping the paraphrase cache", exc_info=True)
+        return None
+
+
+def _build_llm() -> ChatOpenAI:
+    return ChatOpenAI(
+        model=config.LLM_MODEL,
+        openai_api_key=config.OPENAI_API_KEY,
+        temperature=0,
+    )
+
+
+def _record_failure(state: AgentState, error: ValueError) -> None:
+    """Enrichment is the only fatal node: no contract means no routing."""
+    state["errors"].append({"node": "enrichment", "error": f"Invalid task contract from LLM: {error}"})
+    raise ValueError("Enrichment failed: LLM did not return a valid task contract") from error
@@ -0,0 +1,164 @@
+"""
+Enrichment Rules — deterministic fast path for enrichment_node.
+
+Purpose:
+  Build the EnrichedTask contract locally for instructions the keyword rules in
+  ENRICHMENT_PROMPT already decide unambiguously, so those requests skip the
+  enrichment LLM call entirely.
+
+Confidence:
+  rule_based_contract() returns None (→ fall back to the LLM) unless:
+    - no file:   the instruction is a plain question with no action keywords
+                 and no reference to a file
+    - with file: at most one filter type matches, at least one action is
+                 requested, and every word is in the rule vocabulary — any
+                 unknown word may narrow the criteria ("... in checkout"),
+                 which only the LLM can phrase into a description
+
+benchmarks/bench_enrichment.py measures coverage and accuracy of these rules
+(and optionally of the LLM) on tests/fixtures/enrichment_instructions.json.
+
+Teaching point:
+  Not every step needs a model. Route the easy majority through rules you can
+  read, and spend the LLM call on the instructions that actually need it.
+"""
+
+import re
+from typing import Optional
+
+from schemas.state import EnrichedTask
+import config
+
+
+# filter_criteria.type → words that select it
+FILTER_KEYWORDS = {
+    "accuracy":    {"accuracy", "accurate", "inaccurate", "incorrect", "wrong", "calculation",
+                    "calculations", "miscalculated", "prediction", "predictions", "misclassified"},
+    "performance": {"performance", "slow", "slowness", "latency", "timeout", "timeouts",
+                    "throughput", "lag", "laggy"},
+    "security":    {"security", "auth", "authentication", "authorization", "injection",
+                    "vulnerability", "vulnerabilities", "exposure", "xss", "csrf"},
+    "critical":    {"critical", "p1", "blocker", "blockers", "outage", "outages"},
+}
+
+FILTER_DESCRIPTIONS = {
+    "accuracy":    "Issues where outputs, calculations, predictions or data are wrong.",
+    "performance": "Issues involving slowness, latency, timeouts or throughput degradation.",
+    "security":    "Issues involving authentication, injection, data exposure or other vulnerabilities.",
+    "critical":    "P1 or severity=critical issues, regardless of type.",
+}
+
+SLACK_KEYWORDS = {"post", "send", "notify", "slack", "share", "channel"}
+TICKET_KEYWORDS = {"ticket", "tickets", "jira", "track"}
+ANALYSIS_KEYWORDS = {"summary", "summarize", "summarise", "analysis", "analyze", "analyse",
+                     "breakdown", "explain", "overview", "list"}
+# With Slack requested these describe the post, not an inline answer ("post a summary to Slack")
+SUMMARY_KEYWORDS = {"summary", "summarize", "summarise", "overview"}
+STRICT_KEYWORDS = {"strict", "strictly", "clear", "clearly", "definite", "definitely"}
+BROAD_KEYWORDS = {"all", "any", "every", "possible"}
+
+FORMAT_KEYWORDS = (  # checked in order — the most specific request wins
+    ("detailed",  {"detailed", "full", "breakdown", "explain", "thorough"}),
+    ("bullet",    {"list", "bullet", "bullets", "bulleted"}),
+    ("executive", {"summary", "summarize", "summarise", "brief", "quick", "executive", "overview"}),
+)
+
+QUESTION_WORDS = {"what", "how", "why", "which", "when", "where", "who", "explain",
+                  "describe", "define", "is", "are", "can", "should", "do", "does"}
+FILE_REFERENCES = {"file", "uploaded", "upload", "attached", "spreadsheet", "csv", "rows"}
+
+# Glue words a file instruction may contain without changing its meaning
+FILLER_WORDS = {
+    "a", "an", "the", "and", "or", "to", "in", "into", "from", "for", "of", "on", "with",
+    "as", "this", "these", "that", "those", "them", "it", "its", "me", "my", "our", "us",
+    "we", "i", "please", "find", "show", "get", "give", "identify", "flag", "filter",
+    "pick", "select", "only", "issues", "issue", "bugs", "bug", "problems", "defects",
+    "related", "create", "then", "also", "each", "one", "per", "is", "are", "be", "can",
+    "you", "out", "up", "about", "team", "qa", "file", "uploaded", "upload", "attached",
+    "severity", "priority", "level", "their", "results", "findings", "report",
+}
+
+VOCABULARY = (
+    set().union(*FILTER_KEYWORDS.values())
+    | SLACK_KEYWORDS | TICKET_KEYWORDS | ANALYSIS_KEYWORDS
+    | STRICT_KEYWORDS | BROAD_KEYWORDS | FILLER_WORDS
+    | set().union(*(words for _, words in FORMAT_KEYWORDS))
+)
+
+
+def rule_based_contract(instruction: str, has_file: bool) -> Optional[EnrichedTask]:
+    """
+    Return the task contract when the rules are confident, else None (use the LLM).
+    """
+    words = re.findall(r"[a-z0-9]+", instruction.lower())
+    if not words:
+        return None
+    vocabulary = set(words)
+
+    wants_slack = bool(vocabulary & SLACK_KEYWORDS)
+    wants_tickets = bool(vocabulary & TICKET_KEYWORDS)
+    inline = vocabulary & ANALYSIS_KEYWORDS
+    wants_analysis = bool(inline - SUMMARY_KEYWORDS if wants_slack else inline)
+    output_format = _output_format(vocabulary, wants_slack)
+
+    if not has_file:
+        is_question = words[0] in QUESTION_WORDS or instruction.rstrip().endswith("?")
+        if not is_question or wants_slack or wants_tickets or vocabulary & FILE_REFERENCES:
+            return None
+        return EnrichedTask(
+            intent="query",
+            requires_file_processing=False,
+            filter_criteria=None,
+            requires_slack_post=False,
+            requires_ticket_creation=False,
+            requires_analysis=True,
+            output_format=output_format,
+        )
+
+    types = [t for t, keywords in FILTER_KEYWORDS.items() if vocabulary & keywords]
+    if len(types) > 1 or not (wants_slack or wants_tickets or wants_analysis):
+        return None
+    if any(word not in VOCABULARY for word in words):
+        return None
+
+    criteria = None
+    if types:
+        criteria = {
+            "type": types[0],
+            "description": FILTER_DESCRIPTIONS[types[0]],
+            "confidence_threshold": _threshold(vocabulary),
+        }
+
+    return EnrichedTask(
+        intent=_intent(criteria, wants_slack, wants_tickets, wants_analysis),
+        requires_file_processing=True,
+        filter_criteria=criteria,
+        requires_slack_post=wants_slack,
+        requires_ticket_creation=wants_tickets,
+        requires_analysis=wants_analysis,
+        output_format=output_format,
+    )
+
+
+def _intent(criteria: Optional[dict], slack: bool, tickets: bool, analysis: bool) -> str:
+    if tickets and not (slack or analysis):
+        return "update"
+    if criteria is None:
+        return "analyze"
+    return "filter_and_report"
+
+
+def _threshold(vocabulary: set[str]) -> float:
+    if vocabulary & STRICT_KEYWORDS:
+        return 0.8
+    if vocabulary & BROAD_KEYWORDS:
+        return 0.4
+    return config.DEFAULT_CONFIDENCE_THRESHOLD
+
+
+def _output_format(vocabulary: set[str], slack: bool) -> str:
+    """Explicit format words first; a Slack post defaults to executive (PRD §9.2)."""
+    for output_format, keywords in FORMAT_KEYWORDS:
+        if vocabulary & keywords:
+            return output_format
+    return "executive" if slack else "detailed"
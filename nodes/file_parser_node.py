@@ -9,59 +9,174 @@ Supported formats: CSV, Excel (.xlsx), Markdown, TXT
 
 Input:  state["raw_file_content"], state["file_name"]
 Output: state["parsed_issues"]  list of ParsedIssue dicts
+        state["raw_file_content"] is released (None) once parsed
+        Only these two keys are returned — the node runs in parallel with rag_node.
+        Uploads through the API arrive already parsed (raw_file_content None,
+        parsed_issues set) and pass through untouched.
 
 Expected columns (case-insensitive): id, title, description, steps, severity
 
+Raw content:
+  Content is raw bytes, a binary stream or str. Text formats are decoded as a
+  stream (TextIOWrapper, utf-8 with an optional BOM as Excel writes it), so no
+  second, fully decoded copy is built; .xlsx is read from the bytes directly.
+  The API hands text uploads over as a stream fed while the body arrives.
+
+Streaming:
+  Every parser is a generator of raw rows and _normalize() is a generator of
+  ParsedIssues, so iter_issues() holds one row at a time. .xlsx goes through
+  openpyxl read_only/iter_rows instead of a whole-workbook DataFrame.
+  Large exports (50k+ rows) only need MAX_ISSUES_PER_UPLOAD / MAX_UPLOAD_BYTES
+  raised — memory stays flat (benchmarks/bench_parsers.py).
+
+Limits:
+  More than MAX_ISSUES_PER_UPLOAD issues raises IssueLimitError (a ValueError).
+  The API parses the upload (once) before invoking the graph, so oversized or
+  malformed files are rejected before any LLM call.
+
 Teaching point:
   This is the only node with zero LLM calls.
   Deterministic parsing keeps the graph predictable and fast.
   Always normalize at the boundary before LLM processing.
 """
 
+import csv
+import io
+import os
+from zipfile import BadZipFile
+
+from typing import BinaryIO, Iterable, Iterator, Optional, TextIO, Union
+
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+
 from schemas.state import AgentState, ParsedIssue
+import config
+
 
+# Upload content: raw bytes, a binary stream (text formats only) or already decoded text
+Content = Union[str, bytes, bytearray, BinaryIO]
 
 REQUIRED_FIELDS = {"id", "title", "description"}
 OPTIONAL_FIELDS = {"steps", "severity"}
 
 
-def file_parser_node(state: AgentState) -> AgentState:
+def file_parser_node(state: AgentState) -> dict:
     """
     [Node 3] Parse raw file content into normalized ParsedIssue list.
     """
-    # TODO: implement file parser node
-    # Steps:
-    #   1. Detect format from state["file_name"] extension (.csv/.xlsx/.md/.txt)
-    #   2. Dispatch to the correct private parser
-    #   3. Normalize column names to lowercase
-    #   4. Validate REQUIRED_FIELDS are present, raise ValueError if missing
-    #   5. Fill missing OPTIONAL_FIELDS with empty string ""
-    #   6. Set state["parsed_issues"] = list of ParsedIssue dicts
-    #   7. Return state
-    raise NotImplementedError
-
-
-def _parse_csv(content: str) -> list[dict]:
-    # TODO: use csv.DictReader to parse CSV content string
-    raise NotImplementedError
-
-
-def _parse_excel(content: bytes) -> list[dict]:
-    # TODO: use pd.read_excel(io.BytesIO(content)) to parse Excel bytes
-    raise NotImplementedError
-
-
-def _parse_markdown(content: str) -> list[dict]:
-    # TODO: parse markdown table rows into dicts
-    raise NotImplementedError
-
-
-def _parse_txt(content: str) -> list[dict]:
-    # TODO: each non-empty line = one issue title, auto-generate id
-    raise NotImplementedError
-
-
-def _normalize(issues: list[dict]) -> list[ParsedIssue]:
+    if state.get("raw_file_content") is None:
+        return {}  # parsed by the API on upload — parsed_issues is already set
+    return {
+        "parsed_issues": parse_issues(state["raw_file_content"], state.get("file_name")),
+        "raw_file_content": None,  # parsed — don't carry the upload through the graph
+    }
+
+
+class IssueLimitError(ValueError):
+    """The upload holds more issues than MAX_ISSUES_PER_UPLOAD."""
+
+
+def parse_issues(
+    content: Content,
+    file_name: Optional[str],
+    max_issues: int = config.MAX_ISSUES_PER_UPLOAD,
+) -> list[ParsedIssue]:
+    """Parse + normalize one upload. Raises ValueError on bad format or content."""
+    return list(iter_issues(content, file_name, max_issues))
+
+
+def iter_issues(
+    content: Content,
+    file_name: Optional[str],
+    max_issues: int = config.MAX_ISSUES_PER_UPLOAD,
+) -> Iterator[ParsedIssue]:
+    """Yield normalized issues one row at a time. Errors surface while iterating."""
+    ext = os.path.splitext(file_name or "")[1].lower()
+    parser = _PARSERS.get(ext)
+    if parser is None:
+        raise ValueError(f"Unsupported file format '{ext}'. Supported: {sorted(_PARSERS)}")
+    return _normalize(parser(content), max_issues)
+
+
+def _text_stream(content: Content) -> TextIO:
+    """Decode lazily: bytes are wrapped, never decoded into one big str."""
+    if isinstance(content, str):
+        return io.StringIO(content, newline="")
+    stream = io.BytesIO(content) if isinstance(content, (bytes, bytearray)) else content
+    return io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+
+
+def _parse_csv(content: Content) -> Iterator[dict]:
+    yield from csv.DictReader(_text_stream(content))
+
+
+def _parse_excel(content: Content) -> Iterator[dict]:
+    if isinstance(content, str):
+        raise ValueError("Excel content must be raw bytes, not decoded text")
+    try:
+        workbook = load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+    except (BadZipFile, InvalidFileException, KeyError) as e:  # corrupt, or not really .xlsx
+        raise ValueError("Unreadable Excel file") from e
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        for values in rows:
+            if all(v is None or v == "" for v in values):
+                continue
+            yield {
+                h: ("" if v is None else v)
+                for h, v in zip(header, values)
+                if h is not None
+            }
+    finally:
+        workbook.close()
+
+
+def _parse_markdown(content: Content) -> Iterator[dict]:
+    header = None
+    for line in _text_stream(content):
+        if not line.strip().startswith("|"):
+            continue
+        cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+        if header is None:
+            header = cells
+        elif not all(set(cell) <= set("-: ") for cell in cells):  # skip |---|---| separator
+            yield dict(zip(header, cells))
+
+
+def _parse_txt(content: Content) -> Iterator[dict]:
+    n = 0
+    for line in _text_stream(content):
+        line = line.strip()
+        if line:
+            n += 1
+            yield {"id": str(n), "title": line, "description": line}
+
+
+def _normalize(issues: Iterable[dict], max_issues: int) -> Iterator[ParsedIssue]:
     """Lowercase keys, fill missing optional fields, cast to ParsedIssue."""
-    # TODO: normalize each issue dict into ParsedIssue TypedDict
-    raise NotImplementedError
+    for count, row in enumerate(issues):
+        if count == max_issues:
+            raise IssueLimitError(f"File has more than {max_issues} issues")
+        row = {str(k).strip().lower(): ("" if v is None else str(v).strip()) for k, v in row.items()}
+        missing = REQUIRED_FIELDS - row.keys()
+        if missing:
+            raise ValueError(f"Missing required fields: {sorted(missing)}")
+        yield ParsedIssue(
+            id=row["id"],
+            title=row["title"],
+            description=row["description"],
+            steps=row.get("steps", ""),
+            severity=row.get("severity", ""),
+        )
+
+
+_PARSERS = {
+    ".csv":  _parse_csv,
+    ".xlsx": _parse_excel,
+    ".md":   _parse_markdown,
+    ".txt":  _parse_txt,
+}
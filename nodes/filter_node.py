@@ -7,6 +7,11 @@ Purpose:
   Mode A — with filter_criteria (classification was run):
     Keep issues where matches_criteria == True AND confidence >= threshold
 
+    With a list of criteria, each criterion is judged on its own entry of the
+    issue's `criteria` vector against its own threshold, and the issue is kept
+    when ANY (default) or ALL of them hit — enriched_task["criteria_match"].
+    Kept issues list the criteria they hit in `matched_criteria`.
+
   Mode B — without filter_criteria (classification skipped):
     Pass ALL parsed_issues through as filtered_issues unchanged
 
@@ -20,31 +25,54 @@ Teaching point:
   Lab exercise: change threshold and observe precision vs recall in Langfuse.
 """
 
-from schemas.state import AgentState
+from schemas.state import AgentState, ClassifiedIssue, FilterCriteria, ParsedIssue, criteria_list
 
 
-def filter_node(state: AgentState) -> AgentState:
+def filter_node(state: AgentState) -> dict:
     """
     [Node 5] Filter issues by criteria match and confidence threshold.
     Falls back to pass-through when no filter_criteria is set.
     """
-    # TODO: implement filter node
-    # Steps:
-    #   1. criteria = state["enriched_task"].get("filter_criteria")
-    #
-    #   2. Mode A — filter_criteria is NOT None (classification was run):
-    #        threshold = criteria["confidence_threshold"]
-    #        state["filtered_issues"] = [
-    #            i for i in state["classified_issues"]
-    #            if i["matches_criteria"] and i["confidence"] >= threshold
-    #        ]
-    #
-    #   3. Mode B — filter_criteria is None (no classification):
-    #        state["filtered_issues"] = state["parsed_issues"]  # pass all through
-    #
-    #   4. If filtered_issues is empty:
-    #        state["metrics"]["early_exit"] = True
-    #        state["metrics"]["early_exit_reason"] = "No issues matched the criteria"
-    #
-    #   5. Return state
-    raise NotImplementedError
+    task = state["enriched_task"]
+    criteria = criteria_list(task.get("filter_criteria"))
+
+    if criteria:
+        # Mode A: keep confident matches, re-attach the parsed fields downstream agents need
+        filtered = select_matches(
+            state["classified_issues"], state["parsed_issues"], criteria, task.get("criteria_match", "any")
+        )
+    else:
+        # Mode B: no classification — pass everything through
+        filtered = state["parsed_issues"]
+
+    if not filtered:
+        return {
+            "filtered_issues": filtered,
+            "metrics": {"early_exit": True, "early_exit_reason": "No issues matched the criteria"},
+        }
+    return {"filtered_issues": filtered}
+
+
+def select_matches(
+    classified: list[ClassifiedIssue],
+    parsed: list[ParsedIssue],
+    criteria: list[FilterCriteria],
+    match: str = "any",
+) -> list[dict]:
+    """Mode A selection — also used per batch by pipeline_node."""
+    parsed_by_id = {p["id"]: p for p in parsed}
+    selected = []
+    for issue in classified:
+        if "criteria" in issue:
+            hits = [
+                c["type"]
+                for c, target in zip(issue["criteria"], criteria)
+                if c["matches"] and c["confidence"] >= target["confidence_threshold"]
+            ]
+            keep = len(hits) == len(criteria) if match == "all" else bool(hits)
+            issue = {**issue, "matched_criteria": hits}
+        else:
+            keep = issue["matches_criteria"] and issue["confidence"] >= criteria[0]["confidence_threshold"]
+        if keep:
+            selected.append({**parsed_by_id.get(issue["issue_id"], {}), **issue})
+    return selected
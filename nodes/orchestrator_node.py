@@ -13,6 +13,8 @@ Output:
   state["slack_query"]   instruction for slack_agent  (if requires_slack_post)
   state["jira_query"]    instruction for jira_agent   (if requires_ticket_creation)
   state["answer_query"]  instruction for answer_agent (if requires_analysis)
+  state["metrics"]["active_branches"]  e.g. ["slack", "answer"] — the per-request
+                                       branch activation trace
 
 Teaching point:
   The orchestrator is the bridge between "what the user wants" and "what each agent does."
@@ -24,67 +26,104 @@ Teaching point:
     requires_analysis         → activate Answer agent
 
   In the graph, only the activated agents run in parallel.
-  Deactivated agents are skipped entirely (conditional edges).
+  Deactivated agents are never scheduled — route_to_agents() sends work only to
+  branches whose query is set here. Tickets already streamed by pipeline_node
+  (jira_result set) do not activate the JIRA branch a second time.
 """
 
-from schemas.state import AgentState
+from typing import Optional
 
+from schemas.state import AgentState, criteria_list
 
-def orchestrator_node(state: AgentState) -> AgentState:
+
+def orchestrator_node(state: AgentState) -> dict:
     """
     [Node 6] Generate sub-agent queries based on filtered issues and task contract.
     """
-    # TODO: implement orchestrator node
-    # Steps:
-    #   1. issues      = state["filtered_issues"]
-    #   2. task        = state["enriched_task"]
-    #   3. criteria    = task.get("filter_criteria")
-    #   4. issue_count = len(issues)
-    #   5. issue_titles = ", ".join([i.get("title","") for i in issues[:5]])
-    #   6. criteria_desc = criteria["description"] if criteria else "all QA issues"
-    #
-    #   7. If task["requires_slack_post"]:
-    #        state["slack_query"] = _build_slack_query(
-    #            issue_count, issue_titles, criteria_desc, task["output_format"]
-    #        )
-    #
-    #   8. If task["requires_ticket_creation"]:
-    #        state["jira_query"] = _build_jira_query(issue_count, criteria_desc)
-    #
-    #   9. If task["requires_analysis"]:
-    #        state["answer_query"] = _build_answer_query(
-    #            state["instruction"], issue_count, criteria_desc, task["output_format"]
-    #        )
-    #
-    #   10. Return state
-    raise NotImplementedError
+    issues = state["filtered_issues"]
+    task = state["enriched_task"]
+    issue_count = len(issues)
+    issue_titles = ", ".join([i.get("title", "") for i in issues[:5]])
+    criteria_desc = _criteria_description(task)
+
+    queries = {}
+    if task["requires_slack_post"]:
+        queries["slack_query"] = _build_slack_query(
+            issue_count, issue_titles, criteria_desc, task["output_format"]
+        )
+
+    if task["requires_ticket_creation"] and state.get("jira_result") is None:
+        queries["jira_query"] = _build_jira_query(issue_count, criteria_desc)
+
+    if task["requires_analysis"]:
+        queries["answer_query"] = _build_answer_query(
+            state["instruction"], issue_count, criteria_desc, task["output_format"]
+        )
+
+    active = [branch for branch, key in BRANCH_QUERIES.items() if key in queries]
+    return {**queries, "metrics": {"active_branches": active}}
+
+
+# Agent branch → the query that activates it (order = trace order)
+BRANCH_QUERIES = {
+    "slack":  "slack_query",
+    "jira":   "jira_query",
+    "answer": "answer_query",
+}
+
+
+def build_jira_query(task: dict, issue_count: Optional[int] = None) -> str:
+    """JIRA instruction for callers that create tickets before the final count is known."""
+    return _build_jira_query(issue_count, _criteria_description(task))
+
+
+def _criteria_description(task: dict) -> str:
+    """What the issues were selected for — several criteria are joined by criteria_match."""
+    criteria = criteria_list(task.get("filter_criteria"))
+    if not criteria:
+        return "all QA issues"
+    if len(criteria) == 1:
+        return criteria[0]["description"]
+    match = "ALL" if task.get("criteria_match") == "all" else "ANY"
+    return f"issues matching {match} of: " + "; ".join(c["description"] for c in criteria)
+
+
+FORMAT_GUIDANCE = {
+    "executive": "Keep it under 300 words, high-level only.",
+    "detailed":  "Give a full breakdown of every issue.",
+    "bullet":    "Format it as a bullet-point list, one line per issue.",
+}
 
 
 def _build_slack_query(
     issue_count: int, issue_titles: str, criteria_desc: str, output_format: str
 ) -> str:
     """Build specialized instruction for Slack summary agent."""
-    # TODO: return formatted instruction
-    # Include: issue_count, issue_titles (sample), criteria_desc,
-    # output_format (executive=<300 words / detailed=full breakdown / bullet=list),
-    # focus on production risk and business impact
-    raise NotImplementedError
+    return (
+        f"Generate a {output_format} summary of {issue_count} QA issues matching: {criteria_desc}. "
+        f"Sample issues: {issue_titles}. "
+        f"{FORMAT_GUIDANCE.get(output_format, '')} "
+        "Focus on production risk and business impact."
+    )
 
 
-def _build_jira_query(issue_count: int, criteria_desc: str) -> str:
+def _build_jira_query(issue_count: Optional[int], criteria_desc: str) -> str:
     """Build specialized instruction for JIRA ticket creation agent."""
-    # TODO: return formatted instruction
-    # Include: issue_count, criteria_desc,
-    # required ticket fields: summary, description, reproduction steps,
-    # expected vs actual behavior, priority (P1/P2/P3)
-    raise NotImplementedError
+    scope = f"each of the {issue_count} QA issues" if issue_count is not None else "each QA issue"
+    return (
+        f"Create a JIRA ticket for {scope} matching: {criteria_desc}. "
+        "Each ticket must include a summary, description, reproduction steps, "
+        "expected vs actual behavior, and a priority (P1/P2/P3)."
+    )
 
 
 def _build_answer_query(
     original_instruction: str, issue_count: int, criteria_desc: str, output_format: str
 ) -> str:
     """Build specialized instruction for Answer agent analysis."""
-    # TODO: return formatted instruction
-    # Include: original_instruction, issue_count, criteria_desc,
-    # output_format, ask for patterns, distribution, and recommendations
-    raise NotImplementedError
+    return (
+        f"User request: {original_instruction}\n"
+        f"Analyze the following {issue_count} QA issues matching: {criteria_desc}. "
+        f"Use the {output_format} format. {FORMAT_GUIDANCE.get(output_format, '')} "
+        "Identify patterns, the severity distribution, and concrete recommendations."
+    )
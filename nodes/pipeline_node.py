@@ -0,0 +1,195 @@
+"""
+Streaming Pipeline Node [2–5/8] — Conditional (PIPELINE_STREAMING)
+
+Purpose:
+  Overlap retrieval, parsing, clustering, classification, filtering and ticket
+  creation instead of running them back to back. Replaces rag + file_parser →
+  clustering → classification → filter when PIPELINE_STREAMING is on and the
+  task has filter_criteria.
+
+Stages (asyncio tasks connected by queues):
+  rag       arag_node() starts immediately; classification waits only for it
+  parse     iter_issues() pulled CLASSIFICATION_BATCH_SIZE rows at a time (thread);
+            issues the API already parsed are taken from parsed_issues instead
+  cluster   OnlineClusterer — new representatives are buffered into batches
+  classify  each full batch goes to BatchClassifier immediately (llm_limiter bounds it)
+  select    per-batch select_matches() — matches stream onward as they appear
+  tickets   if requires_ticket_creation: matched batches go straight to jira_agent;
+            orchestrator then leaves jira_query unset, so jira_branch never runs
+
+Slack and Answer still wait for the full match list — they summarize it.
+A ticket created before a later near-duplicate arrives lists only the
+cluster_members seen so far; state["issue_clusters"] is always complete.
+
+Output (same keys and order as the staged path):
+  state["parsed_issues"], state["issue_clusters"], state["classified_issues"],
+  state["filtered_issues"], state["jira_result"] (streamed tickets only)
+  state["metrics"]["pipeline"] = {batches, first_match_ms, first_ticket_ms, total_ms}
+
+Sync path:
+  pipeline_node() (graph.invoke) runs the staged nodes in sequence — same result,
+  no overlap.
+
+Teaching point:
+  A staged graph's time-to-first-result is the sum of every stage over the
+  WHOLE file. Pipelining makes it the latency of one batch through each stage.
+"""
+
+import asyncio
+import time
+from itertools import islice
+from typing import Iterator
+
+from schemas.state import AgentState, JiraResult, ParsedIssue, apply_update, criteria_list
+from nodes.rag_node import arag_node, rag_node
+from nodes.file_parser_node import file_parser_node, iter_issues
+from nodes.clustering_node import OnlineClusterer, clustering_node
+from nodes.classification_node import BatchClassifier, classification_node
+from nodes.filter_node import filter_node, select_matches
+from nodes.orchestrator_node import build_jira_query
+from agents.jira_agent import jira_agent
+import config
+
+_DONE = None  # queue sentinel
+
+
+# Keys this node owns; everything else in state is read-only here
+OUTPUT_KEYS = (
+    "rag_context", "raw_file_content", "parsed_issues", "issue_clusters",
+    "classified_issues", "filtered_issues", "jira_result", "errors", "metrics",
+)
+
+
+def pipeline_node(state: AgentState) -> dict:
+    """
+    [Node 2–5] Sync fallback — retrieve, parse, cluster, classify and filter one after another.
+    """
+    state = _scratch(state)
+    for node in (rag_node, file_parser_node, clustering_node, classification_node, filter_node):
+        apply_update(state, node(state))
+    return _delta(state)
+
+
+async def apipeline_node(state: AgentState) -> dict:
+    """
+    [Node 2–5] Streaming rag + parse → cluster → classify → filter (→ tickets).
+    """
+    state = _scratch(state)
+    start = time.perf_counter()
+    task = state["enriched_task"]
+    criteria = criteria_list(task["filter_criteria"])
+    size = config.CLASSIFICATION_BATCH_SIZE
+
+    if state.get("raw_file_content") is not None:
+        issues = iter_issues(state["raw_file_content"], state.get("file_name"))
+        state["raw_file_content"] = None
+    else:
+        issues = iter(state["parsed_issues"])  # parsed by the API on upload
+    clusterer = OnlineClusterer()
+    classifier = None  # built once rag_context is known — it is part of the prompt
+    jira_query = build_jira_query(task) if task["requires_ticket_creation"] else None
+
+    batches: asyncio.Queue = asyncio.Queue()
+    matches: asyncio.Queue = asyncio.Queue()
+    classified: dict[str, dict] = {}
+    jira_results: list[JiraResult] = []
+    timings: dict[str, float] = {}
+    batch_count = 0
+
+    def elapsed_ms() -> float:
+        return round((time.perf_counter() - start) * 1000, 1)
+
+    async def parse_and_cluster():
+        nonlocal batch_count
+        pending: list[ParsedIssue] = []
+        while chunk := await asyncio.to_thread(_take, issues, size):
+            pending.extend(await clusterer.aadd(chunk))
+            while len(pending) >= size:
+                batches.put_nowait(pending[:size])
+                pending = pending[size:]
+                batch_count += 1
+        if pending:
+            batches.put_nowait(pending)
+            batch_count += 1
+        batches.put_nowait(_DONE)
+
+    async def classify_and_select(batch: list[ParsedIssue]):
+        results = await classifier.aclassify(batch)
+        classified.update((r["issue_id"], r) for r in results)
+        selected = select_matches(results, batch, criteria, task.get("criteria_match", "any"))
+        if selected:
+            timings.setdefault("first_match_ms", elapsed_ms())
+            matches.put_nowait(selected)
+
+    async def classify(rag):
+        nonlocal classifier
+        apply_update(state, await rag)
+        classifier = BatchClassifier(state)
+        async with asyncio.TaskGroup() as group:
+            while (batch := await batches.get()) is not _DONE:
+                group.create_task(classify_and_select(batch))
+        matches.put_nowait(_DONE)
+
+    async def create_tickets():
+        while (selected := await matches.get()) is not _DONE:
+            if jira_query:
+                jira_results.append(
+                    await jira_agent.arun(selected, jira_query, request_id=state["request_id"])
+                )
+                timings.setdefault("first_ticket_ms", elapsed_ms())
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            rag = group.create_task(arag_node(state))
+            group.create_task(parse_and_cluster())
+            group.create_task(classify(rag))
+            group.create_task(create_tickets())
+    except BaseExceptionGroup as eg:
+        raise _first_error(eg)
+
+    representatives = clusterer.representatives
+    state["parsed_issues"] = representatives
+    state["issue_clusters"] = clusterer.clusters()
+    state["classified_issues"] = [classified[r["id"]] for r in representatives if r["id"] in classified]
+    apply_update(state, {"errors": classifier.errors, "metrics": classifier.metrics()})
+    apply_update(state, filter_node(state))
+
+    if jira_results:
+        state["jira_result"] = _merge_jira_results(jira_results)
+    state["metrics"]["pipeline"] = {
+        "batches": batch_count,
+        "first_match_ms": timings.get("first_match_ms"),
+        "first_ticket_ms": timings.get("first_ticket_ms"),
+        "total_ms": elapsed_ms(),
+    }
+    return _delta(state)
+
+
+def _scratch(state: AgentState) -> dict:
+    """Working copy: shared inputs by reference, fresh errors/metrics so only new entries return."""
+    return {**state, "errors": [], "metrics": {}}
+
+
+def _delta(scratch: dict) -> dict:
+    return {key: scratch[key] for key in OUTPUT_KEYS if key in scratch}
+
+
+def _take(iterator: Iterator[ParsedIssue], size: int) -> list[ParsedIssue]:
+    return list(islice(iterator, size))
+
+
+def _first_error(group: BaseExceptionGroup) -> BaseException:
+    """Surface the underlying error (e.g. the parser's ValueError) like the staged path does."""
+    error = group.exceptions[0]
+    return _first_error(error) if isinstance(error, BaseExceptionGroup) else error
+
+
+def _merge_jira_results(results: list[JiraResult]) -> JiraResult:
+    errors = [r["error"] for r in results if r.get("error")]
+    return JiraResult(
+        created=[t for r in results for t in r["created"]],
+        duplicates=[d for r in results for d in r["duplicates"]],
+        success=all(r["success"] for r in results),
+        error="; ".join(errors) or None,
+    )
+
@@ -13,6 +13,11 @@ Activation condition:
 Input:  state["enriched_task"]["filter_criteria"]
 Output: state["rag_context"]  (RAGResult from rag_agent)
 
+Parallelism:
+  Runs in the same graph step as file_parser_node, so it returns ONLY its own
+  keys — {"rag_context", "metrics"} — and never the full state. metrics is
+  merged by the AgentState reducer.
+
 Teaching point:
   The query sent to rag_agent is DYNAMIC — built from filter_criteria.type
   and filter_criteria.description. This is NOT hardcoded to "accuracy".
@@ -21,12 +26,29 @@ Teaching point:
   filter_criteria.type = "performance" → query about performance bugs
   filter_criteria.type = "security"    → query about security vulnerabilities
   filter_criteria.type = "custom"      → query using filter_criteria.description directly
+
+  A list of criteria retrieves once per criterion (templates still come from
+  the precomputed cache) and merges the chunks into one rag_context, since
+  classification judges every criterion in the same prompt.
+
+Precomputed templates:
+  The four QUERY_TEMPLATES never change, so their RAGResults are computed once
+  (warm_template_cache(), run at API startup and by rag/ingest.py) and stored in
+  the local SQLite cache. Template-type requests then make no LLM, embedding or
+  Qdrant call. rag/ingest.py calls invalidate_template_cache() whenever it
+  rewrites the collection; a miss simply falls back to live retrieval.
 """
 
-from schemas.state import AgentState
-from agents.rag_agent import rag_agent
+import asyncio
+import logging
+
+from schemas.state import AgentState, FilterCriteria, RAGResult, criteria_list
+from agents.rag_agent import payload_text, rag_agent
+from utils.sqlite_cache import SQLiteCache
 import config
 
+logger = logging.getLogger(__name__)
+
 
 QUERY_TEMPLATES = {
     "accuracy":    "Definition, classification rules, and examples of accuracy-related QA issues, including incorrect outputs, wrong calculations, and misclassified data.",
@@ -36,24 +58,160 @@ QUERY_TEMPLATES = {
 }
 
 
-def rag_node(state: AgentState) -> AgentState:
+template_cache = SQLiteCache(namespace="rag_templates")
+
+
+def rag_node(state: AgentState) -> dict:
     """
     [Node 2] Retrieve QA taxonomy from Qdrant, grounded to filter_criteria type.
+    Template types are served from the precomputed cache when available.
     """
-    # TODO: implement RAG node
-    # Steps:
-    #   1. criteria = state["enriched_task"]["filter_criteria"]
-    #   2. Build query:
-    #        if criteria["type"] in QUERY_TEMPLATES → use template
-    #        else (type="custom") → use criteria["description"] directly
-    #   3. Call rag_agent.retrieve(
-    #          query=query,
-    #          collection=config.COLLECTION_QA_TAXONOMY,
-    #          k=config.RAG_TOP_K,
-    #      )
-    #   4. If result["results"] is empty:
-    #          log warning — proceed with LLM-only classification (degraded mode)
-    #          state["rag_context"] = None (classification node handles this)
-    #   5. Else: state["rag_context"] = result
-    #   6. Return state
-    raise NotImplementedError
+    criteria = criteria_list(state["enriched_task"].get("filter_criteria"))
+    if not criteria:
+        return {"rag_context": None}
+
+    retrieved = [_retrieve(c) for c in criteria]
+    return _rag_result(retrieved)
+
+
+async def arag_node(state: AgentState) -> dict:
+    """
+    [Node 2] Async twin of rag_node() — used by graph.ainvoke().
+    """
+    criteria = criteria_list(state["enriched_task"].get("filter_criteria"))
+    if not criteria:
+        return {"rag_context": None}
+
+    retrieved = await asyncio.gather(*[_aretrieve(c) for c in criteria])
+    return _rag_result(retrieved)
+
+
+def _retrieve(criteria: FilterCriteria) -> tuple[RAGResult, bool]:
+    """(result, served from the template cache) for one criterion."""
+    key = _template_key(criteria["type"])
+    result = template_cache.get(key) if key else None
+    if result is not None:
+        return result, True
+
+    result = rag_agent.retrieve(
+        query=_build_query(criteria),
+        collection=config.COLLECTION_QA_TAXONOMY,
+        k=config.RAG_TOP_K,
+    )
+    if key:
+        template_cache.set(key, result)
+    return result, False
+
+
+async def _aretrieve(criteria: FilterCriteria) -> tuple[RAGResult, bool]:
+    """Async twin of _retrieve()."""
+    key = _template_key(criteria["type"])
+    result = await asyncio.to_thread(template_cache.get, key) if key else None
+    if result is not None:
+        return result, True
+
+    result = await rag_agent.aretrieve(
+        query=_build_query(criteria),
+        collection=config.COLLECTION_QA_TAXONOMY,
+        k=config.RAG_TOP_K,
+    )
+    if key:
+        await asyncio.to_thread(template_cache.set, key, result)
+    return result, False
+
+
+def _rag_result(retrieved: list[tuple[RAGResult, bool]]) -> dict:
+    """Node delta; several criteria are merged into one context (the classifier sees all of them)."""
+    results = [r for r, _ in retrieved]
+    result = results[0] if len(results) == 1 else _merge(results)
+    precomputed = all(p for _, p in retrieved)
+    return {"rag_context": _accept(result), "metrics": {"rag_precomputed": precomputed}}
+
+
+def _merge(results: list[RAGResult]) -> RAGResult:
+    """One RAGResult for several criteria: chunks de-duplicated by text, lowest confidence kept."""
+    seen, merged = set(), []
+    for r in results:
+        for chunk in r["results"]:
+            if (text := payload_text(chunk)) not in seen:
+                seen.add(text)
+                merged.append(chunk)
+    return RAGResult(
+        query=" | ".join(r["query"] for r in results),
+        rewritten_query=" | ".join(r["rewritten_query"] for r in results),
+        results=merged,
+        confidence=min(r["confidence"] for r in results),
+        source_collection=results[0]["source_collection"],
+    )
+
+
+def warm_template_cache() -> int:
+    """Resolve every not-yet-cached QUERY_TEMPLATE against qa_taxonomy and store it."""
+    results = {
+        _template_key(t): rag_agent.retrieve(
+            query=QUERY_TEMPLATES[t],
+            collection=config.COLLECTION_QA_TAXONOMY,
+            k=config.RAG_TOP_K,
+        )
+        for t in _uncached_templates()
+    }
+    template_cache.set_many(results)
+    return len(results)
+
+
+async def awarm_template_cache() -> int:
+    """Async twin of warm_template_cache() — templates are resolved concurrently."""
+    types = await asyncio.to_thread(_uncached_templates)
+    results = await asyncio.gather(*[
+        rag_agent.aretrieve(
+            query=QUERY_TEMPLATES[t],
+            collection=config.COLLECTION_QA_TAXONOMY,
+            k=config.RAG_TOP_K,
+        )
+        for t in types
+    ])
+    await asyncio.to_thread(
+        template_cache.set_many, {_template_key(t): r for t, r in zip(types, results)}
+    )
+    return len(results)
+
+
+def invalidate_template_cache() -> None:
+    """Drop all precomputed template results — call whenever qa_taxonomy changes."""
+    template_cache.clear()
+
+
+def _uncached_templates() -> list[str]:
+    cached = template_cache.get_many([_template_key(t) for t in QUERY_TEMPLATES])
+    return [t for t in QUERY_TEMPLATES if _template_key(t) not in cached]
+
+
+def _template_key(criteria_type: str):
+    """Cache key for a template type (None for "custom"). Retrieval settings are part
+    of the key, so changing models or RAG tuning never serves stale results."""
+    if criteria_type not in QUERY_TEMPLATES:
+        return None
+    return ":".join([
+        criteria_type,
+        config.COLLECTION_QA_TAXONOMY,
+        str(config.RAG_TOP_K),
+        str(config.RAG_SCORE_THRESHOLD),
+        config.LLM_MODEL,
+        config.EMBEDDING_MODEL,
+    ])
+
+
+def _build_query(criteria: dict) -> str:
+    """Fixed template for known types; the criteria description for "custom"."""
+    return QUERY_TEMPLATES.get(criteria["type"], criteria["description"])
+
+
+def _accept(result: RAGResult):
+    """Empty retrieval → None, so classification runs in degraded (LLM-only) mode."""
+    if not result["results"]:
+        logger.warning(
+            "RAG returned no results for '%s' — classifying without reference knowledge",
+            result["query"],
+        )
+        return None
+    return result
@@ -15,31 +15,45 @@ Response schema (TDD §6.12):
     "duplicates_skipped": int,
     "slack_url":          string | null,
     "jira_urls":          list[string],
-    "issues_processed":   int,
+    "issues_processed":   int,            # every uploaded issue, duplicates included
+    "issues_clustered":   int,            # near-duplicates folded into a representative
     "issues_matched":     int,
+    "active_branches":    list[string],   # agent branches scheduled for this request
     "trace_id":           string,
-    "errors":             list[dict]
+    "errors":             list[dict],
+    "issue_clusters":     dict[str, list[str]]
   }
 """
 
 from schemas.state import AgentState
 
 
-def response_builder_node(state: AgentState) -> AgentState:
+def response_builder_node(state: AgentState) -> dict:
     """
     [Node 8] Build the final API response from aggregated state.
     """
-    # TODO: implement response builder node
-    # Steps:
-    #   1. intent         = state["enriched_task"]["intent"]
-    #   2. answer         = state.get("answer_result", {}).get("answer")
-    #   3. slack_url      = state.get("slack_result", {}).get("slack_url")
-    #   4. summary_posted = state.get("slack_result", {}).get("success", False)
-    #   5. jira_created   = state.get("jira_result", {}).get("created", [])
-    #   6. jira_urls      = [t["url"] for t in jira_created if "url" in t]
-    #   7. issues_matched = len(state.get("filtered_issues", []))
-    #   8. issues_processed = len(state.get("parsed_issues", []))
-    #   9. Build response dict from above
-    #  10. state["metrics"]["response"] = response
-    #  11. Return state
-    raise NotImplementedError
+    slack = state.get("slack_result") or {}
+    jira = state.get("jira_result") or {}
+    answer = state.get("answer_result") or {}
+    jira_created = jira.get("created", [])
+    clusters = state.get("issue_clusters") or {}
+    clustered = sum(len(members) - 1 for members in clusters.values())
+
+    response = {
+        "request_id":         state["request_id"],
+        "intent":             state["enriched_task"]["intent"],
+        "answer":             answer.get("answer"),
+        "summary_posted":     slack.get("success", False),
+        "tickets_created":    len(jira_created),
+        "duplicates_skipped": len(jira.get("duplicates", [])),
+        "slack_url":          slack.get("slack_url"),
+        "jira_urls":          [t["url"] for t in jira_created if "url" in t],
+        "issues_processed":   len(state.get("parsed_issues", [])) + clustered,
+        "issues_clustered":   clustered,
+        "issues_matched":     len(state.get("filtered_issues", [])),
+        "active_branches":    state["metrics"].get("active_branches", []),
+        "trace_id":           state["trace_id"],
+        "errors":             state.get("errors", []),
+        "issue_clusters":     clusters,
+    }
+    return {"metrics": {"response": response}}
@@ -5,7 +5,10 @@ Run after setup.py:
   python rag/ingest.py
 
 Reads all .md files from rag/knowledge/, splits them into chunks,
-embeds them with OpenAI, and upserts into the accuracy_taxonomy collection.
+embeds them with OpenAI, and upserts into the qa_taxonomy collection.
+
+After every ingest the precomputed QUERY_TEMPLATES results (nodes/rag_node.py)
+are invalidated and rebuilt, so template requests never see a stale taxonomy.
 
 Teaching point:
   The quality of what's in rag/knowledge/ directly controls classification quality.
@@ -22,6 +25,8 @@ from langchain_qdrant import QdrantVectorStore
 from qdrant_client import QdrantClient
 
 import config
+from nodes.rag_node import invalidate_template_cache, warm_template_cache
+from utils.embedding_cache import CachedEmbeddings
 
 
 KNOWLEDGE_DIR = Path(__file__).parent / "knowledge"
@@ -35,10 +40,11 @@ def ingest_knowledge_base(client: QdrantClient = None) -> int:
     Returns the number of chunks ingested.
     """
     client = client or QdrantClient(host=config.QDRANT_HOST, port=config.QDRANT_PORT)
-    embeddings = OpenAIEmbeddings(
+    # Cached: chunk embeddings computed here are reused when RAGAgent re-ranks them
+    embeddings = CachedEmbeddings(OpenAIEmbeddings(
         model=config.EMBEDDING_MODEL,
         openai_api_key=config.OPENAI_API_KEY,
-    )
+    ))
 
     # Load all markdown files from knowledge directory
     loader = DirectoryLoader(
@@ -63,10 +69,13 @@ def ingest_knowledge_base(client: QdrantClient = None) -> int:
         documents=chunks,
         embedding=embeddings,
         url=f"http://{config.QDRANT_HOST}:{config.QDRANT_PORT}",
-        collection_name=config.COLLECTION_ACCURACY_TAXONOMY,
+        collection_name=config.COLLECTION_QA_TAXONOMY,
     )
+    print(f"Ingested {len(chunks)} chunks into '{config.COLLECTION_QA_TAXONOMY}'")
 
-    print(f"Ingested {len(chunks)} chunks into '{config.COLLECTION_ACCURACY_TAXONOMY}'")
+    # Collection changed → precomputed template results are stale
+    invalidate_template_cache()
+    print(f"Precomputed {warm_template_cache()} template retrievals")
     return len(chunks)
 
 
@@ -1,4 +1,27 @@
-from typing import TypedDict, Optional
+from typing import Annotated, NotRequired, TypedDict, Optional, Union, get_type_hints
+
+
+# ------------------------------------------------------------------
+# Reducers — how LangGraph combines updates from nodes in the same step.
+# Nodes return only the keys they write (their delta), never the full state.
+# ------------------------------------------------------------------
+
+def append_list(left: Optional[list], right: Optional[list]) -> list:
+    """Reducer: every node's new entries are appended (errors)."""
+    return (left or []) + (right or [])
+
+
+def merge_dicts(left: Optional[dict], right: Optional[dict]) -> dict:
+    """
+    Reducer: parallel nodes each contribute their own keys (later writes win per key).
+    Nested dicts merge the same way, so metrics["nodes"] collects one entry per node.
+    """
+    merged = dict(left or {})
+    for key, value in (right or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            value = merge_dicts(merged[key], value)
+        merged[key] = value
+    return merged
 
 
 class FilterCriteria(TypedDict):
@@ -10,7 +33,8 @@ class FilterCriteria(TypedDict):
 class EnrichedTask(TypedDict):
     intent: str                              # "query" | "filter_and_report" | "analyze" | "update"
     requires_file_processing: bool
-    filter_criteria: Optional[FilterCriteria]
+    filter_criteria: Optional[Union[FilterCriteria, list[FilterCriteria]]]  # list → one pass, all criteria
+    criteria_match: NotRequired[str]         # "any" | "all" — how a list of criteria selects (default "any")
     requires_slack_post: bool
     requires_ticket_creation: bool
     requires_analysis: bool
@@ -23,13 +47,28 @@ class ParsedIssue(TypedDict):
     description: str
     steps: str
     severity: str
+    cluster_members: NotRequired[list[str]]   # ids of near-duplicates this issue represents
+
+
+class CriterionMatch(TypedDict):
+    type: str
+    matches: bool
+    confidence: float
 
 
 class ClassifiedIssue(TypedDict):
     issue_id: str
-    matches_criteria: bool
-    confidence: float
+    matches_criteria: bool                    # multi-criteria: any criterion matches
+    confidence: float                         # multi-criteria: best confidence among matches
     reason: str
+    criteria: NotRequired[list[CriterionMatch]]  # multi-criteria only, in filter_criteria order
+
+
+def criteria_list(criteria: Optional[Union[FilterCriteria, list[FilterCriteria]]]) -> list[FilterCriteria]:
+    """filter_criteria in list form: None → [], a single criterion → [criterion]."""
+    if criteria is None:
+        return []
+    return list(criteria) if isinstance(criteria, list) else [criteria]
 
 
 class RAGResult(TypedDict):
@@ -65,7 +104,7 @@ class AgentState(TypedDict):
     request_id: str
     trace_id: str
     instruction: str
-    raw_file_content: Optional[str]
+    raw_file_content: Optional[Union[str, bytes]]  # raw upload bytes; None once parsed
     file_name: Optional[str]
 
     # Enrichment
@@ -76,6 +115,7 @@ class AgentState(TypedDict):
 
     # File processing
     parsed_issues: list[ParsedIssue]
+    issue_clusters: dict[str, list[str]]  # representative id → all member ids (clusters > 1)
     classified_issues: list[ClassifiedIssue]
     filtered_issues: list[dict]          # ClassifiedIssue or ParsedIssue depending on path
 
@@ -90,5 +130,20 @@ class AgentState(TypedDict):
     answer_result: Optional[AnswerResult]
 
     # Output
-    errors: list[dict]
-    metrics: dict
+    errors: Annotated[list[dict], append_list]
+    metrics: Annotated[dict, merge_dicts]
+
+
+_REDUCERS = {
+    key: hint.__metadata__[0]
+    for key, hint in get_type_hints(AgentState, include_extras=True).items()
+    if hasattr(hint, "__metadata__")
+}
+
+
+def apply_update(state: AgentState, update: dict) -> AgentState:
+    """Fold a node's delta into state with the same reducers the graph uses (for direct callers)."""
+    for key, value in update.items():
+        reducer = _REDUCERS.get(key)
+        state[key] = reducer(state.get(key), value) if reducer else value
+    return state
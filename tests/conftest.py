@@ -0,0 +1,8 @@
+import os
+
+from dotenv import load_dotenv
+
+# Agent singletons build OpenAI clients at import time. Unit tests never reach the
+# network, so a placeholder key is enough when no real one is configured.
+load_dotenv()
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
@@ -67,3 +67,34 @@ def test_empty_result_sets_early_exit_flag():
     result = filter_node(make_state(SAMPLE, threshold=0.99))
     assert result["filtered_issues"] == []
     assert result["metrics"].get("early_exit") is True
+
+
+def multi_state(match: str) -> AgentState:
+    state = make_state([
+        {"issue_id": "1", "matches_criteria": True, "confidence": 0.9, "reason": "",
+         "criteria": [{"type": "accuracy", "matches": True, "confidence": 0.9},
+                      {"type": "security", "matches": True, "confidence": 0.7}]},
+        {"issue_id": "2", "matches_criteria": True, "confidence": 0.9, "reason": "",
+         "criteria": [{"type": "accuracy", "matches": False, "confidence": 0.8},
+                      {"type": "security", "matches": True, "confidence": 0.9}]},
+        {"issue_id": "3", "matches_criteria": True, "confidence": 0.5, "reason": "",
+         "criteria": [{"type": "accuracy", "matches": True, "confidence": 0.5},   # under 0.6
+                      {"type": "security", "matches": False, "confidence": 0.9}]},
+    ], threshold=0.6)
+    state["enriched_task"]["filter_criteria"] = [
+        state["enriched_task"]["filter_criteria"],
+        {"type": "security", "description": "Data exposure", "confidence_threshold": 0.6},
+    ]
+    state["enriched_task"]["criteria_match"] = match
+    return state
+
+
+def test_multi_criteria_any_keeps_issues_matching_one_criterion():
+    result = filter_node(multi_state("any"))
+    assert [i["issue_id"] for i in result["filtered_issues"]] == ["1", "2"]
+    assert [i["matched_criteria"] for i in result["filtered_issues"]] == [["accuracy", "security"], ["security"]]
+
+
+def test_multi_criteria_all_requires_every_criterion():
+    result = filter_node(multi_state("all"))
+    assert [i["issue_id"] for i in result["filtered_issues"]] == ["1"]
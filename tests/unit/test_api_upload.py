@@ -0,0 +1,59 @@
+"""Unit tests for upload handling in the API — parsed once, on arrival, with 4xx for bad files."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+with patch("jira.JIRA"):  # the graph imports the jira_agent singleton
+    import api.main as api
+
+
+@pytest.fixture
+def graph_run():
+    """Capture the initial state instead of running the graph."""
+    run = AsyncMock(return_value={"metrics": {"response": {"ok": True}}})
+    with patch.object(api.graph, "ainvoke", run), patch("api.main.arelease", AsyncMock()):
+        yield run
+
+
+@pytest.fixture
+def client():
+    return TestClient(api.app)  # no lifespan: no job workers or RAG warm-up needed
+
+
+def post(client, name: str, content: bytes):
+    return client.post("/qa-intake", data={"instruction": "Find accuracy issues"},
+                       files={"file": (name, content)})
+
+
+def test_upload_is_parsed_once_and_handed_to_the_graph(client, graph_run):
+    content = "﻿id,title,description\n1,Bug A,Wrong total\n".encode("utf-8")
+    with patch("api.main.parse_issues", wraps=api.parse_issues) as parse:
+        response = post(client, "issues.csv", content)
+
+    assert response.status_code == 200
+    assert parse.call_count == 1
+    state = graph_run.call_args.args[0]
+    assert state["raw_file_content"] is None
+    assert [i["id"] for i in state["parsed_issues"]] == ["1"]
+
+
+def test_too_many_issues_is_rejected_with_413(client, graph_run):
+    rows = "\n".join(f"{n},t{n},d{n}" for n in range(1, 300))  # MAX_ISSUES_PER_UPLOAD is 200
+    with patch("api.main.config.UPLOAD_CHUNK_SIZE", 256):  # parser sees the body in many chunks
+        response = post(client, "issues.csv", f"id,title,description\n{rows}".encode())
+    assert response.status_code == 413
+    assert not graph_run.called
+
+
+def test_malformed_csv_is_rejected_with_400(client, graph_run):
+    response = post(client, "issues.csv", b"title\nno id column")
+    assert response.status_code == 400
+    assert "Missing required fields" in response.json()["detail"]
+
+
+def test_corrupt_excel_is_rejected_with_400(client, graph_run):
+    response = post(client, "issues.xlsx", b"id,title,description\n1,renamed csv,x")
+    assert response.status_code == 400
+    assert "Unreadable Excel file" in response.json()["detail"]
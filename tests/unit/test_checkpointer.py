@@ -0,0 +1,177 @@
+"""Unit tests for checkpointing — a failed run resumes from its last completed node."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+with patch("jira.JIRA"):  # the agent singletons would otherwise connect to JIRA
+    import api.main as api
+    import graph.workflow as workflow
+from schemas.state import AgentState
+from utils.checkpointer import RunInProgressError, aclaim, arelease, build_checkpointer, run_config
+import config
+
+ISSUES = [{"id": "1", "title": "A", "description": "a", "steps": "", "severity": "high"}]
+
+
+def make_state() -> AgentState:
+    return {
+        "request_id": "req-1", "trace_id": "trace-001",
+        "instruction": "File tickets", "raw_file_content": b"id,title,description\n",
+        "file_name": "issues.csv",
+        "enriched_task": None, "rag_context": None, "parsed_issues": [], "issue_clusters": {},
+        "classified_issues": [], "filtered_issues": [],
+        "slack_query": None, "jira_query": None, "answer_query": None,
+        "slack_result": None, "jira_result": None, "answer_result": None,
+        "errors": [], "metrics": {},
+    }
+
+
+def tickets_only(state):
+    return {"enriched_task": {
+        "intent": "filter_and_report", "requires_file_processing": True,
+        "filter_criteria": None, "requires_slack_post": False,
+        "requires_ticket_creation": True, "requires_analysis": False,
+        "output_format": "bullet",
+    }}
+
+
+@pytest.fixture
+def checkpointed(tmp_path):
+    calls = {"enrichment": 0, "file_parser": 0}
+
+    def counted(name, update):
+        def node(state):
+            calls[name] += 1
+            return update(state)
+        return node
+
+    jira = MagicMock()
+    jira.arun = AsyncMock(side_effect=[
+        RuntimeError("JIRA 503"),
+        {"created": [{"issue_id": "1", "url": "u"}], "duplicates": [], "success": True, "error": None},
+    ])
+    with patch.object(workflow, "enrichment_node", counted("enrichment", tickets_only)), \
+         patch.object(workflow, "aenrichment_node", None), \
+         patch.object(workflow, "arag_node", None), \
+         patch.object(workflow, "rag_node", lambda s: {"rag_context": None}), \
+         patch.object(workflow, "file_parser_node", counted("file_parser", lambda s: {"parsed_issues": ISSUES})), \
+         patch.object(workflow, "aclustering_node", None), \
+         patch.object(workflow, "clustering_node", lambda s: {"issue_clusters": {}}), \
+         patch.object(workflow, "jira_agent", jira), \
+         patch("utils.checkpointer.config.CHECKPOINTING", True):
+        graph = workflow.build_graph(checkpointer=build_checkpointer(str(tmp_path / "checkpoints.sqlite3")))
+        yield graph, calls, jira
+
+
+def test_resume_reruns_only_the_failed_branch(checkpointed):
+    graph, calls, jira = checkpointed
+    config = run_config("req-1")
+
+    async def main():
+        with pytest.raises(RuntimeError, match="JIRA 503"):
+            await graph.ainvoke(make_state(), config=config)
+        interrupted = await graph.aget_state(config)
+        final = await graph.ainvoke(None, config=config)   # resume
+        return interrupted, final
+
+    interrupted, final = asyncio.run(main())
+    assert interrupted.next == ("jira_branch",)
+    assert calls == {"enrichment": 1, "file_parser": 1}   # not repeated by the resume
+    assert jira.arun.await_count == 2
+    assert final["metrics"]["response"]["tickets_created"] == 1
+
+
+def test_succeeded_run_releases_its_checkpoints(checkpointed):
+    graph, _, jira = checkpointed
+    jira.arun.side_effect = None
+    jira.arun.return_value = {"created": [], "duplicates": [], "success": True, "error": None}
+
+    async def main():
+        await graph.ainvoke(make_state(), config=run_config("req-2"))
+        before = await graph.aget_state(run_config("req-2"))
+        await arelease(graph, "req-2")
+        return before, await graph.aget_state(run_config("req-2"))
+
+    before, after = asyncio.run(main())
+    assert before.values and not before.next
+    assert after.values == {}
+
+
+@pytest.mark.parametrize("fail", [False, True])
+def test_stream_releases_checkpoints_unless_the_run_failed(fail):
+    async def astream(*args, **kwargs):
+        yield "updates", {"enrichment": {}}
+        if fail:
+            raise RuntimeError("classification exploded")
+        yield "updates", {"rag": {}}
+
+    async def main():
+        events = api._stream_events(make_state(), "ndjson")
+        first = await events.__anext__()
+        if fail:
+            await events.__anext__()  # the error event
+        await events.aclose()  # client went away before the run finished
+        return first
+
+    release = AsyncMock()
+    with patch.object(api.graph, "astream", astream), patch("api.main.arelease", release):
+        assert '"node": "enrichment"' in asyncio.run(main())
+    assert release.await_count == (0 if fail else 1)
+
+
+def test_failed_runs_are_swept_after_the_ttl_unless_claimed(checkpointed):
+    graph, _, jira = checkpointed
+    saver = graph.checkpointer
+    jira.arun.side_effect = RuntimeError("JIRA 503")
+
+    async def fail(request_id):
+        with pytest.raises(RuntimeError):
+            await graph.ainvoke(make_state(), config=run_config(request_id))
+
+    asyncio.run(fail("req-old"))
+    asyncio.run(fail("req-claimed"))
+    saver.conn.execute("UPDATE thread_activity SET updated_at = updated_at - 2 * ?", (config.CHECKPOINT_TTL,))
+    saver.conn.commit()
+    assert saver.claim("req-claimed", lease_seconds=60)
+
+    assert saver.sweep() == 1
+    assert asyncio.run(graph.aget_state(run_config("req-old"))).values == {}
+    assert asyncio.run(graph.aget_state(run_config("req-claimed"))).next == ("jira_branch",)
+
+
+def test_run_lease_is_exclusive_until_released_or_lapsed(tmp_path):
+    with patch("utils.checkpointer.config.CHECKPOINTING", True):
+        saver = build_checkpointer(str(tmp_path / "checkpoints.sqlite3"))
+    graph = MagicMock(checkpointer=saver)
+
+    async def main():
+        async with aclaim(graph, "req-1"):
+            assert saver.is_claimed("req-1")
+            with pytest.raises(RunInProgressError):
+                async with aclaim(graph, "req-1"):
+                    pass
+        assert not saver.is_claimed("req-1")
+        async with aclaim(graph, "req-1"):  # free again
+            pass
+
+    asyncio.run(main())
+    assert saver.claim("req-2", lease_seconds=-1)  # a holder that died: its lease already lapsed
+    assert saver.claim("req-2", lease_seconds=60)
+
+
+def test_resume_refuses_a_sync_run_still_in_progress(tmp_path):
+    from fastapi.testclient import TestClient
+
+    with patch("utils.checkpointer.config.CHECKPOINTING", True):
+        saver = build_checkpointer(str(tmp_path / "checkpoints.sqlite3"))
+    saver.claim("req-running", lease_seconds=60)  # e.g. held by another worker process
+    with patch.object(api.graph, "checkpointer", saver):
+        response = TestClient(api.app).post("/qa-intake/req-running/resume")
+    assert response.status_code == 409 and "still running" in response.json()["detail"]
+
+
+def test_checkpointing_can_be_disabled():
+    with patch("utils.checkpointer.config.CHECKPOINTING", False):
+        assert build_checkpointer() is None
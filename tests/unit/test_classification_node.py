@@ -0,0 +1,228 @@
+"""Unit tests for classification_node — concurrent batches, ordering, failure isolation."""
+
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from nodes.classification_node import classification_node, aclassification_node
+from schemas.state import AgentState
+from utils.sqlite_cache import SQLiteCache
+from utils.telemetry import instrument_node
+
+
+class FakeMessage:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FakeLLM:
+    """Answers each batch in reverse order; batches containing "BROKEN" never return JSON."""
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def _respond(self, prompt: str) -> FakeMessage:
+        if "BROKEN" in prompt:
+            return FakeMessage("not json")
+        issues = json.loads(prompt.split("Issues to classify:\n", 1)[1].split("\n\nReturn", 1)[0])
+        return FakeMessage(json.dumps([
+            {"issue_id": i["id"], "matches_criteria": True, "confidence": 0.9, "reason": "r"}
+            for i in reversed(issues)
+        ]))
+
+    def invoke(self, prompt):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.latency)
+        with self._lock:
+            self.active -= 1
+        return self._respond(prompt)
+
+    async def ainvoke(self, prompt):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.latency)
+        self.active -= 1
+        return self._respond(prompt)
+
+
+def make_state(issues: list) -> AgentState:
+    return {
+        "request_id": "test-001", "trace_id": "trace-001",
+        "instruction": "", "raw_file_content": None, "file_name": None,
+        "enriched_task": {
+            "intent": "filter_and_report",
+            "requires_file_processing": True,
+            "filter_criteria": {
+                "type": "accuracy",
+                "description": "Issues involving incorrect outputs",
+                "confidence_threshold": 0.6,
+            },
+            "requires_slack_post": False,
+            "requires_ticket_creation": False,
+            "requires_analysis": True,
+            "output_format": "bullet",
+        },
+        "rag_context": None, "parsed_issues": issues,
+        "classified_issues": [], "filtered_issues": [],
+        "slack_query": None, "jira_query": None, "answer_query": None,
+        "slack_result": None, "jira_result": None, "answer_result": None,
+        "errors": [], "metrics": {},
+    }
+
+
+def issues(n: int) -> list:
+    return [
+        {"id": str(i), "title": f"Bug {i}", "description": "...", "steps": "", "severity": "low"}
+        for i in range(1, n + 1)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path):
+    fresh = SQLiteCache(namespace="classification", path=str(tmp_path / "cache.sqlite3"))
+    with patch("nodes.classification_node.classification_cache", fresh):
+        yield fresh
+
+
+@pytest.fixture
+def llm():
+    fake = FakeLLM()
+    with patch("nodes.classification_node._build_llm", return_value=fake):
+        yield fake
+
+
+def test_batches_run_concurrently_and_keep_input_order(llm):
+    result = classification_node(make_state(issues(20)))
+    assert [i["issue_id"] for i in result["classified_issues"]] == [str(i) for i in range(1, 21)]
+    assert llm.peak > 1
+
+
+def test_async_batches_run_concurrently_and_keep_input_order(llm):
+    result = asyncio.run(aclassification_node(make_state(issues(20))))
+    assert [i["issue_id"] for i in result["classified_issues"]] == [str(i) for i in range(1, 21)]
+    assert llm.peak > 1
+
+
+def test_llm_calls_on_pool_threads_are_counted_for_the_node(llm):
+    update = instrument_node("classification", classification_node)(make_state(issues(20)))
+    record = update["metrics"]["nodes"]["classification"]
+    assert record["llm_calls"] == 4  # one per batch of 5, each made on a pool thread
+    assert record["prompt_tokens"] > 0
+
+
+def test_failed_batch_is_isolated(llm):
+    parsed = issues(10)
+    parsed[7]["title"] = "BROKEN"  # second batch of 5
+    result = classification_node(make_state(parsed))
+    assert [i["issue_id"] for i in result["classified_issues"]] == ["1", "2", "3", "4", "5"]
+    assert result["errors"][0]["issue_ids"] == ["6", "7", "8", "9", "10"]
+
+
+def test_second_run_is_served_from_cache(llm):
+    classification_node(make_state(issues(7)))
+    state = make_state(issues(7))
+    state["parsed_issues"][0]["title"] = "  BUG 1 "  # cosmetic change still hits
+    state["parsed_issues"][6]["description"] = "changed"
+
+    with patch.object(llm, "invoke", wraps=llm.invoke) as spy:
+        result = classification_node(state)
+
+    assert spy.call_count == 1  # only the changed issue goes to the LLM
+    assert result["metrics"]["classification_cache"] == {"hits": 6, "misses": 1}
+    assert [i["issue_id"] for i in result["classified_issues"]] == [str(i) for i in range(1, 8)]
+
+
+def test_cache_is_keyed_by_criteria(llm):
+    classification_node(make_state(issues(3)))
+    state = make_state(issues(3))
+    state["enriched_task"]["filter_criteria"]["type"] = "performance"
+    result = classification_node(state)
+    assert result["metrics"]["classification_cache"] == {"hits": 0, "misses": 3}
+
+
+def test_finished_batches_are_cached_before_the_node_returns(llm, cache):
+    parsed = issues(10)
+    parsed[7]["title"] = "BROKEN"
+    with patch("nodes.classification_node._result", side_effect=RuntimeError("process died")):
+        with pytest.raises(RuntimeError):
+            classification_node(make_state(parsed))
+    assert len(cache) == 5  # the batch that finished survives for the resumed run
+
+
+class MultiCriteriaLLM(FakeLLM):
+    """Answers MULTI_CLASSIFICATION_PROMPT: issue n matches accuracy when odd, security when n > 2."""
+
+    def _respond(self, prompt: str) -> FakeMessage:
+        assert "Classification targets" in prompt and "2. Type: security" in prompt
+        issues = json.loads(prompt.split("Issues to classify:\n", 1)[1].split("\n\nReturn", 1)[0])
+        return FakeMessage(json.dumps([
+            {"issue_id": i["id"], "reason": "r", "criteria": [
+                {"type": "accuracy", "matches": int(i["id"]) % 2 == 1, "confidence": 0.9},
+                {"type": "security", "matches": int(i["id"]) > 2, "confidence": 0.7},
+            ]}
+            for i in issues
+        ]))
+
+
+def test_several_criteria_are_classified_in_one_pass():
+    state = make_state(issues(10))
+    state["enriched_task"]["filter_criteria"] = [
+        state["enriched_task"]["filter_criteria"],
+        {"type": "security", "description": "Auth or data exposure", "confidence_threshold": 0.6},
+    ]
+    llm = MultiCriteriaLLM(latency=0)
+    with patch("nodes.classification_node._build_llm", return_value=llm), \
+         patch.object(llm, "invoke", wraps=llm.invoke) as spy:
+        result = classification_node(state)
+
+    assert spy.call_count == 2  # one call per batch of 5, not one per batch per criterion
+    first, second = result["classified_issues"][:2]
+    assert [c["matches"] for c in first["criteria"]] == [True, False]
+    assert first["matches_criteria"] is True and first["confidence"] == 0.9
+    assert second["matches_criteria"] is False and [c["type"] for c in second["criteria"]] == ["accuracy", "security"]
+
+
+class AxisEmbeddings:
+    """The criterion reference and "wrong" titles share axis 0; "typo" titles lie on axis 1."""
+
+    def embed_documents(self, texts):
+        def vector(text):
+            if text.startswith("accuracy:") or text.startswith("wrong"):
+                return [1.0, 0.0]
+            return [0.0, 1.0] if text.startswith("typo") else [1.0, 1.0]  # cosine 0.71 — uncertain
+        return [vector(t) for t in texts]
+
+    async def aembed_documents(self, texts):
+        return self.embed_documents(texts)
+
+
+def test_prefilter_sends_only_the_uncertain_band_to_the_llm(llm, cache):
+    parsed = issues(12)
+    for issue in parsed[:5]:
+        issue["title"] = f"wrong {issue['id']}"
+    for issue in parsed[5:10]:
+        issue["title"] = f"typo {issue['id']}"
+    with patch("nodes.classification_prefilter.rag_agent.embeddings", AxisEmbeddings()), \
+         patch("config.CLASSIFICATION_PREFILTER", True), \
+         patch("config.CLASSIFICATION_PREFILTER_LOW", 0.2), \
+         patch("config.CLASSIFICATION_PREFILTER_HIGH", 0.9), \
+         patch.object(llm, "invoke", wraps=llm.invoke) as spy:
+        result = classification_node(make_state(parsed))
+
+    assert spy.call_count == 1  # issues 11 and 12 only
+    assert result["metrics"]["classification_prefilter"] == {
+        "accepted": 5, "rejected": 5, "uncertain": 2, "llm_calls_saved": 2,
+    }
+    classified = result["classified_issues"]
+    assert [i["issue_id"] for i in classified] == [str(i) for i in range(1, 13)]
+    assert [i["matches_criteria"] for i in classified[:10]] == [True] * 5 + [False] * 5
+    assert classified[0]["reason"].startswith("Embedding pre-filter")
+    assert len(cache) == 2  # pre-filter decisions are not cached as LLM answers
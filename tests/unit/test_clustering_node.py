@@ -0,0 +1,80 @@
+"""Unit tests for clustering_node — intra-upload near-duplicate grouping."""
+
+from unittest.mock import MagicMock, patch
+
+from nodes.clustering_node import clustering_node, cluster_issues
+from schemas.state import AgentState
+
+# Hand-made unit-ish vectors: 1 & 3 are near-identical, 2 is unrelated
+VECTORS = {
+    "Cart total wrong Subtotal off by one cent": [1.0, 0.0, 0.0],
+    "Login slow Takes 10s to log in":            [0.0, 1.0, 0.0],
+    "Cart total incorrect Subtotal is off by 1c": [0.99, 0.05, 0.0],
+}
+
+
+def make_issue(issue_id: str, title: str, description: str) -> dict:
+    return {"id": issue_id, "title": title, "description": description,
+            "steps": "", "severity": "medium"}
+
+
+def make_state(issues: list[dict]) -> AgentState:
+    return {
+        "request_id": "test-001", "trace_id": "trace-001",
+        "instruction": "", "raw_file_content": None, "file_name": None,
+        "enriched_task": None, "rag_context": None,
+        "parsed_issues": issues, "issue_clusters": {},
+        "classified_issues": [], "filtered_issues": [],
+        "slack_query": None, "jira_query": None, "answer_query": None,
+        "slack_result": None, "jira_result": None, "answer_result": None,
+        "errors": [], "metrics": {},
+    }
+
+
+def fake_embeddings():
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = lambda texts: [VECTORS[t] for t in texts]
+    return embeddings
+
+
+ISSUES = [
+    make_issue("1", "Cart total wrong", "Subtotal off by one cent"),
+    make_issue("2", "Login slow", "Takes 10s to log in"),
+    make_issue("3", "Cart total incorrect", "Subtotal is off by 1c"),
+]
+
+
+def test_near_duplicates_collapse_to_first_representative():
+    embeddings = fake_embeddings()
+    with patch("nodes.clustering_node.rag_agent.embeddings", embeddings):
+        result = clustering_node(make_state(list(ISSUES)))
+
+    assert [i["id"] for i in result["parsed_issues"]] == ["1", "2"]
+    assert result["parsed_issues"][0]["cluster_members"] == ["3"]
+    assert "cluster_members" not in result["parsed_issues"][1]
+    assert result["issue_clusters"] == {"1": ["1", "3"]}
+    embeddings.embed_documents.assert_called_once()
+
+
+def test_embedding_failure_passes_issues_through():
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = RuntimeError("API down")
+    with patch("nodes.clustering_node.rag_agent.embeddings", embeddings):
+        result = clustering_node(make_state(list(ISSUES)))
+
+    assert result == {"issue_clusters": {}}  # parsed_issues left untouched
+
+
+def test_single_issue_skips_embedding():
+    embeddings = fake_embeddings()
+    with patch("nodes.clustering_node.rag_agent.embeddings", embeddings):
+        result = clustering_node(make_state([ISSUES[0]]))
+
+    embeddings.embed_documents.assert_not_called()
+    assert result["issue_clusters"] == {}
+
+
+def test_cluster_issues_each_index_assigned_once():
+    vectors = [[1, 0], [1, 0], [0, 1], [0.999, 0.01], [0, 1]]
+    clusters = cluster_issues(vectors, threshold=0.95)
+    assert clusters == [[0, 1, 3], [2, 4]]
@@ -0,0 +1,119 @@
+"""Unit tests for the two-tier embedding cache."""
+
+import asyncio
+import multiprocessing
+import threading
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from utils.embedding_cache import CachedEmbeddings, EmbeddingStore
+
+
+class CountingEmbeddings(Embeddings):
+    model = "fake-embedding"
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0, 0.5] for t in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+@pytest.fixture
+def inner():
+    return CountingEmbeddings()
+
+
+def make(inner, tmp_path, memory_items=100) -> CachedEmbeddings:
+    return CachedEmbeddings(inner, store=EmbeddingStore(str(tmp_path), memory_items=memory_items))
+
+
+def test_only_misses_are_embedded_in_one_call(inner, tmp_path):
+    cached = make(inner, tmp_path)
+    cached.embed_documents(["a", "bb"])
+    vectors = cached.embed_documents(["a", "ccc", "bb", "ccc", "dddd"])
+    assert inner.calls == [["a", "bb"], ["ccc", "dddd"]]
+    assert [v[0] for v in vectors] == [1.0, 3.0, 2.0, 3.0, 4.0]
+
+
+def test_disk_tier_survives_new_process(inner, tmp_path):
+    make(inner, tmp_path).embed_documents(["a", "bb"])
+    fresh = make(inner, tmp_path)
+    assert fresh.embed_query("bb") == [2.0, 1.0, 0.5]
+    assert len(inner.calls) == 1
+    assert fresh.stats()["hits_disk"] == 1
+
+
+def test_memory_lru_falls_back_to_disk(inner, tmp_path):
+    cached = make(inner, tmp_path, memory_items=2)
+    cached.embed_documents(["a", "bb", "ccc"])
+    assert cached.stats()["memory_items"] == 2
+    assert cached.embed_query("a")[0] == 1.0
+    assert cached.stats()["hits_disk"] == 1
+    assert len(inner.calls) == 1
+
+
+def test_async_path_and_stats(inner, tmp_path):
+    cached = make(inner, tmp_path)
+    asyncio.run(cached.aembed_documents(["a", "bb"]))
+    asyncio.run(cached.aembed_query("a"))
+    stats = cached.stats()
+    assert stats["disk_items"] == 2
+    assert stats["misses"] == 2 and stats["hits_memory"] == 1
+    assert stats["hit_rate"] == pytest.approx(1 / 3, abs=1e-4)
+
+
+def test_async_path_does_disk_io_off_the_event_loop(inner, tmp_path):
+    store = EmbeddingStore(str(tmp_path))
+    threads = []
+    for name in ("get_many", "put_many"):
+        method = getattr(store, name)
+        setattr(store, name, lambda *args, _m=method: threads.append(threading.current_thread()) or _m(*args))
+    cached = CachedEmbeddings(inner, store=store)
+
+    asyncio.run(cached.aembed_documents(["a", "bb"]))
+    asyncio.run(cached.aembed_query("a"))
+    assert len(threads) == 3 and threading.main_thread() not in threads
+
+
+def test_key_includes_model(inner, tmp_path):
+    store = EmbeddingStore(str(tmp_path))
+    CachedEmbeddings(inner, store=store, model="m1").embed_query("a")
+    CachedEmbeddings(inner, store=store, model="m2").embed_query("a")
+    assert len(inner.calls) == 2
+
+
+def test_reader_sees_rows_appended_by_another_process(inner, tmp_path):
+    reader, writer = make(inner, tmp_path), make(inner, tmp_path)
+    reader.embed_documents(["a", "bb"])
+    reader.store._memory.clear()
+    reader.embed_query("a")  # map taken with two rows
+    writer.embed_documents(["ccc"])
+    assert reader.embed_query("ccc") == [3.0, 1.0, 0.5]
+    assert len(inner.calls) == 2  # served from the other store's row, not re-embedded
+
+
+def _append_keys(directory: str, worker: int) -> None:
+    store = EmbeddingStore(directory)
+    for n in range(50):
+        store.put_many({f"{worker}-{n}": np.full(8, worker * 100 + n, dtype=np.float32)})
+
+
+def test_concurrent_process_appends_keep_rows_aligned(tmp_path):
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_append_keys, args=(str(tmp_path), w)) for w in range(4)]
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join()
+
+    keys = [f"{w}-{n}" for w in range(4) for n in range(50)]
+    found = EmbeddingStore(str(tmp_path)).get_many(keys)
+    assert len(found) == 200
+    assert all(found[f"{w}-{n}"][0] == w * 100 + n for w in range(4) for n in range(50))
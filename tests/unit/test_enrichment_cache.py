@@ -0,0 +1,115 @@
+"""Unit tests for the enrichment contract cache — exact, paraphrase, eviction, invalidation."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from nodes.enrichment_node import enrichment_node
+from utils.enrichment_cache import EnrichmentCache, normalize_instruction
+from utils.llm_limiter import LLMLimiter
+from utils.sqlite_cache import SQLiteCache
+
+CONTRACT = {"intent": "analyze", "requires_file_processing": True, "filter_criteria": None,
+            "requires_slack_post": False, "requires_ticket_creation": False,
+            "requires_analysis": True, "output_format": "detailed"}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EnrichmentCache(
+        prompt="prompt v1", similarity_threshold=0.95, max_entries=2,
+        exact_store=SQLiteCache("enrichment", path=str(tmp_path / "c.sqlite3")),
+    )
+
+
+def test_normalization_ignores_case_whitespace_and_punctuation():
+    assert normalize_instruction("  Find accuracy issues,\tand create JIRA tickets! ") == \
+        normalize_instruction("find accuracy issues and create jira tickets")
+
+
+def test_exact_hit_after_normalization(cache):
+    cache.store("Analyze the payment bugs.", CONTRACT)
+    assert cache.lookup_exact("analyze   the PAYMENT bugs") == CONTRACT
+    assert cache.lookup_exact("analyze the login bugs") is None
+
+
+def test_paraphrase_hit_respects_threshold(cache):
+    cache.store("Analyze the payment bugs", CONTRACT, [1.0, 0.0])
+    assert cache.lookup_similar([0.99, 0.05]) == CONTRACT
+    assert cache.lookup_similar([0.7, 0.7]) is None
+
+
+def test_least_recently_used_paraphrase_is_evicted(cache):
+    cache.store("a", {**CONTRACT, "intent": "a"}, [1.0, 0.0, 0.0])
+    cache.store("b", {**CONTRACT, "intent": "b"}, [0.0, 1.0, 0.0])
+    assert cache.lookup_similar([1.0, 0.0, 0.0])["intent"] == "a"   # refresh "a"
+    cache.store("c", {**CONTRACT, "intent": "c"}, [0.0, 0.0, 1.0])   # evicts "b"
+    assert cache.lookup_similar([0.0, 1.0, 0.0]) is None
+    assert cache.lookup_similar([1.0, 0.0, 0.0])["intent"] == "a"
+
+
+def test_paraphrases_expire_after_ttl(cache):
+    cache.ttl_seconds = 10
+    with patch("utils.enrichment_cache.time.time", return_value=1000.0):
+        cache.store("a", CONTRACT, [1.0, 0.0])
+    with patch("utils.enrichment_cache.time.time", return_value=1011.0):
+        assert cache.lookup_similar([1.0, 0.0]) is None
+
+
+def test_prompt_or_model_change_invalidates(cache):
+    cache.store("Analyze the payment bugs", CONTRACT, [1.0, 0.0])
+    with patch("utils.enrichment_cache.config.LLM_MODEL", "gpt-4o-mini"):
+        assert cache.lookup_exact("Analyze the payment bugs") is None
+        assert cache.lookup_similar([1.0, 0.0]) is None
+    cache.prompt = "prompt v2"
+    assert cache.lookup_exact("Analyze the payment bugs") is None
+
+
+def test_node_serves_repeats_and_paraphrases_without_the_llm(cache):
+    llm = MagicMock()
+    llm.invoke.return_value = MagicMock(content=json.dumps(CONTRACT))
+    vectors = {"Anything odd in the payment flow?": [1.0, 0.0],
+               "Anything odd in the payments flow": [0.99, 0.02]}
+    embeddings = MagicMock(embed_query=lambda text: vectors.get(text, [0.0, 1.0]))
+
+    def run(instruction):
+        state = {"instruction": instruction, "raw_file_content": b"x", "file_name": "f.csv", "errors": []}
+        return enrichment_node(state)["metrics"]["enrichment_path"]
+
+    with patch("nodes.enrichment_node._build_llm", return_value=llm), \
+         patch("nodes.enrichment_node.enrichment_cache", cache), \
+         patch("nodes.enrichment_node.rag_agent.embeddings", embeddings):
+        paths = [run("Anything odd in the payment flow?"),
+                 run("anything odd in the PAYMENT flow"),
+                 run("Anything odd in the payments flow")]
+
+    assert paths == ["llm", "cache_exact", "cache_semantic"]
+    assert llm.invoke.call_count == 1
+
+
+@pytest.mark.parametrize("bad", [
+    {k: v for k, v in CONTRACT.items() if k != "intent"},
+    {**CONTRACT, "requires_analysis": "yes"},
+    {**CONTRACT, "filter_criteria": {"type": "accuracy", "description": "Wrong totals"}},
+    [CONTRACT],
+])
+def test_invalid_contract_is_retried_and_never_cached(cache, bad):
+    llm = MagicMock()
+    llm.invoke.side_effect = [MagicMock(content=json.dumps(bad)), MagicMock(content=json.dumps(CONTRACT))]
+    state = {"instruction": "Anything odd in the payment flow?", "raw_file_content": b"x",
+             "file_name": "f.csv", "errors": []}
+
+    with patch("nodes.enrichment_node._build_llm", return_value=llm), \
+         patch("nodes.enrichment_node.enrichment_cache", cache), \
+         patch("nodes.enrichment_node._embed", return_value=None), \
+         patch("utils.llm_limiter.llm_limiter", LLMLimiter(8, 100_000, 100_000_000)):
+        assert enrichment_node(state)["enriched_task"] == CONTRACT
+        llm.invoke.side_effect = [MagicMock(content=json.dumps(bad))] * 2
+        state["instruction"] = "Anything odd in the login flow?"
+        with pytest.raises(ValueError):
+            enrichment_node(state)
+
+    assert llm.invoke.call_count == 4
+    assert cache.lookup_exact("Anything odd in the login flow?") is None
+    assert "Invalid task contract" in state["errors"][0]["error"]
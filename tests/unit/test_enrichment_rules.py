@@ -0,0 +1,85 @@
+"""Unit tests for the enrichment fast path — rule contracts and LLM fallback."""
+
+import asyncio
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from nodes.enrichment_node import aenrichment_node, enrichment_node
+from nodes.enrichment_rules import rule_based_contract
+from utils.enrichment_cache import EnrichmentCache
+from utils.sqlite_cache import SQLiteCache
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "enrichment_instructions.json"
+LABELLED = json.loads(FIXTURE.read_text())
+
+
+def labelled_fields(contract: dict) -> dict:
+    criteria = contract["filter_criteria"] or {}
+    return {
+        "intent": contract["intent"],
+        "requires_file_processing": contract["requires_file_processing"],
+        "filter_type": criteria.get("type"),
+        "confidence_threshold": criteria.get("confidence_threshold"),
+        "requires_slack_post": contract["requires_slack_post"],
+        "requires_ticket_creation": contract["requires_ticket_creation"],
+        "requires_analysis": contract["requires_analysis"],
+        "output_format": contract["output_format"],
+    }
+
+
+@pytest.mark.parametrize("row", LABELLED, ids=lambda r: r["instruction"][:40])
+def test_rule_contracts_match_labels_when_answered(row):
+    contract = rule_based_contract(row["instruction"], row["has_file"])
+    if contract is not None:
+        assert labelled_fields(contract) == row["expected"]
+
+
+def test_rules_cover_most_of_the_labelled_set():
+    answered = [r for r in LABELLED if rule_based_contract(r["instruction"], r["has_file"])]
+    assert len(answered) / len(LABELLED) >= 0.6
+
+
+@pytest.mark.parametrize("instruction, has_file", [
+    ("Find issues in the checkout flow and post to Slack", True),   # custom criteria
+    ("Find accuracy and performance issues and summarize", True),  # two filter types
+    ("Look at this", True),                                        # no action requested
+    ("Post the accuracy bugs to Slack", False),                    # action without a file
+    ("What are the security issues in this file?", False),         # refers to a missing file
+])
+def test_low_confidence_instructions_fall_back(instruction, has_file):
+    assert rule_based_contract(instruction, has_file) is None
+
+
+def make_state(instruction: str, file_name=None) -> dict:
+    return {"instruction": instruction, "raw_file_content": None,
+            "file_name": file_name, "errors": [], "metrics": {}}
+
+
+def test_fast_path_skips_the_llm():
+    with patch("nodes.enrichment_node._build_llm", side_effect=AssertionError("LLM called")):
+        result = enrichment_node(make_state("Find slow issues and create tickets", "issues.csv"))
+        aresult = asyncio.run(aenrichment_node(make_state("What are common performance bugs?")))
+
+    assert result["enriched_task"]["filter_criteria"]["type"] == "performance"
+    assert result["metrics"] == {"enrichment_path": "rules"}
+    assert aresult["enriched_task"]["intent"] == "query"
+
+
+def test_fallback_and_disabled_fast_path_use_the_llm(tmp_path):
+    class FakeLLM:
+        def invoke(self, prompt):
+            return type("M", (), {"content": json.dumps(rule_based_contract("Analyze the issues", True))})()
+
+    cache = EnrichmentCache(prompt="p", exact_store=SQLiteCache("enrichment", path=str(tmp_path / "c.sqlite3")))
+    with patch("nodes.enrichment_node._build_llm", return_value=FakeLLM()), \
+         patch("nodes.enrichment_node.enrichment_cache", cache), \
+         patch("nodes.enrichment_node.rag_agent.embeddings", MagicMock(embed_query=MagicMock(side_effect=RuntimeError))):
+        fallback = enrichment_node(make_state("Anything weird with payments?", "issues.csv"))
+        with patch("nodes.enrichment_node.config.ENRICHMENT_FAST_PATH", False):
+            disabled = enrichment_node(make_state("Summarize all issues", "issues.csv"))
+
+    assert fallback["metrics"] == {"enrichment_path": "llm"}
+    assert disabled["metrics"] == {"enrichment_path": "llm"}
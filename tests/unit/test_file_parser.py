@@ -1,7 +1,9 @@
 """Unit tests for file_parser_node."""
 
+import io
+
 import pytest
-from nodes.file_parser_node import file_parser_node
+from nodes.file_parser_node import IssueLimitError, file_parser_node, iter_issues, parse_issues
 from schemas.state import AgentState
 
 
@@ -39,3 +41,52 @@ def test_parse_csv_fills_optional_fields():
 def test_unsupported_format_raises():
     with pytest.raises(ValueError):
         file_parser_node(make_state("issues.pdf", "content"))
+
+
+def test_parse_csv_from_raw_bytes():
+    csv_bytes = "id,title,description\n1,Café total,Wrong total\n".encode("utf-8")
+    result = file_parser_node(make_state("issues.csv", csv_bytes))
+    assert result["parsed_issues"][0]["title"] == "Café total"
+    assert result["raw_file_content"] is None
+
+
+def test_issue_limit_enforced():
+    rows = "\n".join(f"Issue {n}" for n in range(4))
+    assert len(parse_issues(rows, "issues.txt", max_issues=4)) == 4
+    with pytest.raises(IssueLimitError):
+        parse_issues(rows + "\nIssue 5", "issues.txt", max_issues=4)
+
+
+def test_parse_excel_from_raw_bytes():
+    from openpyxl import Workbook
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["ID", "Title", "Description", "Severity"])
+    sheet.append([1, "Bug A", "Wrong total", None])
+    sheet.append([None, None, None, None])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    result = file_parser_node(make_state("issues.xlsx", buffer.getvalue()))
+    assert result["parsed_issues"] == [
+        {"id": "1", "title": "Bug A", "description": "Wrong total", "steps": "", "severity": ""}
+    ]
+
+
+def test_iter_issues_is_lazy():
+    rows = "id,title,description\n1,A,a\n2,B,b\n3,C,c"
+    issues = iter_issues(rows, "issues.csv", max_issues=1)
+    assert next(issues)["id"] == "1"
+    with pytest.raises(IssueLimitError):
+        next(issues)
+
+
+def test_parse_csv_strips_utf8_bom():
+    content = "﻿id,title,description\n1,Bug A,Wrong total".encode("utf-8")  # Excel "CSV UTF-8"
+    assert parse_issues(content, "issues.csv")[0]["id"] == "1"
+
+
+def test_issues_parsed_on_upload_pass_through():
+    state = make_state("issues.csv", None)
+    state["parsed_issues"] = [{"id": "1", "title": "A", "description": "a", "steps": "", "severity": ""}]
+    assert file_parser_node(state) == {}
@@ -0,0 +1,203 @@
+"""Unit tests for JiraAgent — bulk duplicate detection and ticket creation."""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+with patch("jira.JIRA"):  # the module-level singleton would otherwise connect to JIRA
+    from agents.jira_agent import JiraAgent
+from utils.llm_limiter import LLMLimiter
+import config
+
+
+ISSUES = [
+    {"id": "1", "title": "Revenue total incorrect", "description": "Shows $1200"},
+    {"id": "2", "title": "Wrong user data shown", "description": "Another user's email"},
+    {"id": "3", "title": "Fraud model wrong label", "description": "Legit flagged"},
+]
+
+TICKET = json.dumps({
+    "summary": "Bug", "description": "d", "steps": "s",
+    "expected": "e", "actual": "a", "priority": "P2",
+})
+
+
+def jira_issue(key: str) -> SimpleNamespace:
+    return SimpleNamespace(key=key, permalink=lambda: f"https://jira.example.com/{key}")
+
+
+def jira_client():
+    client = MagicMock()
+    client.created = 0
+
+    def create_issues(field_list, prefetch=True):
+        response = []
+        for fields in field_list:
+            client.created += 1
+            response.append({"status": "Success", "issue": jira_issue(f"QAIA-{client.created}"),
+                             "error": None, "input_fields": fields})
+        return response
+
+    client.create_issues.side_effect = create_issues
+    return client
+
+
+@pytest.fixture
+def rag():
+    with patch("agents.jira_agent.rag_agent") as mock:
+        mock.search_batch.return_value = (
+            [[], [{"id": "p", "score": 0.95, "payload": {"ticket_key": "QAIA-7"}}], [{"score": 0.5, "payload": {}}]],
+            [[0.1], [0.2], [0.3]],
+        )
+        yield mock
+
+
+@pytest.fixture
+def agent():
+    llm = MagicMock()
+    llm.invoke.return_value = SimpleNamespace(content=TICKET)
+    return JiraAgent(jira_client=jira_client(), llm=llm)
+
+
+def test_dedup_is_one_bulk_search(rag, agent):
+    agent.run(ISSUES, "Create tickets")
+    rag.search_batch.assert_called_once()
+    assert rag.search_batch.call_args.kwargs["texts"] == [
+        "Revenue total incorrect Shows $1200",
+        "Wrong user data shown Another user's email",
+        "Fraud model wrong label Legit flagged",
+    ]
+
+
+def test_only_non_duplicates_get_tickets(rag, agent):
+    result = agent.run(ISSUES, "Create tickets")
+    assert [d["issue_id"] for d in result["duplicates"]] == ["2"]
+    assert result["duplicates"][0]["existing"] == {"ticket_key": "QAIA-7"}
+    assert sorted(c["issue_id"] for c in result["created"]) == ["1", "3"]
+    agent.client.create_issues.assert_called_once()  # one bulk request for both tickets
+    assert len(agent.client.create_issues.call_args.kwargs["field_list"]) == 2
+    assert result["success"] is True
+
+
+def test_new_tickets_are_indexed_with_the_dedup_vector(rag, agent):
+    agent.run(ISSUES, "Create tickets")
+    rag.client.upsert.assert_called_once()  # one bulk upsert
+    assert sorted(p.vector[0] for p in rag.client.upsert.call_args.kwargs["points"]) == [0.1, 0.3]
+
+
+def test_jira_failure_is_reported_per_issue(rag, agent):
+    agent.client.create_issues.side_effect = RuntimeError("503")
+    result = agent.run(ISSUES, "Create tickets")
+    assert result["created"] == [] and result["success"] is False
+    assert "1: 503" in result["error"] and "3: 503" in result["error"]
+    assert agent.client.create_issues.call_count == config.MAX_TOOL_RETRIES + 1
+
+
+def test_partial_bulk_failure_maps_to_issue_and_retries_only_it(rag, agent):
+    create = agent.client.create_issues.side_effect
+    attempts = []
+
+    def flaky(field_list, prefetch=True):
+        attempts.append(len(field_list))
+        if len(attempts) == 1:  # second element rejected on the first attempt only
+            ok = create(field_list[:1])
+            return ok + [{"status": "Error", "error": {"priority": "invalid"},
+                          "issue": None, "input_fields": field_list[1]}]
+        return create(field_list)
+
+    agent.client.create_issues.side_effect = flaky
+    result = agent.run(ISSUES, "Create tickets")
+    assert attempts == [2, 1]
+    assert sorted(c["issue_id"] for c in result["created"]) == ["1", "3"]
+    assert result["success"] is True
+
+
+def test_element_error_that_persists_is_reported_by_issue_id(rag, agent):
+    def reject_second(field_list, prefetch=True):
+        return [{"status": "Error", "error": {"priority": "invalid"}, "issue": None, "input_fields": f}
+                if n == len(field_list) - 1 else
+                {"status": "Success", "issue": jira_issue(f"QAIA-{n}"), "error": None, "input_fields": f}
+                for n, f in enumerate(field_list)]
+
+    agent.client.create_issues.side_effect = reject_second
+    result = agent.run(ISSUES, "Create tickets")
+    assert result["success"] is False
+    assert result["error"].startswith("3: ") and "priority" in result["error"]
+
+
+@pytest.mark.parametrize("bad", [{"summary": "Bug", "description": "no priority"}, ["not", "an", "object"]])
+def test_malformed_ticket_fails_only_its_issue_and_is_not_retried(rag, agent, bad):
+    agent.llm.invoke.side_effect = lambda prompt: SimpleNamespace(
+        content=json.dumps(bad) if "Fraud model" in prompt else TICKET)
+    result = agent.run(ISSUES, "Create tickets")
+    assert [c["issue_id"] for c in result["created"]] == ["1"]
+    assert result["success"] is False and result["error"].startswith("3: Invalid ticket from LLM")
+    agent.client.create_issues.assert_called_once()
+    assert len(agent.client.create_issues.call_args.kwargs["field_list"]) == 1
+
+
+LATENCY = 0.1
+
+
+class SlowLLM:
+    """Every completion takes LATENCY seconds."""
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(LATENCY)
+        return SimpleNamespace(content=TICKET)
+
+
+def slow_jira_client():
+    client = jira_client()
+    create = client.create_issues.side_effect
+
+    def blocking_create(field_list, prefetch=True):
+        time.sleep(LATENCY)  # the `jira` library blocks
+        return create(field_list)
+
+    client.create_issues.side_effect = blocking_create
+    return client
+
+
+def test_arun_creates_five_tickets_in_about_one_ticket_latency(rag):
+    issues = [{"id": str(n), "title": f"Bug {n}", "description": "d"} for n in range(5)]
+    rag.asearch_batch = AsyncMock(return_value=([[]] * 5, [[0.1]] * 5))
+    rag.async_client.upsert = AsyncMock()
+    agent = JiraAgent(jira_client=slow_jira_client(), llm=SlowLLM())
+    limiter = LLMLimiter(max_concurrency=8, rpm=100_000, tpm=100_000_000)
+
+    async def main():
+        start = time.perf_counter()
+        result = await agent.arun(issues, "Create tickets")  # inside a running loop
+        return result, time.perf_counter() - start
+
+    with patch("utils.llm_limiter.llm_limiter", limiter):
+        result, elapsed = asyncio.run(main())
+
+    per_ticket = 2 * LATENCY                     # one completion + one (bulk) JIRA call
+    assert len(result["created"]) == 5 and result["success"] is True
+    assert elapsed < 1.5 * per_ticket            # sequential would be 5 × per_ticket
+    assert len(rag.async_client.upsert.call_args.kwargs["points"]) == 5  # one bulk upsert
+    agent.client.create_issues.assert_called_once()
+
+
+def test_resumed_request_reuses_its_ledgered_tickets(rag, agent, tmp_path):
+    from utils.sqlite_cache import SQLiteCache
+
+    ledger = SQLiteCache(namespace="jira_created", path=str(tmp_path / "ledger.sqlite3"))
+    with patch("agents.jira_agent.ticket_ledger", ledger):
+        first = agent.run(ISSUES, "Create tickets", request_id="req-1")
+        rag.search_batch.return_value = (  # only issue 2 (a duplicate) is still searched
+            [[{"id": "p", "score": 0.95, "payload": {"ticket_key": "QAIA-7"}}]], [[0.2]],
+        )
+        again = agent.run(ISSUES, "Create tickets", request_id="req-1")
+
+    assert len(ledger) == 2
+    assert agent.client.create_issues.call_count == 1     # nothing filed twice
+    assert rag.search_batch.call_args.kwargs["texts"] == ["Wrong user data shown Another user's email"]
+    assert sorted(c["key"] for c in again["created"]) == sorted(c["key"] for c in first["created"])
+    assert [d["issue_id"] for d in again["duplicates"]] == ["2"]
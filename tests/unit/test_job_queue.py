@@ -0,0 +1,149 @@
+"""Unit tests for async jobs — pluggable stores, background runs, partial results, backpressure."""
+
+import asyncio
+import time
+
+import pytest
+
+from utils.job_queue import JobQueue, QueueFullError
+from utils.job_store import InMemoryJobStore, SQLiteJobStore, build_job_store
+
+
+def make_state(request_id: str = "job-1") -> dict:
+    return {"request_id": request_id, "instruction": "Summarize", "enriched_task": None,
+            "parsed_issues": [], "classified_issues": [], "filtered_issues": [],
+            "slack_result": None, "jira_result": None, "answer_result": None,
+            "errors": [], "metrics": {}}
+
+
+class FakeGraph:
+    """Yields one "updates" chunk per node; each waits on `gate` when given."""
+
+    checkpointer = None
+
+    def __init__(self, gate: asyncio.Event = None, fail: bool = False):
+        self.gate = gate
+        self.fail = fail
+
+    async def astream(self, state, config, stream_mode):
+        yield {"enrichment": {"enriched_task": {"intent": "filter_and_report"}}}
+        if self.gate:
+            await self.gate.wait()
+        yield {"file_parser": {"parsed_issues": [{"id": "1"}, {"id": "2"}], "errors": [{"node": "x"}]}}
+        if self.fail:
+            raise RuntimeError("classification exploded")
+        yield {"response_builder": {"metrics": {"response": {"issues_processed": 2}}}}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    return InMemoryJobStore() if request.param == "memory" else SQLiteJobStore(path=str(tmp_path / "jobs.sqlite3"))
+
+
+def test_stores_round_trip_and_update(store):
+    store.put({"job_id": "a", "status": "queued", "created_at": 1e12})
+    store.update("a", status="running")
+    assert store.get("a") == {"job_id": "a", "status": "running", "created_at": 1e12}
+    assert store.get("missing") is None
+
+
+@pytest.mark.parametrize("kind", ["memory", "sqlite"])
+def test_ttl_counts_from_submission_not_from_the_last_update(kind, tmp_path, monkeypatch):
+    store = (InMemoryJobStore(ttl_seconds=60) if kind == "memory"
+             else SQLiteJobStore(ttl_seconds=60, path=str(tmp_path / "jobs.sqlite3")))
+    now = time.time()
+    store.put({"job_id": "a", "status": "queued", "created_at": now - 50})
+    store.update("a", status="running")
+    monkeypatch.setattr(time, "time", lambda: now + 20)
+    store.put({"job_id": "b", "status": "queued", "created_at": now + 20})  # writes evict
+    assert store.get("a") is None and store.get("b")
+
+
+def test_unknown_store_kind_is_rejected():
+    with pytest.raises(ValueError):
+        build_job_store("redis")
+
+
+def test_job_reports_partial_results_then_final_response(store):
+    async def main():
+        gate = asyncio.Event()
+        queue = JobQueue(FakeGraph(gate), store, workers=1)
+        await queue.start()
+        job = await queue.submit(make_state())
+        assert job["status"] == "queued"
+
+        while not (await queue.get("job-1") or {}).get("nodes_completed"):
+            await asyncio.sleep(0.01)
+        running = await queue.get("job-1")
+        stats = queue.stats()
+        gate.set()
+        await queue._queue.join()
+        await queue.stop()
+        return running, stats, await queue.get("job-1"), queue.render()
+
+    running, stats, done, metrics = asyncio.run(main())
+    assert running["status"] == "running"
+    assert running["partial"]["intent"] == "filter_and_report"
+    assert stats["workers_busy"] == 1 and stats["utilization"] == 1.0
+    assert done["status"] == "succeeded"
+    assert done["nodes_completed"] == ["enrichment", "file_parser", "response_builder"]
+    assert done["partial"]["issues_parsed"] == 2
+    assert done["response"] == {"issues_processed": 2}
+    assert 'qaia_jobs_total{status="succeeded"} 1' in metrics
+
+
+def test_failed_job_keeps_its_partial_results(store):
+    async def main():
+        queue = JobQueue(FakeGraph(fail=True), store, workers=1)
+        await queue.start()
+        await queue.submit(make_state())
+        await queue._queue.join()
+        await queue.stop()
+        return await queue.get("job-1")
+
+    job = asyncio.run(main())
+    assert job["status"] == "failed" and job["error"] == "classification exploded"
+    assert job["partial"]["errors"] == [{"node": "x"}]
+
+
+def test_full_queue_rejects_new_jobs():
+    async def main():
+        queue = JobQueue(FakeGraph(), InMemoryJobStore(), workers=0, max_depth=2)
+        await queue.start()
+        await queue.submit(make_state("a"))
+        await queue.submit(make_state("b"))
+        with pytest.raises(QueueFullError):
+            await queue.submit(make_state("c"))
+        return queue.stats()
+
+    assert asyncio.run(main())["queue_depth"] == 2
+
+
+def test_unfinished_job_whose_lease_lapsed_is_reported_failed(tmp_path):
+    store = SQLiteJobStore(path=str(tmp_path / "jobs.sqlite3"))
+    store.put({"job_id": "old", "status": "running", "created_at": time.time() - 120,
+               "updated_at": time.time() - 120})
+    queue = JobQueue(FakeGraph(), store, lease_seconds=60)
+    job = asyncio.run(queue.get("old"))
+    assert job["status"] == "failed" and "restart" in job["error"]
+    assert asyncio.run(queue.is_active("old")) is False
+
+
+def test_job_of_a_live_sibling_process_is_active_not_failed(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+
+    async def main():
+        gate = asyncio.Event()
+        owner = JobQueue(FakeGraph(gate), SQLiteJobStore(path=path), workers=1, lease_seconds=0.3)
+        sibling = JobQueue(FakeGraph(), SQLiteJobStore(path=path), lease_seconds=0.3)
+        await owner.start()
+        await owner.submit(make_state())
+        await asyncio.sleep(1.0)  # several lease periods: only renewals keep it alive
+        seen = await sibling.get("job-1"), await sibling.is_active("job-1")
+        gate.set()
+        await owner._queue.join()
+        await owner.stop()
+        return seen
+
+    job, active = asyncio.run(main())
+    assert job["status"] == "running" and active is True
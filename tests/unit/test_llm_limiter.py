@@ -0,0 +1,171 @@
+"""Unit tests for the process-wide LLM limiter."""
+
+import asyncio
+import threading
+import time
+
+from utils.llm_limiter import LLMLimiter, TokenBucket
+
+
+def test_token_bucket_reports_wait_when_empty():
+    bucket = TokenBucket(capacity=60, period=60)
+    bucket.consume(60)
+    assert 0.9 < bucket.wait_time(1) <= 1.0
+
+
+def test_sync_concurrency_never_exceeds_limit():
+    limiter = LLMLimiter(max_concurrency=2, rpm=10_000, tpm=10_000_000)
+    peak = []
+
+    def call():
+        with limiter.limit(tokens=10):
+            peak.append(limiter.in_flight)
+            time.sleep(0.02)
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert max(peak) <= 2
+    assert limiter.in_flight == 0
+
+
+def test_async_concurrency_never_exceeds_limit():
+    limiter = LLMLimiter(max_concurrency=3, rpm=10_000, tpm=10_000_000)
+    peak = []
+
+    async def call():
+        async with limiter.alimit(tokens=10):
+            peak.append(limiter.in_flight)
+            await asyncio.sleep(0.02)
+
+    async def main():
+        await asyncio.gather(*[call() for _ in range(10)])
+
+    asyncio.run(main())
+    assert max(peak) <= 3
+    assert limiter.in_flight == 0
+
+
+def test_freed_slot_goes_to_the_longest_waiter_not_a_newcomer():
+    limiter = LLMLimiter(max_concurrency=1, rpm=10_000, tpm=10_000_000)
+    order = []
+
+    async def greedy():
+        for _ in range(3):  # re-enters the moment it releases
+            async with limiter.alimit(tokens=10):
+                order.append("greedy")
+                await asyncio.sleep(0.02)
+
+    async def patient():
+        await asyncio.sleep(0.005)
+        async with limiter.alimit(tokens=10):
+            order.append("patient")
+
+    async def main():
+        await asyncio.gather(greedy(), patient())
+
+    asyncio.run(main())
+    assert order == ["greedy", "patient", "greedy", "greedy"]
+    assert limiter.in_flight == 0
+
+
+def test_sync_waiter_is_served_in_arrival_order_with_async_ones():
+    limiter = LLMLimiter(max_concurrency=1, rpm=10_000, tpm=10_000_000)
+    order = []
+
+    def sync_call():
+        with limiter.limit(tokens=10):
+            order.append("sync")
+
+    async def async_call():
+        async with limiter.alimit(tokens=10):
+            order.append("async")
+
+    async def main():
+        async with limiter.alimit(tokens=10):
+            thread = threading.Thread(target=sync_call)
+            thread.start()
+            while len(limiter._waiters) < 1:
+                await asyncio.sleep(0.001)
+            later = asyncio.create_task(async_call())
+            while len(limiter._waiters) < 2:
+                await asyncio.sleep(0.001)
+            order.append("holder")
+        await asyncio.to_thread(thread.join)
+        await later
+
+    asyncio.run(main())
+    assert order == ["holder", "sync", "async"]
+    assert limiter.in_flight == 0
+
+
+def test_cancelled_waiter_does_not_leak_its_slot():
+    limiter = LLMLimiter(max_concurrency=1, rpm=10_000, tpm=10_000_000)
+
+    async def wait_for_slot():
+        async with limiter.alimit(tokens=10):
+            pass
+
+    async def main():
+        async with limiter.alimit(tokens=10):
+            waiter = asyncio.create_task(wait_for_slot())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+        async with limiter.alimit(tokens=10):
+            return limiter.in_flight
+
+    assert asyncio.run(main()) == 1
+    assert limiter.in_flight == 0 and not limiter._waiters
+
+
+def test_rpm_budget_delays_excess_requests():
+    limiter = LLMLimiter(max_concurrency=10, rpm=600, tpm=10_000_000)  # 10 req/s
+    limiter._requests.level = 1
+    start = time.monotonic()
+    for _ in range(2):
+        with limiter.limit(tokens=1):
+            pass
+    assert time.monotonic() - start >= 0.09
+
+
+def test_astream_llm_forwards_chunks_and_returns_the_whole_message():
+    from langchain_core.messages import AIMessageChunk
+    from unittest.mock import patch
+    from utils.llm_limiter import astream_llm
+
+    class StreamingLLM:
+        model_name = "gpt-4o-mini"
+
+        async def astream(self, prompt):
+            for text in ["Hel", "", "lo"]:
+                yield AIMessageChunk(content=text)
+
+    limiter = LLMLimiter(max_concurrency=1, rpm=10_000, tpm=10_000_000)
+    tokens = []
+    with patch("utils.llm_limiter.llm_limiter", limiter):
+        message = asyncio.run(astream_llm(StreamingLLM(), "prompt", tokens.append))
+    assert tokens == ["Hel", "lo"]
+    assert message.content == "Hello"
+    assert limiter.in_flight == 0
+
+
+def test_astream_llm_returns_an_empty_message_when_nothing_is_streamed():
+    from unittest.mock import patch
+    from utils.llm_limiter import astream_llm
+
+    class SilentLLM:
+        model_name = "gpt-4o-mini"
+
+        async def astream(self, prompt):
+            return
+            yield
+
+    limiter = LLMLimiter(max_concurrency=1, rpm=10_000, tpm=10_000_000)
+    tokens = []
+    with patch("utils.llm_limiter.llm_limiter", limiter):
+        message = asyncio.run(astream_llm(SilentLLM(), "prompt", tokens.append))
+    assert tokens == [] and message.content == ""
+    assert limiter.in_flight == 0
@@ -0,0 +1,164 @@
+"""Unit tests for pipeline_node — streaming parse → cluster → classify → filter."""
+
+import asyncio
+import copy
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+with patch("jira.JIRA"):  # pipeline_node imports the jira_agent singleton
+    from nodes.pipeline_node import apipeline_node, pipeline_node
+from schemas.state import AgentState
+from utils.llm_limiter import LLMLimiter
+from utils.sqlite_cache import SQLiteCache
+
+
+class FakeMessage:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FakeLLM:
+    """Issues whose title mentions "total" match; every call takes `latency` seconds."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def _respond(self, prompt: str) -> FakeMessage:
+        self.calls += 1
+        issues = json.loads(prompt.split("Issues to classify:\n", 1)[1].split("\n\nReturn", 1)[0])
+        return FakeMessage(json.dumps([
+            {"issue_id": i["id"], "matches_criteria": "total" in i["title"],
+             "confidence": 0.9, "reason": "r"}
+            for i in issues
+        ]))
+
+    def invoke(self, prompt):
+        return self._respond(prompt)
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(self.latency)
+        return self._respond(prompt)
+
+
+class FakeEmbeddings:
+    """Titles containing "dup" share one direction; every other text gets its own axis."""
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.axes: dict[str, int] = {}
+
+    def _vector(self, text: str) -> list[float]:
+        axis = 0 if "dup" in text else self.axes.setdefault(text, len(self.axes) + 1)
+        vector = [0.0] * self.dim
+        vector[axis] = 1.0
+        return vector
+
+    def embed_documents(self, texts):
+        return [self._vector(t) for t in texts]
+
+    async def aembed_documents(self, texts):
+        return self.embed_documents(texts)
+
+
+def make_csv(n: int) -> bytes:
+    rows = ["id,title,description"]
+    for i in range(1, n + 1):
+        title = "dup total" if i % 10 == 0 else (f"total {i}" if i % 3 == 0 else f"other {i}")
+        rows.append(f"{i},{title},row {i}")
+    return "\n".join(rows).encode("utf-8")
+
+
+def make_state(content: bytes) -> AgentState:
+    return {
+        "request_id": "test-001", "trace_id": "trace-001",
+        "instruction": "", "raw_file_content": content, "file_name": "issues.csv",
+        "enriched_task": {
+            "intent": "filter_and_report", "requires_file_processing": True,
+            "filter_criteria": {"type": "accuracy", "description": "Wrong totals",
+                                "confidence_threshold": 0.6},
+            "requires_slack_post": False, "requires_ticket_creation": False,
+            "requires_analysis": True, "output_format": "bullet",
+        },
+        "rag_context": None, "parsed_issues": [], "issue_clusters": {},
+        "classified_issues": [], "filtered_issues": [],
+        "slack_query": None, "jira_query": None, "answer_query": None,
+        "slack_result": None, "jira_result": None, "answer_result": None,
+        "errors": [], "metrics": {},
+    }
+
+
+def fake_rag(state):
+    return {"rag_context": None, "metrics": {"rag_precomputed": False}}
+
+
+async def afake_rag(state):
+    await asyncio.sleep(0.01)
+    return fake_rag(state)
+
+
+@pytest.fixture(autouse=True)
+def fakes(tmp_path):
+    cache = SQLiteCache(namespace="classification", path=str(tmp_path / "cache.sqlite3"))
+    limiter = LLMLimiter(max_concurrency=8, rpm=100_000, tpm=100_000_000)  # keep the fake LLM unthrottled
+    with patch("nodes.classification_node.classification_cache", cache), \
+         patch("nodes.clustering_node.rag_agent.embeddings", FakeEmbeddings()), \
+         patch("utils.llm_limiter.llm_limiter", limiter), \
+         patch("nodes.pipeline_node.rag_node", fake_rag), \
+         patch("nodes.pipeline_node.arag_node", afake_rag):
+        yield cache
+
+
+def test_pipeline_matches_staged_result(tmp_path):
+    with patch("nodes.classification_node._build_llm", return_value=FakeLLM()):
+        staged = pipeline_node(make_state(make_csv(50)))
+        staged_snapshot = copy.deepcopy(staged)
+    with patch("nodes.classification_node._build_llm", return_value=FakeLLM()), \
+         patch("nodes.classification_node.classification_cache",
+               SQLiteCache(namespace="classification", path=str(tmp_path / "fresh.sqlite3"))):
+        streamed = asyncio.run(apipeline_node(make_state(make_csv(50))))
+
+    for key in ("parsed_issues", "issue_clusters", "classified_issues", "filtered_issues"):
+        assert streamed[key] == staged_snapshot[key], key
+    assert streamed["issue_clusters"] == {"10": ["10", "20", "30", "40", "50"]}
+    assert streamed["raw_file_content"] is None
+    assert streamed["metrics"]["rag_precomputed"] is False
+
+
+def test_first_match_arrives_before_the_file_is_done():
+    with patch("nodes.classification_node._build_llm", return_value=FakeLLM(latency=0.05)), \
+         patch("nodes.pipeline_node.config.CLASSIFICATION_BATCH_SIZE", 5):
+        result = asyncio.run(apipeline_node(make_state(make_csv(200))))
+
+    pipeline = result["metrics"]["pipeline"]
+    assert pipeline["batches"] == 37  # 200 issues − 19 clustered duplicates, in batches of 5
+    assert pipeline["first_match_ms"] < pipeline["total_ms"] / 2
+
+
+def test_streamed_tickets_are_created_per_matched_batch():
+    state = make_state(make_csv(20))
+    state["enriched_task"]["requires_ticket_creation"] = True
+    jira = MagicMock()
+
+    async def arun(issues, jira_query, request_id=None):
+        return {
+            "created": [{"issue_id": i["id"]} for i in issues], "duplicates": [],
+            "success": True, "error": None,
+        }
+
+    jira.arun.side_effect = arun
+    with patch("nodes.classification_node._build_llm", return_value=FakeLLM()), \
+         patch("nodes.pipeline_node.jira_agent", jira):
+        result = asyncio.run(apipeline_node(state))
+
+    created = sorted(t["issue_id"] for t in result["jira_result"]["created"])
+    assert created == sorted(i["id"] for i in result["filtered_issues"])
+    assert result["metrics"]["pipeline"]["first_ticket_ms"] is not None
+
+
+def test_parse_error_surfaces_unwrapped():
+    with patch("nodes.classification_node._build_llm", return_value=FakeLLM()):
+        with pytest.raises(ValueError, match="Missing required fields"):
+            asyncio.run(apipeline_node(make_state(b"title\nno id column")))
@@ -0,0 +1,70 @@
+"""Unit tests for rag_node — precomputed QUERY_TEMPLATES retrievals."""
+
+from unittest.mock import patch
+
+import pytest
+from nodes.rag_node import (
+    QUERY_TEMPLATES, rag_node, warm_template_cache, invalidate_template_cache,
+)
+from schemas.state import AgentState
+from utils.sqlite_cache import SQLiteCache
+
+
+def fake_result(query, collection, **kwargs):
+    return {"query": query, "rewritten_query": query, "results": [{"text": "chunk"}],
+            "confidence": 0.9, "source_collection": collection}
+
+
+def make_state(criteria_type: str) -> AgentState:
+    return {
+        "request_id": "test-001", "trace_id": "trace-001",
+        "instruction": "", "raw_file_content": None, "file_name": None,
+        "enriched_task": {
+            "intent": "filter_and_report", "requires_file_processing": True,
+            "filter_criteria": {"type": criteria_type, "description": "Checkout totals are wrong",
+                                "confidence_threshold": 0.6},
+            "requires_slack_post": False, "requires_ticket_creation": False,
+            "requires_analysis": True, "output_format": "bullet",
+        },
+        "rag_context": None, "parsed_issues": [], "classified_issues": [], "filtered_issues": [],
+        "slack_query": None, "jira_query": None, "answer_query": None,
+        "slack_result": None, "jira_result": None, "answer_result": None,
+        "errors": [], "metrics": {},
+    }
+
+
+@pytest.fixture
+def retrieve(tmp_path):
+    cache = SQLiteCache(namespace="rag_templates", path=str(tmp_path / "cache.sqlite3"))
+    with patch("nodes.rag_node.template_cache", cache), \
+         patch("nodes.rag_node.rag_agent.retrieve", side_effect=fake_result) as mock:
+        yield mock
+
+
+def test_warm_cache_serves_templates_without_retrieval(retrieve):
+    assert warm_template_cache() == len(QUERY_TEMPLATES)
+    retrieve.reset_mock()
+
+    result = rag_node(make_state("accuracy"))
+    retrieve.assert_not_called()
+    assert result["rag_context"]["query"] == QUERY_TEMPLATES["accuracy"]
+    assert result["metrics"]["rag_precomputed"] is True
+
+
+def test_warm_only_resolves_missing_templates(retrieve):
+    rag_node(make_state("security"))
+    assert warm_template_cache() == len(QUERY_TEMPLATES) - 1
+
+
+def test_invalidate_forces_fresh_retrieval(retrieve):
+    warm_template_cache()
+    invalidate_template_cache()
+    retrieve.reset_mock()
+    rag_node(make_state("performance"))
+    assert retrieve.call_count == 1
+
+
+def test_custom_criteria_is_never_precomputed(retrieve):
+    rag_node(make_state("custom"))
+    rag_node(make_state("custom"))
+    assert retrieve.call_count == 2
@@ -0,0 +1,69 @@
+"""Unit tests for RAGAgent re-ranking on stored Qdrant vectors."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from langchain_core.embeddings import Embeddings
+
+from agents.rag_agent import RAGAgent
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        return [[1.0, 0.0] if "original" in t else [0.0, 1.0] for t in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def make_agent(points, rewrite_cache=None) -> tuple[RAGAgent, CountingEmbeddings]:
+    qdrant = MagicMock()
+    qdrant.query_points.return_value = SimpleNamespace(points=points)
+    llm = MagicMock()
+    llm.invoke.return_value = SimpleNamespace(content="rewritten query")
+    embeddings = CountingEmbeddings()
+    agent = RAGAgent(qdrant_client=qdrant, embeddings=embeddings, llm=llm,
+                     async_qdrant_client=MagicMock(), cheap_llm=MagicMock(),
+                     rewrite_cache=rewrite_cache or MagicMock())
+    return agent, embeddings
+
+
+def point(pid, score, vector):
+    return SimpleNamespace(id=pid, score=score, payload={"text": pid}, vector=vector)
+
+
+def test_rerank_scores_stored_vectors_against_original_query():
+    agent, _ = make_agent([])
+    results = [
+        {"id": "a", "score": 0.95, "payload": {}, "vector": [0.0, 1.0]},
+        {"id": "b", "score": 0.80, "payload": {}, "vector": [1.0, 0.1]},
+        {"id": "c", "score": 0.75, "payload": {}, "vector": [0.7, 0.7]},
+    ]
+    ranked = agent._rerank(results, query_vector=[1.0, 0.0], k=2)
+    assert [r["id"] for r in ranked] == ["b", "c"]
+    assert ranked[0]["score"] > 0.99
+
+
+def test_rerank_without_vectors_keeps_search_order():
+    agent, _ = make_agent([])
+    results = [
+        {"id": "a", "score": 0.7, "payload": {}, "vector": None},
+        {"id": "b", "score": 0.9, "payload": {}, "vector": None},
+    ]
+    assert [r["id"] for r in agent._rerank(results, [1.0, 0.0], k=2)] == ["b", "a"]
+
+
+def test_search_and_rerank_share_a_single_embedding_call():
+    agent, embeddings = make_agent([
+        point("x", 0.9, [0.0, 1.0]),
+        point("y", 0.8, [1.0, 0.0]),
+    ])
+    result = agent.retrieve("original question", collection="qa_taxonomy", k=2, rewrite=False)
+    assert embeddings.calls == 1
+    assert agent.client.query_points.call_args.kwargs["with_vectors"] is True
+    assert [r["text"] for r in result["results"]] == ["y", "x"]
+    assert result["confidence"] == 1.0
@@ -0,0 +1,102 @@
+"""Unit tests for RAGAgent query-rewrite policy and the two-level rewrite cache."""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from agents.rag_agent import RAGAgent
+from utils.rewrite_cache import RewriteCache
+from utils.sqlite_cache import SQLiteCache
+
+
+class KeywordEmbeddings(Embeddings):
+    """Near-identical vectors for queries that share their first word."""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(t) for t in texts]
+
+    def embed_query(self, text):
+        first = text.split()[0].lower()
+        return [1.0, 0.01 * len(text)] if first == "accuracy" else [0.0, 1.0]
+
+
+def llm(content):
+    mock = MagicMock()
+    mock.invoke.return_value = SimpleNamespace(content=content)
+    return mock
+
+
+@pytest.fixture
+def agent(tmp_path):
+    qdrant = MagicMock()
+    qdrant.query_points.return_value = SimpleNamespace(points=[])
+    cache = RewriteCache(
+        similarity_threshold=0.95,
+        exact_store=SQLiteCache(namespace="query_rewrite", path=str(tmp_path / "c.sqlite3")),
+    )
+    return RAGAgent(
+        qdrant_client=qdrant, embeddings=KeywordEmbeddings(), llm=llm("full rewrite"),
+        async_qdrant_client=MagicMock(), cheap_llm=llm("cheap rewrite"), rewrite_cache=cache,
+    )
+
+
+def test_exact_hit_skips_llm(agent):
+    agent.retrieve("Accuracy bugs in checkout", collection="qa_taxonomy")
+    result = agent.retrieve("  accuracy bugs   in CHECKOUT ", collection="qa_taxonomy")
+    assert result["rewritten_query"] == "full rewrite"
+    assert agent.llm.invoke.call_count == 1
+    assert agent.rewrite_stats()["qa_taxonomy"]["exact_hits"] == 1
+
+
+def test_semantic_hit_skips_llm(agent):
+    agent.retrieve("accuracy bugs in checkout", collection="qa_taxonomy")
+    agent.retrieve("accuracy bugs in the checkout", collection="qa_taxonomy")
+    assert agent.llm.invoke.call_count == 1
+    assert agent.rewrite_stats()["qa_taxonomy"]["semantic_hits"] == 1
+
+
+def test_dissimilar_query_is_rewritten(agent):
+    agent.retrieve("accuracy bugs", collection="qa_taxonomy")
+    agent.retrieve("slow search page", collection="qa_taxonomy")
+    assert agent.llm.invoke.call_count == 2
+
+
+def test_rewrite_false_skips_llm_entirely(agent):
+    result = agent.retrieve("Checkout total wrong", collection="jira_tickets", rewrite=False)
+    assert result["rewritten_query"] == "Checkout total wrong"
+    agent.llm.invoke.assert_not_called()
+    assert agent.rewrite_stats()["jira_tickets"]["skipped"] == 1
+
+
+def test_cheap_policy_uses_small_model_and_separate_cache(agent):
+    cheap = agent.retrieve("accuracy bugs", collection="qa_taxonomy", rewrite="cheap")
+    full = agent.retrieve("accuracy bugs", collection="qa_taxonomy")
+    assert cheap["rewritten_query"] == "cheap rewrite"
+    assert full["rewritten_query"] == "full rewrite"
+    assert agent.cheap_llm.invoke.call_count == 1 and agent.llm.invoke.call_count == 1
+
+
+def test_async_rewrite_keeps_sqlite_off_the_event_loop(agent):
+    agent.llm.ainvoke = AsyncMock(return_value=SimpleNamespace(content="full rewrite"))
+    cache, threads = agent.rewrite_cache, []
+
+    def on_thread(method):
+        def call(*args):
+            threads.append(threading.current_thread())
+            return method(*args)
+        return call
+
+    cache.lookup_exact, cache.store = on_thread(cache.lookup_exact), on_thread(cache.store)
+
+    async def main():
+        first = await agent._arewrite_query("accuracy bugs", "qa_taxonomy")
+        second = await agent._arewrite_query("Accuracy  bugs", "qa_taxonomy")
+        return first, second
+
+    assert asyncio.run(main()) == ("full rewrite", "full rewrite")
+    assert agent.llm.ainvoke.await_count == 1
+    assert len(threads) == 3 and threading.main_thread() not in threads
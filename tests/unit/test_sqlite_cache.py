@@ -0,0 +1,38 @@
+"""Unit tests for the SQLite TTL/LRU cache."""
+
+import time
+
+from utils.sqlite_cache import SQLiteCache
+
+
+def make_cache(tmp_path, **kwargs) -> SQLiteCache:
+    return SQLiteCache(namespace="test", path=str(tmp_path / "cache.sqlite3"), **kwargs)
+
+
+def test_round_trip_and_misses(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set_many({"a": {"x": 1}, "b": [1, 2]})
+    assert cache.get_many(["a", "b", "c"]) == {"a": {"x": 1}, "b": [1, 2]}
+
+
+def test_persists_across_instances(tmp_path):
+    make_cache(tmp_path).set("a", 1)
+    assert make_cache(tmp_path).get("a") == 1
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = make_cache(tmp_path, ttl_seconds=0.05)
+    cache.set("a", 1)
+    time.sleep(0.1)
+    assert cache.get("a") is None
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    time.sleep(0.01)
+    cache.get("a")            # refresh "a" → "b" is now least recently used
+    cache.set("c", 3)
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+    assert len(cache) == 2
@@ -0,0 +1,79 @@
+"""Unit tests for per-node telemetry — latency, LLM calls, tokens, cost, Prometheus output."""
+
+import asyncio
+from unittest.mock import patch
+
+from utils.llm_limiter import LLMLimiter, ainvoke_llm, invoke_llm
+from utils.telemetry import NodeMetrics, estimate_cost, instrument_node
+
+
+class FakeMessage:
+    def __init__(self, content: str, usage: dict | None = None):
+        self.content = content
+        self.usage_metadata = usage
+
+
+class FakeLLM:
+    model_name = "gpt-4o"
+
+    def invoke(self, prompt):
+        return FakeMessage("ok", {"input_tokens": 1000, "output_tokens": 100})
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(0.01)
+        return self.invoke(prompt)
+
+
+def unthrottled():
+    return patch("utils.llm_limiter.llm_limiter", LLMLimiter(8, 100_000, 100_000_000))
+
+
+def test_sync_node_records_calls_tokens_and_cost():
+    def node(state):
+        invoke_llm(FakeLLM(), "prompt")
+        invoke_llm(FakeLLM(), "prompt")
+        return {"filtered_issues": [], "metrics": {"early_exit": True}}
+
+    with unthrottled():
+        update = instrument_node("classification", node)({"trace_id": "t"})
+
+    record = update["metrics"]["nodes"]["classification"]
+    assert update["metrics"]["early_exit"] is True   # node's own metrics kept
+    assert record["llm_calls"] == 2
+    assert (record["prompt_tokens"], record["completion_tokens"]) == (2000, 200)
+    assert record["cost_usd"] == round(2 * estimate_cost("gpt-4o", 1000, 100), 6)
+    assert record["budget_ms"] == 1500 and record["over_budget"] is False
+
+
+def test_async_node_counts_calls_from_child_tasks():
+    async def node(state):
+        await asyncio.gather(*(ainvoke_llm(FakeLLM(), "p") for _ in range(3)))
+        return {}
+
+    with unthrottled():
+        update = asyncio.run(instrument_node("slack_branch", node)({"trace_id": "t"}))
+
+    record = update["metrics"]["nodes"]["slack_branch"]
+    assert record["llm_calls"] == 3
+    assert record["latency_ms"] >= 10
+    assert "budget_ms" not in record
+
+
+def test_calls_outside_a_node_are_not_counted():
+    with unthrottled():
+        invoke_llm(FakeLLM(), "prompt")  # must not raise
+
+
+def test_prometheus_render():
+    registry = NodeMetrics()
+    record = {"latency_ms": 400.0, "llm_calls": 1, "prompt_tokens": 10,
+              "completion_tokens": 5, "cost_usd": 0.001, "over_budget": True}
+    registry.observe("rag", record)
+    registry.observe("rag", record)
+    text = registry.render()
+
+    assert 'qaia_node_latency_seconds_count{node="rag"} 2' in text
+    assert 'qaia_node_latency_seconds_sum{node="rag"} 0.8' in text
+    assert 'qaia_node_llm_calls_total{node="rag"} 2' in text
+    assert 'qaia_node_over_budget_total{node="rag"} 2' in text
+    assert "# TYPE qaia_node_cost_usd_total counter" in text
@@ -0,0 +1,186 @@
+"""Unit tests for build_graph — rag and file_parser fan out in parallel and join."""
+
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+with patch("jira.JIRA"):  # the agent singletons would otherwise connect to JIRA
+    import graph.workflow as workflow
+from schemas.state import AgentState
+
+LATENCY = 0.2
+
+
+def make_state() -> AgentState:
+    return {
+        "request_id": "test-001", "trace_id": "trace-001",
+        "instruction": "Summarize", "raw_file_content": b"id,title,description\n",
+        "file_name": "issues.csv",
+        "enriched_task": None, "rag_context": None, "parsed_issues": [], "issue_clusters": {},
+        "classified_issues": [], "filtered_issues": [],
+        "slack_query": None, "jira_query": None, "answer_query": None,
+        "slack_result": None, "jira_result": None, "answer_result": None,
+        "errors": [], "metrics": {},
+    }
+
+
+def enrichment(state):
+    return {"enriched_task": {
+        "intent": "filter_and_report", "requires_file_processing": True,
+        "filter_criteria": None, "requires_slack_post": False,
+        "requires_ticket_creation": False, "requires_analysis": True,
+        "output_format": "bullet",
+    }}
+
+
+def slow_rag(state):
+    time.sleep(LATENCY)
+    return {"rag_context": {"results": ["chunk"]}, "metrics": {"rag_precomputed": False}}
+
+
+def slow_parser(state):
+    time.sleep(LATENCY)
+    return {"parsed_issues": [], "raw_file_content": None}
+
+
+async def aslow_rag(state):
+    await asyncio.sleep(LATENCY)
+    return {"rag_context": {"results": ["chunk"]}, "metrics": {"rag_precomputed": False}}
+
+
+@pytest.fixture
+def graph():
+    with patch.object(workflow, "enrichment_node", enrichment), \
+         patch.object(workflow, "aenrichment_node", None), \
+         patch.object(workflow, "rag_node", slow_rag), \
+         patch.object(workflow, "arag_node", aslow_rag), \
+         patch.object(workflow, "file_parser_node", slow_parser):
+        yield workflow.build_graph()
+
+
+def test_rag_and_file_parser_run_in_parallel(graph):
+    start = time.perf_counter()
+    final = graph.invoke(make_state())
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.6 * LATENCY  # back to back would be 2 × LATENCY
+    assert final["rag_context"] == {"results": ["chunk"]}   # neither writer clobbered the other
+    assert final["raw_file_content"] is None
+    assert final["metrics"]["rag_precomputed"] is False
+    assert final["metrics"]["early_exit"] is True
+
+
+def test_async_fan_out_joins_before_classification(graph):
+    start = time.perf_counter()
+    final = asyncio.run(graph.ainvoke(make_state()))
+    assert time.perf_counter() - start < 1.6 * LATENCY
+    assert final["rag_context"] == {"results": ["chunk"]}
+    assert final["metrics"]["response"]["issues_processed"] == 0
+
+
+def full_enrichment(state):
+    return {"enriched_task": {
+        "intent": "filter_and_report", "requires_file_processing": True,
+        "filter_criteria": None, "requires_slack_post": True,
+        "requires_ticket_creation": True, "requires_analysis": True,
+        "output_format": "bullet",
+    }}
+
+
+def test_parallel_branches_merge_results_errors_and_metrics():
+    issues = [{"id": "1", "title": "A", "description": "a", "steps": "", "severity": "high"}]
+    slack, jira, answer = MagicMock(), MagicMock(), MagicMock()
+    slack.run.return_value = {"summary_markdown": "s", "slack_url": "u", "success": True, "error": None}
+    jira.run.return_value = {"created": [{"url": "j"}], "duplicates": [], "success": True, "error": None}
+    answer.analyze_issues.return_value = {"answer": "a", "sources": [], "confidence": 0.9}
+
+    with patch.object(workflow, "enrichment_node", full_enrichment), \
+         patch.object(workflow, "rag_node", lambda s: {"rag_context": None, "errors": [{"node": "rag"}]}), \
+         patch.object(workflow, "file_parser_node",
+                      lambda s: {"parsed_issues": issues, "errors": [{"node": "file_parser"}]}), \
+         patch.object(workflow, "clustering_node", lambda s: {"issue_clusters": {}}), \
+         patch.object(workflow, "slack_agent", slack), \
+         patch.object(workflow, "jira_agent", jira), \
+         patch.object(workflow, "answer_agent", answer):
+        final = workflow.build_graph().invoke(make_state())
+
+    assert final["slack_result"]["success"] and final["jira_result"]["success"]
+    assert final["answer_result"]["answer"] == "a"
+    assert sorted(e["node"] for e in final["errors"]) == ["file_parser", "rag"]  # appended once each
+    assert final["metrics"]["active_branches"] == ["slack", "jira", "answer"]
+    assert final["metrics"]["tickets_created"] == 1
+    assert final["metrics"]["response"]["summary_posted"] is True
+
+
+def test_only_active_branches_are_scheduled():
+    issues = [{"id": "1", "title": "A", "description": "a", "steps": "", "severity": "high"}]
+    slack, jira, answer = MagicMock(), MagicMock(), MagicMock()
+    slack.run.return_value = {"summary_markdown": "s", "slack_url": "u", "success": True, "error": None}
+
+    def slack_only(state):
+        update = full_enrichment(state)
+        update["enriched_task"].update(requires_ticket_creation=False, requires_analysis=False)
+        return update
+
+    with patch.object(workflow, "enrichment_node", slack_only), \
+         patch.object(workflow, "rag_node", lambda s: {"rag_context": None}), \
+         patch.object(workflow, "file_parser_node", lambda s: {"parsed_issues": issues}), \
+         patch.object(workflow, "clustering_node", lambda s: {"issue_clusters": {}}), \
+         patch.object(workflow, "slack_agent", slack), \
+         patch.object(workflow, "jira_agent", jira), \
+         patch.object(workflow, "answer_agent", answer):
+        steps = [next(iter(chunk)) for chunk in workflow.build_graph().stream(make_state())]
+
+    assert "slack_branch" in steps
+    assert "jira_branch" not in steps and "answer_branch" not in steps
+    assert steps.count("aggregator") == 1
+    jira.run.assert_not_called()
+    answer.analyze_issues.assert_not_called()
+
+
+def test_orchestrator_with_no_active_agent_routes_to_aggregator():
+    state = make_state()
+    state["metrics"] = {"active_branches": []}
+    assert workflow.route_to_agents(state) == "aggregator"
+
+
+def test_every_node_that_ran_is_recorded(graph):
+    final = graph.invoke(make_state())
+    nodes = final["metrics"]["nodes"]
+    assert {"enrichment", "rag", "file_parser", "filter", "response_builder"} <= set(nodes)
+    assert nodes["rag"]["latency_ms"] >= LATENCY * 1000
+    assert "orchestrator" not in nodes  # early exit — never ran
+
+
+def test_astream_emits_answer_tokens_between_node_updates():
+    class StreamingAnswer:
+        async def aanswer_query(self, query, output_format, on_token=None):
+            for text in ["Accuracy ", "bugs ", "are..."]:
+                on_token(text)
+            return {"answer": "Accuracy bugs are...", "sources": [], "confidence": 0.9}
+
+    def query_enrichment(state):
+        update = enrichment(state)
+        update["enriched_task"].update(intent="query", requires_file_processing=False)
+        return update
+
+    async def collect():
+        events = []
+        async for mode, chunk in workflow.build_graph().astream(
+            make_state(), config={"configurable": {"stream_tokens": True}},
+            stream_mode=["updates", "custom"],
+        ):
+            events.append(("token", chunk["token"]) if mode == "custom" else ("node", next(iter(chunk))))
+        return events
+
+    with patch.object(workflow, "enrichment_node", query_enrichment), \
+         patch.object(workflow, "aenrichment_node", None), \
+         patch.object(workflow, "answer_agent", StreamingAnswer()):
+        events = asyncio.run(collect())
+
+    tokens = [text for kind, text in events if kind == "token"]
+    assert tokens == ["Accuracy ", "bugs ", "are..."]
+    assert events.index(("token", "Accuracy ")) < events.index(("node", "query_answer"))
+    assert events[-1] == ("node", "response_builder")
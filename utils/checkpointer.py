@@ -0,0 +1,227 @@
+"""
+Checkpointer — local SQLite persistence of graph state, one thread per request.
+
+  graph = build_graph(checkpointer=build_checkpointer())
+  await graph.ainvoke(state, config=run_config(state["request_id"]))
+  await graph.ainvoke(None, config=run_config(request_id))   # resume
+  await arelease(graph, request_id)                          # succeeded — drop its checkpoints
+  async with aclaim(graph, request_id): ...                  # sync run in progress (see below)
+
+LangGraph writes a checkpoint after every super-step (and the writes of
+parallel nodes that finished before a sibling failed). Resuming a thread
+re-runs only what never completed: a failed jira_branch does not repeat
+enrichment, RAG, parsing or classification.
+
+Finer-grained than a node:
+  classification_node persists each batch to the classification cache as it
+  completes, and JiraAgent records every created ticket in its per-request
+  ledger (agents/jira_agent.py) — a resumed node re-pays only for the issues
+  it had not finished.
+
+Retention:
+  A failed run's checkpoints are kept so it can be resumed — for
+  CHECKPOINT_TTL seconds after its last write. The thread_activity table
+  records that time; threads older than the TTL are deleted when the
+  checkpointer is built and, at most every CHECKPOINT_SWEEP_INTERVAL, on write.
+
+Run leases:
+  aclaim() marks a request's thread as running while a sync or streamed run
+  executes, renewing the lease every JOB_LEASE_SECONDS / 3 like async jobs do.
+  The resume endpoint refuses a thread that is claimed (RunInProgressError),
+  whichever worker process holds it; a claim whose process died lapses.
+
+Why not AsyncSqliteSaver:
+  The compiled graph is built once at import and serves both graph.invoke()
+  (tests, scripts) and graph.ainvoke() / astream() (API, job workers).
+  AsyncSqliteSaver binds an aiosqlite connection to one running loop and has
+  no usable sync path, so ThreadedSqliteSaver keeps SqliteSaver's locked sync
+  connection and gives each async method a to_thread twin.
+
+Teaching point:
+  Ticket 80 of 100 failing should cost one ticket, not a hundred LLM calls.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Optional
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class RunInProgressError(Exception):
+    """Raised by aclaim() when another run of the same request holds a live lease."""
+
+
+class ThreadedSqliteSaver(SqliteSaver):
+    """SqliteSaver whose async methods run the sync ones on a worker thread."""
+
+    def __init__(self, conn: sqlite3.Connection, ttl_seconds: Optional[float] = None):
+        super().__init__(conn)
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = config.CHECKPOINT_SWEEP_INTERVAL
+        self._last_sweep = time.time()
+
+    def setup(self) -> None:
+        if self.is_setup:
+            return
+        super().setup()
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS thread_activity ("
+            "thread_id TEXT PRIMARY KEY, updated_at REAL NOT NULL, lease_until REAL)"
+        )
+        # threads written before this table existed start their TTL now
+        self.conn.execute(
+            "INSERT OR IGNORE INTO thread_activity (thread_id, updated_at) "
+            "SELECT DISTINCT thread_id, ? FROM checkpoints", (time.time(),)
+        )
+        self.conn.commit()
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        result = super().put(config, checkpoint, metadata, new_versions)
+        now = time.time()
+        with self.cursor() as cur:
+            cur.execute(
+                "INSERT INTO thread_activity (thread_id, updated_at) VALUES (?, ?) "
+                "ON CONFLICT(thread_id) DO UPDATE SET updated_at = excluded.updated_at",
+                (str(config["configurable"]["thread_id"]), now),
+            )
+        if self.ttl_seconds is not None and now - self._last_sweep > self.sweep_interval:
+            self._last_sweep = now
+            self.sweep()
+        return result
+
+    def delete_thread(self, thread_id) -> None:
+        super().delete_thread(thread_id)
+        with self.cursor() as cur:
+            cur.execute("DELETE FROM thread_activity WHERE thread_id = ?", (str(thread_id),))
+
+    def sweep(self) -> int:
+        """Delete unclaimed threads not written for ttl_seconds; returns how many."""
+        now = time.time()
+        with self.cursor() as cur:
+            stale = [row[0] for row in cur.execute(
+                "SELECT thread_id FROM thread_activity WHERE updated_at < ? "
+                "AND (lease_until IS NULL OR lease_until < ?)",
+                (now - self.ttl_seconds, now),
+            )]
+        for thread_id in stale:
+            self.delete_thread(thread_id)
+        if stale:
+            logger.info("Deleted checkpoints of %d runs older than %ss", len(stale), self.ttl_seconds)
+        return len(stale)
+
+    def claim(self, thread_id: str, lease_seconds: float) -> bool:
+        """Take (or renew — same call) the run lease; False while someone else holds a live one."""
+        now = time.time()
+        with self.cursor() as cur:
+            cur.execute(
+                "INSERT INTO thread_activity (thread_id, updated_at, lease_until) VALUES (?, ?, ?) "
+                "ON CONFLICT(thread_id) DO UPDATE SET lease_until = excluded.lease_until "
+                "WHERE thread_activity.lease_until IS NULL OR thread_activity.lease_until < ?",
+                (thread_id, now, now + lease_seconds, now),
+            )
+            return cur.rowcount == 1
+
+    def renew(self, thread_id: str, lease_seconds: float) -> None:
+        with self.cursor() as cur:
+            cur.execute(
+                "UPDATE thread_activity SET lease_until = ? WHERE thread_id = ?",
+                (time.time() + lease_seconds, thread_id),
+            )
+
+    def unclaim(self, thread_id: str) -> None:
+        with self.cursor() as cur:
+            cur.execute("UPDATE thread_activity SET lease_until = NULL WHERE thread_id = ?", (thread_id,))
+
+    def is_claimed(self, thread_id: str) -> bool:
+        with self.cursor() as cur:
+            row = cur.execute(
+                "SELECT lease_until FROM thread_activity WHERE thread_id = ?", (thread_id,)
+            ).fetchone()
+        return bool(row and row[0] is not None and row[0] >= time.time())
+
+    async def aget_tuple(self, config):
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id):
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+def build_checkpointer(
+    path: str = config.CHECKPOINT_DB_PATH, ttl_seconds: float = config.CHECKPOINT_TTL
+) -> Optional[ThreadedSqliteSaver]:
+    """None when CHECKPOINTING is off — the graph then compiles without persistence."""
+    if not config.CHECKPOINTING:
+        return None
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)  # SqliteSaver serializes access with its own lock
+    conn.execute("PRAGMA journal_mode=WAL")
+    saver = ThreadedSqliteSaver(conn, ttl_seconds=ttl_seconds)
+    saver.sweep()
+    return saver
+
+
+def run_config(request_id: str, **configurable) -> dict:
+    """Graph config for one request: its checkpoint thread plus any extra configurable keys."""
+    return {"configurable": {"thread_id": request_id, **configurable}}
+
+
+async def arelease(graph, request_id: str) -> None:
+    """Drop a finished run's checkpoints — only failed runs need to stay resumable."""
+    if graph.checkpointer is not None:
+        await graph.checkpointer.adelete_thread(request_id)
+
+
+@asynccontextmanager
+async def aclaim(graph, request_id: str, lease_seconds: float = config.JOB_LEASE_SECONDS):
+    """Hold the request's run lease for the block; RunInProgressError if another run holds it."""
+    saver = graph.checkpointer
+    if saver is None:
+        yield
+        return
+    if not await asyncio.to_thread(saver.claim, request_id, lease_seconds):
+        raise RunInProgressError(f"Request '{request_id}' is still running")
+    renewing = asyncio.create_task(_renew(saver, request_id, lease_seconds))
+    try:
+        yield
+    finally:
+        renewing.cancel()
+        # shield — a disconnected client cancels the block, the lease must still be dropped
+        await asyncio.shield(asyncio.to_thread(saver.unclaim, request_id))
+
+
+async def ais_running(graph, request_id: str) -> bool:
+    """A sync or streamed run of the request holds a live lease (in any process)."""
+    if graph.checkpointer is None:
+        return False
+    return await asyncio.to_thread(graph.checkpointer.is_claimed, request_id)
+
+
+async def _renew(saver: ThreadedSqliteSaver, request_id: str, lease_seconds: float) -> None:
+    while True:
+        await asyncio.sleep(lease_seconds / 3)
+        try:
+            await asyncio.to_thread(saver.renew, request_id, lease_seconds)
+        except Exception:
+            logger.warning("Renewing the run lease of %s failed", request_id, exc_info=True)
@@ -0,0 +1,252 @@
+"""
+Embedding Cache — two-tier cache in front of OpenAIEmbeddings (TDD §9.1).
+
+  Tier 1: in-memory LRU         (EMBEDDING_CACHE_MEMORY_ITEMS vectors)
+  Tier 2: disk, append-only     (EMBEDDING_CACHE_DIR)
+            vectors_<dim>.f32   float32 rows, read through numpy.memmap
+            index.sqlite3       sha256(model, text) → (dim, row)
+
+The directory may be shared by several processes: rows are allocated under
+an flock on the vector file, and a reader whose map predates another
+process's append remaps before gathering.
+
+CachedEmbeddings is a drop-in Embeddings implementation:
+
+  embeddings = CachedEmbeddings(OpenAIEmbeddings(model=...))
+  embeddings.embed_documents(texts)   # hits served locally, misses → ONE API call
+
+Lookups are batched: memory first, then one index query + one memmap gather
+for the rest, and only the remaining misses go to the wrapped model. The
+async methods run lookup and store in asyncio.to_thread; only the model call
+is awaited on the loop.
+stats() reports size and hit rate per tier.
+
+Teaching point:
+  The same texts are embedded constantly — fixed query templates, taxonomy
+  chunks, ticket text. An embedding is a pure function of (model, text),
+  so it can be cached forever.
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+import config
+
+
+class EmbeddingStore:
+    def __init__(
+        self,
+        directory: str = config.EMBEDDING_CACHE_DIR,
+        memory_items: int = config.EMBEDDING_CACHE_MEMORY_ITEMS,
+    ):
+        self.directory = Path(directory)
+        self.memory_items = memory_items
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._maps: dict[int, np.memmap] = {}
+        self._lock = threading.Lock()
+        self._index: Optional[sqlite3.Connection] = None
+        self._hits_memory = 0
+        self._hits_disk = 0
+        self._misses = 0
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """Return {key: vector} for every cached key (memory, then disk)."""
+        found: dict[str, np.ndarray] = {}
+        with self._lock:
+            pending = []
+            for key in dict.fromkeys(keys):
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                else:
+                    pending.append(key)
+            self._hits_memory += len(found)
+
+            from_disk = self._read_disk(pending)
+            for key, vector in from_disk.items():
+                self._remember(key, vector)
+            found.update(from_disk)
+            self._hits_disk += len(from_disk)
+            self._misses += len(pending) - len(from_disk)
+        return found
+
+    def put_many(self, items: dict[str, np.ndarray]) -> None:
+        """Persist new vectors to disk and memory."""
+        if not items:
+            return
+        with self._lock:
+            index = self._connect()
+            known = {
+                key for (key,) in _select_in(index, "SELECT key FROM embeddings", list(items))
+            }
+            by_dim: dict[int, list[tuple[str, np.ndarray]]] = {}
+            for key, vector in items.items():
+                vector = np.asarray(vector, dtype=np.float32)
+                self._remember(key, vector)
+                if key not in known:
+                    by_dim.setdefault(vector.shape[0], []).append((key, vector))
+            rows = []
+            for dim, entries in by_dim.items():
+                first = self._append(dim, [v for _, v in entries])
+                rows.extend((key, dim, first + n) for n, (key, _) in enumerate(entries))
+            with index:
+                index.executemany("INSERT OR IGNORE INTO embeddings VALUES (?, ?, ?)", rows)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits_memory + self._hits_disk + self._misses
+            disk_items = self._connect().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return {
+                "memory_items": len(self._memory),
+                "disk_items":   disk_items,
+                "hits_memory":  self._hits_memory,
+                "hits_disk":    self._hits_disk,
+                "misses":       self._misses,
+                "hit_rate":     round((lookups - self._misses) / lookups, 4) if lookups else 0.0,
+            }
+
+    # ------------------------------------------------------------------
+    # Private methods (caller holds self._lock)
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._index is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._index = sqlite3.connect(
+                self.directory / "index.sqlite3", check_same_thread=False
+            )
+            self._index.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, dim INTEGER NOT NULL, row INTEGER NOT NULL)"
+            )
+        return self._index
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, keys: list[str]) -> dict[str, np.ndarray]:
+        if not keys:
+            return {}
+        rows = _select_in(self._connect(), "SELECT key, dim, row FROM embeddings", keys)
+        found = {}
+        by_dim: dict[int, list[tuple[str, int]]] = {}
+        for key, dim, row in rows:
+            by_dim.setdefault(dim, []).append((key, row))
+        for dim, entries in by_dim.items():
+            matrix = self._map(dim)
+            if max(row for _, row in entries) >= len(matrix):
+                # another process appended since this map was taken
+                self._maps.pop(dim, None)
+                matrix = self._map(dim)
+            entries = [(key, row) for key, row in entries if row < len(matrix)]  # else: a miss
+            vectors = matrix[[row for _, row in entries]]
+            found.update({key: np.array(v) for (key, _), v in zip(entries, vectors)})
+        return found
+
+    def _append(self, dim: int, vectors: list[np.ndarray]) -> int:
+        """Append rows to vectors_<dim>.f32, return the first one's row number.
+
+        Other processes (a second API worker, rag/ingest.py) share the file, so
+        the row is taken from the end of file under an exclusive flock; a torn
+        row left by a crashed writer is padded to the next row boundary.
+        """
+        row_bytes = dim * 4
+        with open(self._vector_path(dim), "ab") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                end = f.seek(0, os.SEEK_END)
+                if end % row_bytes:
+                    f.write(b"\0" * (row_bytes - end % row_bytes))
+                first = -(-end // row_bytes)
+                f.write(b"".join(v.tobytes() for v in vectors))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        self._maps.pop(dim, None)  # file grew — remap on next read
+        return first
+
+    def _map(self, dim: int) -> np.memmap:
+        if dim not in self._maps:
+            self._maps[dim] = np.memmap(self._vector_path(dim), dtype=np.float32, mode="r").reshape(-1, dim)
+        return self._maps[dim]
+
+    def _vector_path(self, dim: int) -> Path:
+        return self.directory / f"vectors_{dim}.f32"
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that serves repeated (model, text) pairs from EmbeddingStore."""
+
+    def __init__(self, embeddings: Embeddings, store: Optional[EmbeddingStore] = None, model: Optional[str] = None):
+        self.embeddings = embeddings
+        self.store = store or embedding_store
+        self.model = model or getattr(embeddings, "model", config.EMBEDDING_MODEL)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys, found, missing = self._lookup(texts)
+        if missing:
+            self._store(missing, self.embeddings.embed_documents(missing), found)
+        return [found[k].tolist() for k in keys]
+
+    def embed_query(self, text: str) -> list[float]:
+        keys, found, missing = self._lookup([text])
+        if missing:
+            self._store(missing, [self.embeddings.embed_query(text)], found)
+        return found[keys[0]].tolist()
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        # index query, memmap reads and flocked appends are disk I/O — off the event loop
+        keys, found, missing = await asyncio.to_thread(self._lookup, texts)
+        if missing:
+            vectors = await self.embeddings.aembed_documents(missing)
+            await asyncio.to_thread(self._store, missing, vectors, found)
+        return [found[k].tolist() for k in keys]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        keys, found, missing = await asyncio.to_thread(self._lookup, [text])
+        if missing:
+            vector = await self.embeddings.aembed_query(text)
+            await asyncio.to_thread(self._store, missing, [vector], found)
+        return found[keys[0]].tolist()
+
+    def stats(self) -> dict:
+        return self.store.stats()
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model}\x00{text}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, texts: list[str]):
+        keys = [self._key(t) for t in texts]
+        found = self.store.get_many(keys)
+        missing = list(dict.fromkeys(t for t, k in zip(texts, keys) if k not in found))
+        return keys, found, missing
+
+    def _store(self, texts: list[str], vectors: list[list[float]], found: dict) -> None:
+        fresh = {self._key(t): np.asarray(v, dtype=np.float32) for t, v in zip(texts, vectors)}
+        self.store.put_many(fresh)
+        found.update(fresh)
+
+
+def _select_in(conn: sqlite3.Connection, select: str, keys: list[str], size: int = 500) -> list[tuple]:
+    rows = []
+    for i in range(0, len(keys), size):
+        chunk = keys[i:i + size]
+        rows.extend(conn.execute(f"{select} WHERE key IN ({','.join('?' * len(chunk))})", chunk))
+    return rows
+
+
+# Module-level singleton — one store per process, shared by every CachedEmbeddings
+embedding_store = EmbeddingStore()
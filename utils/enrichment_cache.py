@@ -0,0 +1,127 @@
+"""
+Enrichment Cache — two-level cache for enrichment_node's LLM contracts.
+
+  Level 1: exact      normalized instruction → EnrichedTask
+                      (persistent, SQLite namespace "enrichment", TTL + LRU)
+  Level 2: semantic   instruction embedding within ENRICHMENT_CACHE_SIMILARITY
+                      (cosine) of a cached instruction → reuse its contract
+                      (in-memory, TTL + LRU, ENRICHMENT_CACHE_MAX_ENTRIES)
+
+Normalization: casefold, punctuation dropped, whitespace collapsed — so
+"Find accuracy issues, and create JIRA tickets!" and
+"find accuracy issues and create jira tickets" share one entry.
+
+Invalidation:
+  Exact keys include prompt_version() — a hash of ENRICHMENT_PROMPT and
+  LLM_MODEL — and the semantic level is emptied whenever that version changes.
+  Editing the prompt or switching models makes old contracts unreachable
+  immediately; TTL/LRU then reclaim them.
+
+Teaching point:
+  Users repeat themselves. The tenth "find accuracy issues and create tickets"
+  should cost a dictionary lookup, not a gpt-4o completion.
+"""
+
+import hashlib
+import re
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from schemas.state import EnrichedTask
+from utils.sqlite_cache import SQLiteCache
+import config
+
+
+class EnrichmentCache:
+    def __init__(
+        self,
+        prompt: str,
+        similarity_threshold: float = config.ENRICHMENT_CACHE_SIMILARITY,
+        max_entries: int = config.ENRICHMENT_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = config.ENRICHMENT_CACHE_TTL,
+        exact_store: Optional[SQLiteCache] = None,
+    ):
+        self.prompt = prompt
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._exact = exact_store if exact_store is not None else SQLiteCache(
+            namespace="enrichment", ttl_seconds=ttl_seconds, max_entries=max_entries
+        )
+        self._vectors = np.empty((0, 0), dtype=np.float32)   # unit vectors, row-aligned
+        self._contracts: list[EnrichedTask] = []
+        self._created: list[float] = []
+        self._last_access: list[float] = []
+        self._semantic_version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> str:
+        return prompt_version(self.prompt, config.LLM_MODEL)
+
+    def lookup_exact(self, instruction: str) -> Optional[EnrichedTask]:
+        return self._exact.get(self._exact_key(instruction))
+
+    def lookup_similar(self, vector: list[float]) -> Optional[EnrichedTask]:
+        """Contract of the most similar live instruction, if it clears the threshold."""
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            if not self._contracts or self._semantic_version != self.version:
+                return None
+            scores = self._vectors @ _unit(vector)
+            best = int(np.argmax(scores))
+            if scores[best] < self.similarity_threshold:
+                return None
+            self._last_access[best] = now
+            return self._contracts[best]
+
+    def store(self, instruction: str, contract: EnrichedTask, vector: Optional[list[float]] = None) -> None:
+        self._exact.set(self._exact_key(instruction), contract)
+        if vector is None:
+            return
+        now = time.time()
+        with self._lock:
+            if self._semantic_version != (version := self.version):
+                self._drop(range(len(self._contracts)))
+                self._semantic_version = version
+            row = _unit(vector)[None, :]
+            self._vectors = row if not self._contracts else np.vstack([self._vectors, row])
+            self._contracts.append(contract)
+            self._created.append(now)
+            self._last_access.append(now)
+            if len(self._contracts) > self.max_entries:
+                self._drop([int(np.argmin(self._last_access))])
+
+    def _exact_key(self, instruction: str) -> str:
+        return hashlib.sha256(f"{self.version}\x00{normalize_instruction(instruction)}".encode("utf-8")).hexdigest()
+
+    def _expire(self, now: float) -> None:
+        expired = [i for i, created in enumerate(self._created) if now - created > self.ttl_seconds]
+        if expired:
+            self._drop(expired)
+
+    def _drop(self, rows) -> None:
+        dropped = set(rows)
+        keep = [i for i in range(len(self._contracts)) if i not in dropped]
+        self._vectors = self._vectors[keep]
+        self._contracts = [self._contracts[i] for i in keep]
+        self._created = [self._created[i] for i in keep]
+        self._last_access = [self._last_access[i] for i in keep]
+
+
+def normalize_instruction(instruction: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", instruction.casefold()).split())
+
+
+def prompt_version(prompt: str, model: str) -> str:
+    return hashlib.sha256(f"{model}\x00{prompt}".encode("utf-8")).hexdigest()[:16]
+
+
+def _unit(vector: list[float]) -> np.ndarray:
+    v = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(v)
+    return v / norm if norm else v
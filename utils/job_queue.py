@@ -0,0 +1,254 @@
+"""
+Job Queue — background graph runs for POST /qa-intake?mode=async.
+
+  job_queue = JobQueue(graph, store)
+  await job_queue.start()                 # JOB_WORKERS worker tasks (api lifespan)
+  job = await job_queue.submit(initial_state)   # returns the queued record immediately
+  job = await job_queue.resume(request_id)      # continue a failed run from its checkpoint
+  await job_queue.get(job_id)                   # status, partial results, final response
+
+Each worker takes the next state off an asyncio.Queue and runs
+graph.astream(stream_mode="updates"). After every node the job record gets
+that node appended to nodes_completed and a fresh `partial` snapshot
+(intent, issue counts, agent results so far); the final response_builder
+payload lands in `response` and the run's checkpoints are released. Every
+store read and write (API calls included) goes through asyncio.to_thread so a
+SQLite store never blocks the loop.
+
+Lease:
+  With the SQLite store any worker process on the host answers GET /jobs/{id},
+  so liveness cannot be "owned by this process". The queue holding a job
+  renews its `updated_at` every JOB_LEASE_SECONDS / 3 (and on every update);
+  a queued or running job not renewed for JOB_LEASE_SECONDS belonged to a
+  process that died — get() reports it failed and it may be resumed.
+
+Backpressure:
+  At most JOB_QUEUE_MAX_DEPTH jobs wait; submit() raises QueueFullError
+  beyond that and the API answers 503 with Retry-After.
+
+Metrics (appended to GET /metrics):
+  qaia_job_queue_depth               gauge    jobs waiting for a worker
+  qaia_job_workers / _busy           gauge    pool size / workers running a graph
+  qaia_job_worker_busy_seconds_total counter  utilisation = rate() / qaia_job_workers
+  qaia_job_queue_wait_seconds        summary  submit → worker pick-up
+  qaia_jobs_total{status}            counter  succeeded / failed
+
+Teaching point:
+  Classifying 200 issues and filing their tickets takes longer than a load
+  balancer will hold a connection. Accept the work, hand back a receipt,
+  and let the client poll.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Optional
+
+from schemas.state import AgentState, apply_update
+from utils.checkpointer import arelease, run_config
+from utils.job_store import JobStore
+import config
+
+logger = logging.getLogger(__name__)
+
+UNFINISHED = ("queued", "running")
+
+
+class QueueFullError(Exception):
+    """Raised by submit() when JOB_QUEUE_MAX_DEPTH jobs are already waiting."""
+
+
+class JobQueue:
+    def __init__(
+        self,
+        graph,
+        store: JobStore,
+        workers: int = config.JOB_WORKERS,
+        max_depth: int = config.JOB_QUEUE_MAX_DEPTH,
+        lease_seconds: float = config.JOB_LEASE_SECONDS,
+    ):
+        self.graph = graph
+        self.store = store
+        self.workers = workers
+        self.max_depth = max_depth
+        self.lease_seconds = lease_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+        self._held: dict[str, asyncio.Lock] = {}  # queued / running here → its write lock
+        self._busy = 0
+        self._lock = threading.Lock()
+        self._stats = {"busy_seconds": 0.0, "wait_seconds": 0.0, "picked_up": 0,
+                       "succeeded": 0, "failed": 0}
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.max_depth)
+        self._tasks = [asyncio.create_task(self._work(), name=f"qaia-job-{n}") for n in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._renew_leases(), name="qaia-job-leases"))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, state: AgentState) -> dict:
+        """Queue a graph run; the job id is the request id."""
+        return await self._enqueue(state["request_id"], state)
+
+    async def resume(self, request_id: str) -> dict:
+        """Queue the continuation of a checkpointed run (graph input None)."""
+        return await self._enqueue(request_id, None)
+
+    async def is_active(self, job_id: str) -> bool:
+        """Queued or running in any live process — resuming it now would run the graph twice."""
+        job = await asyncio.to_thread(self.store.get, job_id)
+        return bool(job) and job["status"] in UNFINISHED and not self._lapsed(job)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        """The job record; unfinished jobs whose lease lapsed are reported as failed."""
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job and job["status"] in UNFINISHED and self._lapsed(job):
+            job = {**job, "status": "failed", "error": "Interrupted by a server restart — resume or resubmit"}
+        return job
+
+    def stats(self) -> dict:
+        with self._lock:
+            busy = self._busy
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "workers": self.workers,
+            "workers_busy": busy,
+            "utilization": busy / self.workers if self.workers else 0.0,
+        }
+
+    def render(self) -> str:
+        """Prometheus text, appended to NodeMetrics.render() by GET /metrics."""
+        stats = self.stats()
+        with self._lock:
+            totals = dict(self._stats)
+        lines = [
+            "# HELP qaia_job_queue_depth Async jobs waiting for a worker",
+            "# TYPE qaia_job_queue_depth gauge",
+            f"qaia_job_queue_depth {stats['queue_depth']}",
+            "# HELP qaia_job_workers Async job worker pool size",
+            "# TYPE qaia_job_workers gauge",
+            f"qaia_job_workers {stats['workers']}",
+            "# HELP qaia_job_workers_busy Workers currently running a graph",
+            "# TYPE qaia_job_workers_busy gauge",
+            f"qaia_job_workers_busy {stats['workers_busy']}",
+            "# HELP qaia_job_worker_busy_seconds_total Worker time spent running graphs",
+            "# TYPE qaia_job_worker_busy_seconds_total counter",
+            f"qaia_job_worker_busy_seconds_total {totals['busy_seconds']}",
+            "# HELP qaia_job_queue_wait_seconds Time from submit to worker pick-up",
+            "# TYPE qaia_job_queue_wait_seconds summary",
+            f"qaia_job_queue_wait_seconds_sum {totals['wait_seconds']}",
+            f"qaia_job_queue_wait_seconds_count {totals['picked_up']}",
+            "# HELP qaia_jobs_total Finished async jobs",
+            "# TYPE qaia_jobs_total counter",
+            f'qaia_jobs_total{{status="succeeded"}} {totals["succeeded"]}',
+            f'qaia_jobs_total{{status="failed"}} {totals["failed"]}',
+        ]
+        return "\n".join(lines) + "\n"
+
+    # ------------------------------------------------------------------
+    # Private methods
+    # ------------------------------------------------------------------
+
+    async def _enqueue(self, job_id: str, state: Optional[AgentState]) -> dict:
+        if self._queue is None:
+            raise RuntimeError("JobQueue.start() has not been awaited")
+        if self._queue.full():
+            raise QueueFullError(f"{self.max_depth} jobs already queued")
+        now = time.time()
+        job = {
+            "job_id": job_id, "status": "queued",
+            "created_at": now, "updated_at": now, "started_at": None, "finished_at": None,
+            "nodes_completed": [], "partial": {}, "response": None, "error": None,
+        }
+        # the record is written before a worker can see the job, so its "running"
+        # update never races the "queued" one
+        await asyncio.to_thread(self.store.put, job)
+        self._held[job_id] = asyncio.Lock()
+        try:
+            self._queue.put_nowait((job_id, state, time.perf_counter()))
+        except asyncio.QueueFull:  # filled by another submit during the write
+            await self._update(job_id, status="failed", finished_at=time.time(), error="Job queue full")
+            del self._held[job_id]
+            raise QueueFullError(f"{self.max_depth} jobs already queued")
+        return job
+
+    async def _work(self) -> None:
+        while True:
+            job_id, state, submitted = await self._queue.get()
+            started = time.perf_counter()
+            with self._lock:
+                self._busy += 1
+                self._stats["wait_seconds"] += started - submitted
+                self._stats["picked_up"] += 1
+            try:
+                await self._run(job_id, state)
+            finally:
+                with self._lock:
+                    self._busy -= 1
+                    self._stats["busy_seconds"] += time.perf_counter() - started
+                self._queue.task_done()
+
+    async def _run(self, job_id: str, state: Optional[AgentState]) -> None:
+        await self._update(job_id, status="running", started_at=time.time())
+        config = run_config(job_id) if self.graph.checkpointer is not None else None
+        nodes_completed = []
+        try:
+            # a resume starts from the checkpointed state rather than the initial one
+            folded = dict(state) if state is not None else dict((await self.graph.aget_state(config)).values)
+            async for chunk in self.graph.astream(state, config=config, stream_mode="updates"):
+                for node, update in chunk.items():
+                    apply_update(folded, update or {})
+                    nodes_completed.append(node)
+                await self._update(job_id, nodes_completed=list(nodes_completed), partial=_partial(folded))
+        except Exception as e:
+            logger.exception("Async job %s failed", job_id)
+            await self._finish(job_id, "failed", error=str(e))
+            return
+        await arelease(self.graph, job_id)
+        await self._finish(job_id, "succeeded", response=folded["metrics"].get("response", {}))
+
+    async def _finish(self, job_id: str, status: str, **fields) -> None:
+        await self._update(job_id, status=status, finished_at=time.time(), **fields)
+        self._held.pop(job_id, None)
+        with self._lock:
+            self._stats[status] += 1
+
+    async def _update(self, job_id: str, **fields) -> None:
+        """Every write renews the lease; the per-job lock keeps renewals from racing node updates."""
+        async with self._held[job_id]:
+            await asyncio.to_thread(self.store.update, job_id, updated_at=time.time(), **fields)
+
+    async def _renew_leases(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            for job_id in list(self._held):
+                try:
+                    await self._update(job_id)
+                except KeyError:  # finished meanwhile
+                    continue
+                except Exception:
+                    logger.warning("Renewing the lease of job %s failed", job_id, exc_info=True)
+
+    def _lapsed(self, job: dict) -> bool:
+        return time.time() - job.get("updated_at", job["created_at"]) > self.lease_seconds
+
+
+def _partial(state: AgentState) -> dict:
+    """What a polling client can already use before the response is built."""
+    task = state.get("enriched_task") or {}
+    return {
+        "intent": task.get("intent"),
+        "issues_parsed": len(state.get("parsed_issues") or []),
+        "issues_classified": len(state.get("classified_issues") or []),
+        "issues_filtered": len(state.get("filtered_issues") or []),
+        "slack_result": state.get("slack_result"),
+        "jira_result": state.get("jira_result"),
+        "answer_result": state.get("answer_result"),
+        "errors": state.get("errors") or [],
+    }
@@ -0,0 +1,91 @@
+"""
+Job Store — status records for POST /qa-intake?mode=async.
+
+  store = build_job_store()            # JOB_STORE=memory | sqlite
+  store.put(job)                       # full record
+  store.update(job_id, status="running", started_at=...)
+  store.get(job_id)                    # dict, or None once unknown / expired
+
+Record:
+  {job_id, status, created_at, updated_at, started_at, finished_at,
+   nodes_completed, partial, response, error}
+  status: queued → running → succeeded | failed
+
+Backends:
+  InMemoryJobStore — a dict in this process; gone on restart.
+  SQLiteJobStore   — SQLiteCache namespace "jobs" (TTL only, no LRU cap), so
+                     finished results outlive a restart and any worker process
+                     on the host can answer GET /jobs/{id}.
+
+Only records live here. The queued AgentState (with the raw upload) stays in the
+owning process's JobQueue, so a job that was queued or running when its process
+died can never finish. The owner renews `updated_at` while it holds the job;
+JobQueue.get() reports an unfinished job whose lease lapsed as failed.
+
+Teaching point:
+  The store is the contract with the client; the queue is an implementation
+  detail. Keep the two apart and swapping SQLite for Redis is one class.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from utils.sqlite_cache import SQLiteCache
+import config
+
+
+class JobStore(ABC):
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def put(self, job: dict) -> None:
+        ...
+
+    def update(self, job_id: str, **fields) -> dict:
+        """Read-modify-write; only the owning worker writes a job, so no lost updates."""
+        job = {**(self.get(job_id) or {"job_id": job_id}), **fields}
+        self.put(job)
+        return job
+
+
+class InMemoryJobStore(JobStore):
+    def __init__(self, ttl_seconds: float = config.JOB_TTL):
+        self.ttl_seconds = ttl_seconds
+        self._jobs: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def put(self, job: dict) -> None:
+        now = time.time()
+        with self._lock:
+            self._jobs[job["job_id"]] = dict(job)
+            expired = [k for k, j in self._jobs.items() if now - j["created_at"] > self.ttl_seconds]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+
+class SQLiteJobStore(JobStore):
+    def __init__(self, ttl_seconds: float = config.JOB_TTL, path: str = config.CACHE_DB_PATH):
+        self._table = SQLiteCache(namespace="jobs", ttl_seconds=ttl_seconds, path=path)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self._table.get(job_id)
+
+    def put(self, job: dict) -> None:
+        # JOB_TTL counts from submission, not from the latest status update
+        self._table.set(job["job_id"], job, created_at=job.get("created_at"))
+
+
+def build_job_store(kind: str = config.JOB_STORE) -> JobStore:
+    stores = {"memory": InMemoryJobStore, "sqlite": SQLiteJobStore}
+    if kind not in stores:
+        raise ValueError(f"Unknown JOB_STORE '{kind}'. Expected one of {sorted(stores)}")
+    return stores[kind]()
@@ -0,0 +1,221 @@
+"""
+LLM Limiter — process-wide concurrency + rate limit for chat completions.
+
+Every node and agent sends its LLM calls through invoke_llm() / ainvoke_llm()
+(or astream_llm() when tokens are streamed to the client),
+so one shared budget covers the whole process:
+
+  max_concurrency  — completions in flight at once  (LLM_MAX_CONCURRENCY)
+  rpm              — requests per minute             (OPENAI_RPM_LIMIT)
+  tpm              — tokens per minute               (OPENAI_TPM_LIMIT)
+
+RPM and TPM are token buckets refilled continuously. Token cost is estimated
+up front (prompt chars / 4 + a completion allowance) — OpenAI counts limits
+the same way, against the request before it runs. A caller reserves its
+budget on arrival (the bucket may go negative) and sleeps only for the refill
+it is short of, so budget is granted in arrival order.
+
+Concurrency slots are handed out first come, first served: a waiter queues
+behind earlier ones and is woken by _release() handing it the freed slot —
+through a threading.Condition for sync callers, a future on the caller's own
+loop for async ones. Nobody polls, and a newcomer cannot overtake a waiter.
+
+The limiter is thread-safe and loop-agnostic: sync callers (graph.invoke,
+thread-pool nodes) and async callers (graph.ainvoke) draw from the same budget.
+
+Teaching point:
+  Parallelism without a global budget just moves the bottleneck to HTTP 429s.
+  Fan out freely inside a node; let the limiter decide how much actually runs.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Optional
+
+from langchain_core.messages import AIMessage
+
+import config
+from utils.telemetry import record_llm_call
+
+
+COMPLETION_TOKEN_ALLOWANCE = 500   # assumed completion size when estimating cost
+
+
+class TokenBucket:
+    """Continuously refilled bucket: `capacity` units per `period` seconds."""
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class LLMLimiter:
+    def __init__(
+        self,
+        max_concurrency: int = config.LLM_MAX_CONCURRENCY,
+        rpm: int = config.OPENAI_RPM_LIMIT,
+        tpm: int = config.OPENAI_TPM_LIMIT,
+    ):
+        self.max_concurrency = max_concurrency
+        self._requests = TokenBucket(rpm)
+        self._tokens = TokenBucket(tpm)
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        self._waiters: deque[_Waiter] = deque()   # FIFO, sync and async alike
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @contextmanager
+    def limit(self, tokens: int):
+        """Blocking acquire — for sync callers."""
+        if (wait := self._reserve(tokens)) > 0:
+            time.sleep(wait)
+        with self._slot_freed:
+            if not self._take_free_slot():
+                waiter = _Waiter()
+                self._waiters.append(waiter)
+                self._slot_freed.wait_for(lambda: waiter.granted)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def alimit(self, tokens: int):
+        """Non-blocking acquire — for async callers."""
+        if (wait := self._reserve(tokens)) > 0:
+            await asyncio.sleep(wait)
+        await self._aacquire_slot()
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _reserve(self, tokens: int) -> float:
+        """Take one request + `tokens` from the buckets now; return the refill wait still owed."""
+        with self._lock:
+            wait = max(self._requests.wait_time(1), self._tokens.wait_time(tokens))
+            self._requests.consume(1)
+            self._tokens.consume(tokens)
+            return wait
+
+    async def _aacquire_slot(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._take_free_slot():
+                return
+            future = loop.create_future()
+            waiter = _Waiter(lambda: loop.call_soon_threadsafe(_resolve, future))
+            self._waiters.append(waiter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                granted = waiter.granted
+                if not granted:
+                    self._waiters.remove(waiter)
+            if granted:  # the slot was handed over as we were cancelled — pass it on
+                self._release()
+            raise
+
+    def _take_free_slot(self) -> bool:
+        """Caller holds self._lock. Free slots go to newcomers only when nobody is queued."""
+        if self._waiters or self._in_flight >= self.max_concurrency:
+            return False
+        self._in_flight += 1
+        return True
+
+    def _release(self) -> None:
+        """Hand the slot to the longest waiter (in_flight unchanged), or free it."""
+        with self._lock:
+            if not self._waiters:
+                self._in_flight -= 1
+                return
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+            if waiter.wake is None:
+                self._slot_freed.notify_all()
+            else:
+                waiter.wake()
+
+
+class _Waiter:
+    """A queued slot request; `wake` is None for sync waiters (they wait on the Condition)."""
+
+    __slots__ = ("granted", "wake")
+
+    def __init__(self, wake: Optional[Callable[[], None]] = None):
+        self.granted = False
+        self.wake = wake
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def estimate_tokens(prompt: str) -> int:
+    """Rough OpenAI token estimate: ~4 chars per token plus a completion allowance."""
+    return len(prompt) // 4 + COMPLETION_TOKEN_ALLOWANCE
+
+
+def invoke_llm(llm, prompt: str):
+    """llm.invoke(prompt) under the shared limiter; usage is credited to the running node."""
+    with llm_limiter.limit(estimate_tokens(prompt)):
+        response = llm.invoke(prompt)
+    record_llm_call(llm, prompt, response)
+    return response
+
+
+async def ainvoke_llm(llm, prompt: str):
+    """await llm.ainvoke(prompt) under the shared limiter."""
+    async with llm_limiter.alimit(estimate_tokens(prompt)):
+        response = await llm.ainvoke(prompt)
+    record_llm_call(llm, prompt, response)
+    return response
+
+
+async def astream_llm(llm, prompt: str, on_token: Callable[[str], None]):
+    """
+    llm.astream(prompt) under the shared limiter: on_token(text) for every chunk as
+    it arrives; returns the whole message, like ainvoke_llm() — an empty AIMessage
+    if the stream yielded no chunks.
+    """
+    message = None
+    async with llm_limiter.alimit(estimate_tokens(prompt)):
+        async for chunk in llm.astream(prompt):
+            if chunk.content:
+                on_token(chunk.content)
+            message = chunk if message is None else message + chunk
+    if message is None:
+        message = AIMessage(content="")
+    record_llm_call(llm, prompt, message)
+    return message
+
+
+# Module-level singleton — shared across all nodes and agents
+llm_limiter = LLMLimiter()
@@ -0,0 +1,77 @@
+"""
+Rewrite Cache — two-level cache for RAGAgent._rewrite_query().
+
+  Level 1: exact      normalized query text → rewritten query
+                      (persistent, SQLite namespace "query_rewrite")
+  Level 2: semantic   query embedding within REWRITE_CACHE_SIMILARITY (cosine)
+                      of a previously rewritten query → reuse its rewrite
+                      (in-memory, newest REWRITE_CACHE_MAX_ENTRIES per model)
+
+Entries are scoped by the rewrite model, so "cheap" and full rewrites never mix.
+
+Teaching point:
+  "accuracy bugs in checkout" and "Accuracy bugs in the checkout" deserve the
+  same expansion. Paying a full completion to rediscover that is pure latency.
+"""
+
+import hashlib
+import threading
+from typing import Optional
+
+import numpy as np
+
+from utils.sqlite_cache import SQLiteCache
+import config
+
+
+class RewriteCache:
+    def __init__(
+        self,
+        similarity_threshold: float = config.REWRITE_CACHE_SIMILARITY,
+        max_entries: int = config.REWRITE_CACHE_MAX_ENTRIES,
+        exact_store: Optional[SQLiteCache] = None,
+    ):
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self._exact = exact_store if exact_store is not None else SQLiteCache(
+            namespace="query_rewrite", max_entries=max_entries
+        )
+        self._vectors: dict[str, np.ndarray] = {}    # model → (n, dim) unit vectors
+        self._rewrites: dict[str, list[str]] = {}    # model → rewrites, row-aligned
+        self._lock = threading.Lock()
+
+    def lookup_exact(self, model: str, query: str) -> Optional[str]:
+        return self._exact.get(_exact_key(model, query))
+
+    def lookup_similar(self, model: str, vector: list[float]) -> Optional[str]:
+        """Rewrite of the most similar cached query, if it clears the threshold."""
+        with self._lock:
+            matrix = self._vectors.get(model)
+            if matrix is None or not len(matrix):
+                return None
+            scores = matrix @ _unit(vector)
+            best = int(np.argmax(scores))
+            if scores[best] >= self.similarity_threshold:
+                return self._rewrites[model][best]
+            return None
+
+    def store(self, model: str, query: str, rewritten: str, vector: Optional[list[float]] = None) -> None:
+        self._exact.set(_exact_key(model, query), rewritten)
+        if vector is None:
+            return
+        with self._lock:
+            row = _unit(vector)[None, :]
+            matrix = self._vectors.get(model)
+            self._vectors[model] = row if matrix is None else np.vstack([matrix, row])[-self.max_entries:]
+            self._rewrites[model] = (self._rewrites.get(model, []) + [rewritten])[-self.max_entries:]
+
+
+def _exact_key(model: str, query: str) -> str:
+    normalized = " ".join(query.split()).casefold()
+    return hashlib.sha256(f"{model}\x00{normalized}".encode("utf-8")).hexdigest()
+
+
+def _unit(vector: list[float]) -> np.ndarray:
+    v = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(v)
+    return v / norm if norm else v
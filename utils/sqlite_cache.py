@@ -0,0 +1,153 @@
+"""
+SQLite Cache — persistent key/value store with TTL + LRU eviction.
+
+One local file (config.CACHE_DB_PATH), one table per namespace, JSON values.
+Survives restarts and needs no external service.
+
+  cache = SQLiteCache(namespace="classification", ttl_seconds=86400, max_entries=50_000)
+  found = cache.get_many(["k1", "k2"])     # {"k1": {...}} — misses are simply absent
+  cache.set_many({"k2": {...}})
+
+Eviction:
+  TTL — entries older than ttl_seconds are treated as misses and purged on write.
+  LRU — every hit refreshes last_access; on write, the table is trimmed to
+        max_entries by dropping the least recently accessed rows.
+
+Thread-safe: each operation opens its own short-lived connection under a lock,
+so nodes running on the thread pool can share one instance.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import config
+
+
+class SQLiteCache:
+    def __init__(
+        self,
+        namespace: str,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        path: str = config.CACHE_DB_PATH,
+    ):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.path = path
+        self._lock = threading.Lock()
+        self._table = f"cache_{namespace}"
+        self._initialized = False
+
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Return {key: value} for every live key. Hits refresh their LRU position."""
+        if not keys:
+            return {}
+        now = time.time()
+        found = {}
+        with self._lock, self._connect() as conn:
+            for chunk in _chunks(list(dict.fromkeys(keys))):
+                rows = conn.execute(
+                    f"SELECT key, value, created_at FROM {self._table} "
+                    f"WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for key, value, created_at in rows:
+                    if self.ttl_seconds is None or now - created_at <= self.ttl_seconds:
+                        found[key] = json.loads(value)
+            conn.executemany(
+                f"UPDATE {self._table} SET last_access = ? WHERE key = ?",
+                [(now, key) for key in found],
+            )
+        return found
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.get_many([key]).get(key)
+
+    def set_many(self, items: dict[str, Any], created_at: Optional[float] = None) -> None:
+        """Insert or replace entries, then apply TTL + LRU eviction.
+
+        The TTL counts from `created_at` (default now); pass the original time
+        when rewriting a record whose age must not reset.
+        """
+        if not items:
+            return
+        now = time.time()
+        created_at = now if created_at is None else created_at
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {self._table} (key, value, created_at, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                [(key, json.dumps(value), created_at, now) for key, value in items.items()],
+            )
+            self._evict(conn, now)
+
+    def set(self, key: str, value: Any, created_at: Optional[float] = None) -> None:
+        self.set_many({key: value}, created_at)
+
+    def clear(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute(f"DELETE FROM {self._table}")
+
+    def __len__(self) -> int:
+        with self._lock, self._connect() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {self._table}").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Private methods
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self._table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {self._table}_lru ON {self._table} (last_access)"
+            )
+            self._initialized = True
+        return _ClosingConnection(conn)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        if self.ttl_seconds is not None:
+            conn.execute(
+                f"DELETE FROM {self._table} WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+        if self.max_entries is not None:
+            conn.execute(
+                f"DELETE FROM {self._table} WHERE key IN ("
+                f"SELECT key FROM {self._table} ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+
+class _ClosingConnection:
+    """sqlite3 connections commit on `with` but never close — this does both."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        return self.conn.__enter__()
+
+    def __exit__(self, *exc):
+        try:
+            return self.conn.__exit__(*exc)
+        finally:
+            self.conn.close()
+
+
+def _chunks(items: list, size: int = 500):
+    """Stay under SQLite's bound-parameter limit."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
@@ -0,0 +1,276 @@
+"""
+Telemetry — per-node latency, LLM call, token and cost accounting.
+
+build_graph() wraps every node with instrument_node(). While a node runs, every
+invoke_llm() / ainvoke_llm() call it makes (directly or through an agent, in
+threads or child tasks) is added to that node's NodeUsage. When the node
+returns, one record is written to three places:
+
+  state["metrics"]["nodes"][name]  — per request, in the graph's final state
+  Langfuse span                    — if LANGFUSE_PUBLIC_KEY / _SECRET_KEY are set
+  node_metrics (Prometheus)        — process totals, served at GET /metrics
+                                     (plus time-to-first-token for streamed answers)
+
+Record:
+  {latency_ms, llm_calls, prompt_tokens, completion_tokens, cost_usd}
+  + budget_ms / over_budget for nodes with a TDD latency budget
+
+Tokens come from the provider's usage_metadata when present, otherwise the
+same chars / 4 estimate the limiter uses. Cost uses MODEL_PRICES; unknown
+models are counted as 0.
+
+Teaching point:
+  A latency table in a design doc is a hypothesis. Recording every node on
+  every request is what turns it into something you can check.
+"""
+
+import functools
+import inspect
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+# USD per 1M tokens: (prompt, completion)
+MODEL_PRICES = {
+    "gpt-4o":      (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+
+# TDD latency table — nodes without an entry are recorded but not budgeted
+LATENCY_BUDGETS_MS = {
+    "rag":            300,
+    "classification": 1500,
+    "jira_branch":    2000,
+}
+
+
+@dataclass
+class NodeUsage:
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+
+    def add(self, model: str, prompt_tokens: int, completion_tokens: int) -> None:
+        # Parallel LLM calls inside one node (threads, gathered tasks) share this object
+        with _usage_lock:
+            self.llm_calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.cost_usd += estimate_cost(model, prompt_tokens, completion_tokens)
+
+
+_usage_lock = threading.Lock()
+_current_usage: ContextVar[Optional[NodeUsage]] = ContextVar("node_usage", default=None)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    prompt_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+def record_llm_call(llm, prompt: str, response) -> None:
+    """Called by invoke_llm() / ainvoke_llm() — no-op outside an instrumented node."""
+    usage = _current_usage.get()
+    if usage is None:
+        return
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", None) or config.LLM_MODEL
+    tokens = getattr(response, "usage_metadata", None) or {}
+    usage.add(
+        model,
+        tokens.get("input_tokens") or len(prompt) // 4,
+        tokens.get("output_tokens") or len(str(getattr(response, "content", ""))) // 4,
+    )
+
+
+# ------------------------------------------------------------------
+# Node wrapper
+# ------------------------------------------------------------------
+
+def instrument_node(name: str, func: Optional[Callable]) -> Optional[Callable]:
+    """Wrap a sync or async node so its delta carries metrics["nodes"][name]."""
+    if func is None:
+        return None
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(state):
+            run = _NodeRun(name, state)
+            try:
+                update = await func(state)
+            finally:
+                run.finish()
+            return run.attach(update)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(state):
+        run = _NodeRun(name, state)
+        try:
+            update = func(state)
+        finally:
+            run.finish()
+        return run.attach(update)
+    return wrapper
+
+
+class _NodeRun:
+    """One node execution: timer + usage context + optional Langfuse span."""
+
+    def __init__(self, name: str, state: dict):
+        self.name = name
+        self.usage = NodeUsage()
+        self.record: dict = {}
+        self._token = _current_usage.set(self.usage)
+        self._span = _start_span(name, state.get("trace_id"))
+        self._start = time.perf_counter()
+
+    def finish(self) -> None:
+        latency_ms = round((time.perf_counter() - self._start) * 1000, 1)
+        _current_usage.reset(self._token)
+        self.record = {
+            "latency_ms":        latency_ms,
+            "llm_calls":         self.usage.llm_calls,
+            "prompt_tokens":     self.usage.prompt_tokens,
+            "completion_tokens": self.usage.completion_tokens,
+            "cost_usd":          round(self.usage.cost_usd, 6),
+        }
+        if (budget := LATENCY_BUDGETS_MS.get(self.name)) is not None:
+            self.record["budget_ms"] = budget
+            self.record["over_budget"] = latency_ms > budget
+        node_metrics.observe(self.name, self.record)
+        _end_span(self._span, self.record)
+
+    def attach(self, update: Optional[dict]) -> dict:
+        update = dict(update or {})
+        update["metrics"] = {**update.get("metrics", {}), "nodes": {self.name: self.record}}
+        return update
+
+
+# ------------------------------------------------------------------
+# Langfuse (optional)
+# ------------------------------------------------------------------
+
+_langfuse = None
+_langfuse_lock = threading.Lock()
+
+
+def _langfuse_client():
+    """Lazily built client, or None when Langfuse is not configured."""
+    global _langfuse
+    if not (config.LANGFUSE_PUBLIC_KEY and config.LANGFUSE_SECRET_KEY):
+        return None
+    with _langfuse_lock:
+        if _langfuse is None:
+            from langfuse import Langfuse
+            _langfuse = Langfuse(
+                public_key=config.LANGFUSE_PUBLIC_KEY,
+                secret_key=config.LANGFUSE_SECRET_KEY,
+            )
+    return _langfuse
+
+
+def _start_span(name: str, trace_id: Optional[str]):
+    try:
+        client = _langfuse_client()
+        if client is None:
+            return None
+        # One Langfuse trace per request: derive its id from our trace_id
+        trace_context = {"trace_id": client.create_trace_id(seed=trace_id)} if trace_id else None
+        return client.start_observation(name=name, as_type="span", trace_context=trace_context)
+    except Exception:
+        logger.debug("Langfuse span start failed for %s", name, exc_info=True)
+        return None
+
+
+def _end_span(span, record: dict) -> None:
+    if span is None:
+        return
+    try:
+        span.update(
+            metadata=record,
+            usage_details={"input": record["prompt_tokens"], "output": record["completion_tokens"]},
+            cost_details={"total": record["cost_usd"]},
+        )
+        span.end()
+    except Exception:
+        logger.debug("Langfuse span end failed", exc_info=True)
+
+
+# ------------------------------------------------------------------
+# Prometheus exposition
+# ------------------------------------------------------------------
+
+class NodeMetrics:
+    """Process-wide per-node totals, rendered in the Prometheus text format."""
+
+    COUNTERS = (
+        ("qaia_node_llm_calls_total",         "LLM calls made by the node",        "llm_calls"),
+        ("qaia_node_prompt_tokens_total",     "Prompt tokens sent by the node",     "prompt_tokens"),
+        ("qaia_node_completion_tokens_total", "Completion tokens received",         "completion_tokens"),
+        ("qaia_node_cost_usd_total",          "Estimated LLM cost in USD",          "cost_usd"),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: dict[str, dict[str, float]] = {}
+        self._ttft = {"sum": 0.0, "count": 0}
+
+    def observe_ttft(self, ttft_ms: float) -> None:
+        """Time to first streamed answer token, measured from request receipt."""
+        with self._lock:
+            self._ttft["sum"] += ttft_ms / 1000
+            self._ttft["count"] += 1
+
+    def observe(self, node: str, record: dict) -> None:
+        with self._lock:
+            totals = self._totals.setdefault(node, {
+                "runs": 0, "latency_seconds": 0.0, "over_budget": 0,
+                **{field: 0 for _, _, field in self.COUNTERS},
+            })
+            totals["runs"] += 1
+            totals["latency_seconds"] += record["latency_ms"] / 1000
+            totals["over_budget"] += int(record.get("over_budget", False))
+            for _, _, field in self.COUNTERS:
+                totals[field] += record[field]
+
+    def render(self) -> str:
+        with self._lock:
+            snapshot = {node: dict(totals) for node, totals in sorted(self._totals.items())}
+            ttft = dict(self._ttft)
+
+        lines = [
+            "# HELP qaia_node_latency_seconds Wall time spent in the node",
+            "# TYPE qaia_node_latency_seconds summary",
+        ]
+        for node, totals in snapshot.items():
+            lines.append(f'qaia_node_latency_seconds_sum{{node="{node}"}} {totals["latency_seconds"]}')
+            lines.append(f'qaia_node_latency_seconds_count{{node="{node}"}} {totals["runs"]}')
+
+        for metric, help_text, field in self.COUNTERS + (
+            ("qaia_node_over_budget_total", "Runs slower than the TDD latency budget", "over_budget"),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for node, totals in snapshot.items():
+                lines.append(f'{metric}{{node="{node}"}} {totals[field]}')
+
+        lines += [
+            "# HELP qaia_ttft_seconds Time to first streamed answer token (/qa-intake/stream)",
+            "# TYPE qaia_ttft_seconds summary",
+            f"qaia_ttft_seconds_sum {ttft['sum']}",
+            f"qaia_ttft_seconds_count {ttft['count']}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+# Module-level singleton — shared across requests, served by api/main.py
+node_metrics = NodeMetrics()